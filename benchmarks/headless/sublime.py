@@ -0,0 +1,1262 @@
+"""
+A headless, in-memory stand-in for the ``sublime`` module.
+
+This module implements enough of the Sublime Text API
+for all of :mod:`sublime_lib` to be imported, exercised, and timed
+under a normal Python interpreter.
+It is not shipped with :mod:`sublime_lib`
+and is not a faithful reimplementation of Sublime Text:
+it exists so that library hot paths can be benchmarked in CI.
+
+To use it, put this directory at the front of :data:`sys.path`
+before importing :mod:`sublime_lib`:
+
+.. code-block:: python
+
+   sys.path.insert(0, 'benchmarks/headless')
+   import sublime
+   sublime.load_fixture('path/to/packages')  # or a .zip file
+   import sublime_lib
+
+In addition to the public API,
+this module provides a few functions to control the simulation:
+
+- :func:`load_fixture` selects the directory or zip file that backs the resource system.
+- :func:`run_timeouts` runs callbacks scheduled with :func:`set_timeout`.
+- :func:`reset` discards all windows, views, settings, and pending callbacks.
+"""
+from __future__ import annotations
+
+import enum
+import fnmatch
+import heapq
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+
+# Flags and enumerations
+
+class HoverZone(enum.IntEnum):
+    TEXT = 1
+    GUTTER = 2
+    MARGIN = 3
+
+
+class NewFileFlags(enum.IntFlag):
+    NONE = 0
+    ENCODED_POSITION = 1
+    TRANSIENT = 4
+    FORCE_GROUP = 8
+    SEMI_TRANSIENT = 16
+    ADD_TO_SELECTION = 32
+    REPLACE_MRU = 64
+    CLEAR_TO_RIGHT = 128
+    FORCE_CLONE = 256
+
+
+class FindFlags(enum.IntFlag):
+    NONE = 0
+    LITERAL = 1
+    IGNORECASE = 2
+    WHOLEWORD = 4
+    REVERSE = 8
+    WRAP = 16
+
+
+class QuickPanelFlags(enum.IntFlag):
+    NONE = 0
+    MONOSPACE_FONT = 1
+    KEEP_OPEN_ON_FOCUS_LOST = 2
+    WANT_EVENT = 4
+
+
+class PopupFlags(enum.IntFlag):
+    NONE = 0
+    COOPERATE_WITH_AUTO_COMPLETE = 2
+    HIDE_ON_MOUSE_MOVE = 4
+    HIDE_ON_MOUSE_MOVE_AWAY = 8
+    KEEP_ON_SELECTION_MODIFIED = 16
+    HIDE_ON_CHARACTER_EVENT = 32
+
+
+class RegionFlags(enum.IntFlag):
+    NONE = 0
+    DRAW_EMPTY = 1
+    HIDE_ON_MINIMAP = 2
+    DRAW_EMPTY_AS_OVERWRITE = 4
+    PERSISTENT = 16
+    DRAW_NO_FILL = 32
+    HIDDEN = 128
+    DRAW_NO_OUTLINE = 256
+    DRAW_SOLID_UNDERLINE = 512
+    DRAW_STIPPLED_UNDERLINE = 1024
+    DRAW_SQUIGGLY_UNDERLINE = 2048
+    NO_UNDO = 8192
+
+
+class QueryOperator(enum.IntEnum):
+    EQUAL = 0
+    NOT_EQUAL = 1
+    REGEX_MATCH = 2
+    NOT_REGEX_MATCH = 3
+    REGEX_CONTAINS = 4
+    NOT_REGEX_CONTAINS = 5
+
+
+class PointClassification(enum.IntFlag):
+    NONE = 0
+    WORD_START = 1
+    WORD_END = 2
+    PUNCTUATION_START = 4
+    PUNCTUATION_END = 8
+    SUB_WORD_START = 16
+    SUB_WORD_END = 32
+    LINE_START = 64
+    LINE_END = 128
+    EMPTY_LINE = 256
+
+
+class AutoCompleteFlags(enum.IntFlag):
+    NONE = 0
+    INHIBIT_WORD_COMPLETIONS = 8
+    INHIBIT_EXPLICIT_COMPLETIONS = 16
+    DYNAMIC_COMPLETIONS = 32
+    INHIBIT_REORDER = 128
+
+
+class DialogResult(enum.IntEnum):
+    CANCEL = 0
+    YES = 1
+    NO = 2
+
+
+class PhantomLayout(enum.IntEnum):
+    INLINE = 0
+    BELOW = 1
+    BLOCK = 2
+
+
+def _export(enum_class, prefix=''):
+    for name, member in enum_class.__members__.items():
+        if name != 'NONE':
+            globals()[prefix + name] = member
+
+
+_export(HoverZone, 'HOVER_')
+_export(NewFileFlags)
+_export(FindFlags)
+_export(QuickPanelFlags)
+_export(PopupFlags)
+_export(RegionFlags)
+_export(QueryOperator, 'OP_')
+_export(PointClassification, 'CLASS_')
+_export(AutoCompleteFlags)
+_export(DialogResult, 'DIALOG_')
+_export(PhantomLayout, 'LAYOUT_')
+
+HTML = 1
+DRAW_OUTLINED = RegionFlags.DRAW_NO_FILL
+
+
+# Simulation state
+
+_lock = threading.RLock()
+_ids = itertools.count(1)
+_windows = []
+_settings_files = {}
+_timeouts = []
+_timeout_counter = itertools.count()
+_clock = 0.0
+
+_root = Path(tempfile.mkdtemp(prefix='sublime_headless_'))
+_paths = {
+    'packages': _root / 'Packages',
+    'installed_packages': _root / 'Installed Packages',
+    'cache': _root / 'Cache',
+    'executable': _root / 'sublime_text',
+}
+_default_paths = dict(_paths)
+_zip_fixture = None
+_resource_index = None
+
+#: The value returned by :func:`yes_no_cancel_dialog` and :func:`ok_cancel_dialog`.
+dialog_result = DialogResult.CANCEL
+
+for _path in (_paths['packages'] / 'User', _paths['installed_packages'], _paths['cache']):
+    _path.mkdir(parents=True, exist_ok=True)
+
+
+def load_fixture(path):
+    """Back the resource system with the given directory or zip file.
+
+    A directory is used as the packages path;
+    each subdirectory is a package.
+    Any ``.sublime-package`` files in the directory are treated as installed packages.
+    In a zip file, each top-level directory is a package.
+    """
+    global _zip_fixture, _resource_index
+    path = Path(path)
+    with _lock:
+        if _zip_fixture is not None:
+            _zip_fixture.close()
+            _zip_fixture = None
+
+        if path.is_dir():
+            _paths['packages'] = path
+            _paths['installed_packages'] = path
+        else:
+            _zip_fixture = zipfile.ZipFile(str(path))
+
+        _resource_index = None
+        _settings_files.clear()
+
+
+def unload_fixture():
+    """Stop using any fixture loaded with :func:`load_fixture`
+    and go back to the initial, empty resource directories."""
+    global _zip_fixture, _resource_index
+    with _lock:
+        if _zip_fixture is not None:
+            _zip_fixture.close()
+            _zip_fixture = None
+        _paths.update(_default_paths)
+        _resource_index = None
+        _settings_files.clear()
+
+
+def reset():
+    """Close all windows and discard all settings and pending timeouts."""
+    global _clock
+    with _lock:
+        for window in list(_windows):
+            window._close()
+        _settings_files.clear()
+        _timeouts.clear()
+        _clock = 0.0
+    _windows.append(Window(next(_ids)))
+
+
+def run_timeouts(until=None):
+    """Run scheduled callbacks in order of their due time and return how many ran.
+
+    The simulated clock is advanced to each callback's due time.
+    If `until` (in milliseconds of simulated time) is given,
+    only callbacks due at or before that time are run.
+    Otherwise, run callbacks until none are pending,
+    including callbacks scheduled by other callbacks.
+    """
+    global _clock
+    count = 0
+    while True:
+        with _lock:
+            if not _timeouts or (until is not None and _timeouts[0][0] > until):
+                if until is not None:
+                    _clock = max(_clock, until)
+                return count
+            due, _, callback = heapq.heappop(_timeouts)
+            _clock = max(_clock, due)
+        callback()
+        count += 1
+
+
+def clock():
+    """Return the simulated time in milliseconds."""
+    return _clock
+
+
+# Basic types
+
+class Region:
+    __slots__ = ['a', 'b', 'xpos']
+
+    def __init__(self, a, b=None, xpos=-1):
+        if b is None:
+            b = a
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __str__(self):
+        return "(" + str(self.a) + ", " + str(self.b) + ")"
+
+    def __repr__(self):
+        return f"Region({self.a!r}, {self.b!r})"
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Region) and self.a == rhs.a and self.b == rhs.b
+
+    def __hash__(self):
+        return hash((self.a, self.b))
+
+    def __lt__(self, rhs):
+        lhs_begin = self.begin()
+        rhs_begin = rhs.begin()
+        if lhs_begin == rhs_begin:
+            return self.end() < rhs.end()
+        return lhs_begin < rhs_begin
+
+    def __contains__(self, v):
+        if isinstance(v, Region):
+            return v.a in self and v.b in self
+        return self.begin() <= v <= self.end()
+
+    def __iter__(self):
+        return iter((self.a, self.b))
+
+    def to_tuple(self):
+        return (self.a, self.b)
+
+    def empty(self):
+        return self.a == self.b
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+    def size(self):
+        return abs(self.a - self.b)
+
+    def contains(self, x):
+        return x in self
+
+    def cover(self, rhs):
+        if self.a > self.b:
+            return Region(max(self.a, rhs.end()), min(self.b, rhs.begin()))
+        return Region(min(self.a, rhs.begin()), max(self.b, rhs.end()))
+
+    def intersection(self, rhs):
+        if self.end() <= rhs.begin() or rhs.end() <= self.begin():
+            return Region(0)
+        return Region(max(self.begin(), rhs.begin()), min(self.end(), rhs.end()))
+
+    def intersects(self, rhs):
+        lb, le = self.begin(), self.end()
+        rb, re_ = rhs.begin(), rhs.end()
+        return (lb == rb and le == re_) or (rb > lb and rb < le) or (lb > rb and lb < re_)
+
+
+def _to_region(x):
+    if isinstance(x, Region):
+        return x
+    return Region(x)
+
+
+def _shift_point(point, begin, end, inserted):
+    """Adjust `point` for the replacement of [begin, end) with `inserted` characters."""
+    if point < begin:
+        return point
+    elif begin == end:
+        return point + inserted
+    elif point < end:
+        return begin
+    else:
+        return point - (end - begin) + inserted
+
+
+def _shift_region(region, begin, end, inserted):
+    return Region(
+        _shift_point(region.a, begin, end, inserted),
+        _shift_point(region.b, begin, end, inserted),
+        region.xpos,
+    )
+
+
+def _overlaps(lhs, rhs):
+    if lhs == rhs or lhs.intersects(rhs):
+        return True
+    elif lhs.empty():
+        return rhs.begin() < lhs.a < rhs.end()
+    elif rhs.empty():
+        return lhs.begin() < rhs.a < lhs.end()
+    else:
+        return False
+
+
+class Selection:
+    def __init__(self, view):
+        self._view = view
+        self._regions = [Region(0)]
+
+    def __iter__(self):
+        return iter(list(self._regions))
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __getitem__(self, index):
+        return self._regions[index]
+
+    def __delitem__(self, index):
+        del self._regions[index]
+
+    def __eq__(self, rhs):
+        return rhs is not None and list(self) == list(rhs)
+
+    def __repr__(self):
+        return f"Selection({self._regions!r})"
+
+    def is_valid(self):
+        return self._view.is_valid()
+
+    def clear(self):
+        self._regions = []
+
+    def add(self, x):
+        # Like Sublime, clamp the region to the bounds of the buffer.
+        region = _to_region(x)
+        size = self._view.size()
+        region = Region(
+            min(max(region.a, 0), size),
+            min(max(region.b, 0), size),
+            region.xpos,
+        )
+        kept = []
+        for existing in self._regions:
+            if _overlaps(existing, region):
+                region = region.cover(existing)
+            else:
+                kept.append(existing)
+        kept.append(region)
+        kept.sort()
+        self._regions = kept
+
+    def add_all(self, regions):
+        for region in regions:
+            self.add(region)
+
+    def subtract(self, region):
+        self._regions = [r for r in self._regions if r != region]
+
+    def contains(self, region):
+        return any(region in r for r in self._regions)
+
+    def _adjust(self, begin, end, inserted):
+        self._regions = [_shift_region(r, begin, end, inserted) for r in self._regions]
+
+
+# Settings
+
+_settings_ids = itertools.count(1)
+
+
+def _clone(value):
+    """Round-trip `value` through JSON, as values passed through the API are."""
+    return json.loads(json.dumps(value))
+
+
+class Settings:
+    def __init__(self, id=None, parent=None):
+        self.settings_id = next(_settings_ids) if id is None else id
+        self._values = {}
+        self._parent = parent
+        self._callbacks = {}
+
+    def __getitem__(self, key):
+        if not self.has(key):
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.erase(key)
+
+    def __contains__(self, key):
+        return self.has(key)
+
+    def __repr__(self):
+        return f"Settings({self.settings_id!r})"
+
+    def to_dict(self):
+        return _clone(self._values)
+
+    def setdefault(self, key, value):
+        if self.has(key):
+            return self.get(key)
+        self.set(key, value)
+        return self.get(key)
+
+    def update(self, other=(), /, **kwargs):
+        items = dict(other)
+        items.update(kwargs)
+        for key, value in items.items():
+            self._values[key] = _clone(value)
+        if items:
+            self._changed()
+
+    def get(self, key, default=None):
+        if key in self._values:
+            value = self._values[key]
+        elif self._parent is not None and self._parent.has(key):
+            return self._parent.get(key, default)
+        else:
+            return default
+        return default if value is None else _clone(value)
+
+    def has(self, key):
+        return key in self._values or (self._parent is not None and self._parent.has(key))
+
+    def set(self, key, value):
+        self._values[key] = _clone(value)
+        self._changed()
+
+    def erase(self, key):
+        if self._values.pop(key, _clone) is not _clone:
+            self._changed()
+
+    def add_on_change(self, tag, callback):
+        self._callbacks.setdefault(tag, []).append(callback)
+
+    def clear_on_change(self, tag):
+        self._callbacks.pop(tag, None)
+
+    def _changed(self):
+        for callbacks in list(self._callbacks.values()):
+            for callback in list(callbacks):
+                callback()
+
+
+# Views and windows
+
+class View:
+    def __init__(self, id, window, *, panel_name=None):
+        self.view_id = id
+        self._window = window
+        self._panel_name = panel_name
+        self._valid = True
+        self._text = ''
+        self._sel = Selection(self)
+        self._settings = Settings(parent=load_settings('Preferences.sublime-settings'))
+        self._read_only = False
+        self._scratch = False
+        self._name = ''
+        self._file_name = None
+        self._encoding = 'UTF-8'
+        self._line_endings = 'Unix'
+        self._overwrite = False
+        self._syntax = None
+        self._regions = {}
+        self._status = {}
+        self._change_count = 0
+        self._saved_change_count = 0
+        self._viewport_position = 0
+
+    def __eq__(self, other):
+        return isinstance(other, View) and other.view_id == self.view_id
+
+    def __hash__(self):
+        return self.view_id
+
+    def __bool__(self):
+        return self.view_id != 0
+
+    def __len__(self):
+        return self.size()
+
+    def __repr__(self):
+        return f"View({self.view_id!r})"
+
+    def id(self):
+        return self.view_id
+
+    def buffer_id(self):
+        return self.view_id
+
+    def buffer(self):
+        return self
+
+    def is_valid(self):
+        return self._valid
+
+    def is_primary(self):
+        return True
+
+    def window(self):
+        return self._window if self._valid else None
+
+    def element(self):
+        return 'output:output' if self._panel_name else None
+
+    def file_name(self):
+        return self._file_name
+
+    def close(self):
+        if self._window is not None:
+            self._window._remove_view(self)
+        self._valid = False
+        return True
+
+    def is_loading(self):
+        return False
+
+    def change_count(self):
+        return self._change_count
+
+    def is_dirty(self):
+        return self._change_count != self._saved_change_count
+
+    def is_read_only(self):
+        return self._read_only
+
+    def set_read_only(self, read_only):
+        self._read_only = bool(read_only)
+
+    def is_scratch(self):
+        return self._scratch
+
+    def set_scratch(self, scratch):
+        self._scratch = bool(scratch)
+
+    def encoding(self):
+        return self._encoding
+
+    def set_encoding(self, encoding_name):
+        self._encoding = encoding_name
+
+    def line_endings(self):
+        return self._line_endings
+
+    def set_line_endings(self, line_ending_name):
+        self._line_endings = line_ending_name
+
+    def overwrite_status(self):
+        return self._overwrite
+
+    def set_overwrite_status(self, value):
+        self._overwrite = bool(value)
+
+    def name(self):
+        return self._name
+
+    def set_name(self, name):
+        self._name = name
+
+    def settings(self):
+        return self._settings
+
+    def syntax(self):
+        return self._syntax
+
+    def assign_syntax(self, syntax):
+        self._syntax = syntax
+
+    def set_syntax_file(self, syntax_file):
+        self._syntax = syntax_file
+
+    def size(self):
+        return len(self._text)
+
+    def substr(self, x):
+        if isinstance(x, Region):
+            return self._text[x.begin():x.end()]
+        return self._text[x:x + 1] if 0 <= x < len(self._text) else '\x00'
+
+    def sel(self):
+        return self._sel
+
+    def rowcol(self, tp):
+        tp = max(0, min(tp, len(self._text)))
+        row = self._text.count('\n', 0, tp)
+        return (row, tp - (self._text.rfind('\n', 0, tp) + 1))
+
+    def text_point(self, row, col, *, clamp_column=False):
+        start = 0
+        for _ in range(row):
+            index = self._text.find('\n', start)
+            if index == -1:
+                return len(self._text)
+            start = index + 1
+        if clamp_column:
+            end = self._text.find('\n', start)
+            if end == -1:
+                end = len(self._text)
+            col = min(col, end - start)
+        return min(start + col, len(self._text))
+
+    def line(self, x):
+        region = _to_region(x)
+        begin = self._text.rfind('\n', 0, region.begin()) + 1
+        end = self._text.find('\n', region.end())
+        if end == -1:
+            end = len(self._text)
+        return Region(begin, end)
+
+    def full_line(self, x):
+        region = self.line(x)
+        if region.end() < len(self._text):
+            return Region(region.begin(), region.end() + 1)
+        return region
+
+    def lines(self, x):
+        region = _to_region(x)
+        lines = []
+        point = region.begin()
+        while True:
+            line = self.line(point)
+            lines.append(line)
+            if line.end() >= region.end() or line.end() >= len(self._text):
+                return lines
+            point = line.end() + 1
+
+    def split_by_newlines(self, region):
+        return [r.intersection(region) for r in self.lines(region)]
+
+    def find(self, pattern, start_pt, flags=FindFlags.NONE):
+        expr = self._compile(pattern, flags)
+        match = expr.search(self._text, start_pt)
+        return Region(match.start(), match.end()) if match else Region(-1)
+
+    def find_all(self, pattern, flags=FindFlags.NONE, fmt=None, extractions=None):
+        expr = self._compile(pattern, flags)
+        return [Region(m.start(), m.end()) for m in expr.finditer(self._text)]
+
+    def _compile(self, pattern, flags):
+        if flags & FindFlags.LITERAL:
+            pattern = re.escape(pattern)
+        if flags & FindFlags.WHOLEWORD:
+            pattern = r'\b' + pattern + r'\b'
+        return re.compile(pattern, re.IGNORECASE if flags & FindFlags.IGNORECASE else 0)
+
+    def show(self, x, show_surrounds=True, keep_to_left=False, animate=True):
+        self._viewport_position = _to_region(x).b if not isinstance(x, Selection) else 0
+
+    def show_at_center(self, x, animate=True):
+        self.show(x)
+
+    def visible_region(self):
+        return Region(0, len(self._text))
+
+    def add_regions(self, key, regions, scope='', icon='', flags=0, annotations=[],
+                    annotation_color='', on_navigate=None, on_close=None):
+        self._regions[key] = [Region(r.a, r.b) for r in regions]
+
+    def get_regions(self, key):
+        return list(self._regions.get(key, []))
+
+    def erase_regions(self, key):
+        self._regions.pop(key, None)
+
+    def set_status(self, key, value):
+        self._status[key] = value
+
+    def get_status(self, key):
+        return self._status.get(key, '')
+
+    def erase_status(self, key):
+        self._status.pop(key, None)
+
+    def run_command(self, cmd, args=None):
+        args = args or {}
+        command = _text_commands.get(cmd)
+        if command is not None:
+            command(self, **args)
+
+    # Edits
+
+    def _replace(self, begin, end, characters):
+        if self._read_only:
+            return
+        self._text = self._text[:begin] + characters + self._text[end:]
+        inserted = len(characters)
+        self._sel._adjust(begin, end, inserted)
+        for key, regions in self._regions.items():
+            self._regions[key] = [_shift_region(r, begin, end, inserted) for r in regions]
+        self._change_count += 1
+
+
+def _insert(view, characters=''):
+    for region in reversed(list(view.sel())):
+        view._replace(region.begin(), region.end(), characters)
+    view.sel()._regions = [Region(region.end()) for region in view.sel()]
+
+
+def _append(view, characters='', force=False, scroll_to_end=False):
+    if view.is_read_only() and not force:
+        return
+    read_only = view._read_only
+    view._read_only = False
+    end = view.size()
+    view._replace(end, end, characters)
+    view._read_only = read_only
+    if scroll_to_end:
+        view.show(view.size())
+
+
+def _select_all(view):
+    view.sel().clear()
+    view.sel().add(Region(0, view.size()))
+
+
+def _left_delete(view):
+    for region in reversed(list(view.sel())):
+        if region.empty():
+            if region.a == 0:
+                continue
+            view._replace(region.a - 1, region.a, '')
+        else:
+            view._replace(region.begin(), region.end(), '')
+
+
+def _right_delete(view):
+    for region in reversed(list(view.sel())):
+        if region.empty():
+            view._replace(region.a, min(region.a + 1, view.size()), '')
+        else:
+            view._replace(region.begin(), region.end(), '')
+
+
+_text_commands = {
+    'insert': _insert,
+    'append': _append,
+    'select_all': _select_all,
+    'left_delete': _left_delete,
+    'right_delete': _right_delete,
+}
+
+
+class Window:
+    def __init__(self, id):
+        self.window_id = id
+        self._views = []
+        self._active_view = None
+        self._panels = {}
+        self._active_panel = None
+        self._settings = Settings()
+        self._project_data = None
+        self._valid = True
+        self._visibility = {}
+        self._status_message = ''
+        #: The arguments of the last call to :meth:`show_quick_panel`.
+        self.last_quick_panel = None
+
+    def __eq__(self, other):
+        return isinstance(other, Window) and other.window_id == self.window_id
+
+    def __hash__(self):
+        return self.window_id
+
+    def __bool__(self):
+        return self.window_id != 0
+
+    def __repr__(self):
+        return f"Window({self.window_id!r})"
+
+    def id(self):
+        return self.window_id
+
+    def is_valid(self):
+        return self._valid
+
+    def settings(self):
+        return self._settings
+
+    def views(self, *, include_transient=False):
+        return list(self._views)
+
+    def active_view(self):
+        return self._active_view
+
+    def focus_view(self, view):
+        if view in self._views:
+            self._active_view = view
+
+    def new_file(self, flags=NewFileFlags.NONE, syntax=''):
+        view = View(next(_ids), self)
+        if syntax:
+            view.assign_syntax(syntax)
+        self._views.append(view)
+        self._active_view = view
+        return view
+
+    def _remove_view(self, view):
+        if view in self._views:
+            self._views.remove(view)
+            if self._active_view == view:
+                self._active_view = self._views[-1] if self._views else None
+        for name, panel in list(self._panels.items()):
+            if panel[0] == view:
+                del self._panels[name]
+
+    def _close(self):
+        for view in list(self._views):
+            view.close()
+        for view, _ in list(self._panels.values()):
+            view.close()
+        self._valid = False
+        if self in _windows:
+            _windows.remove(self)
+
+    def create_output_panel(self, name, unlisted=False):
+        existing = self._panels.get(name)
+        if existing is not None:
+            return existing[0]
+        view = View(next(_ids), self, panel_name=name)
+        self._panels[name] = (view, unlisted)
+        return view
+
+    def find_output_panel(self, name):
+        panel = self._panels.get(name)
+        return panel[0] if panel else None
+
+    def destroy_output_panel(self, name):
+        panel = self._panels.pop(name, None)
+        if panel is not None:
+            panel[0]._valid = False
+            if self._active_panel == 'output.' + name:
+                self._active_panel = None
+
+    def panels(self):
+        return ['console', 'find', 'find_in_files', 'replace', 'incremental_find'] + [
+            'output.' + name for name, (_, unlisted) in self._panels.items() if not unlisted
+        ]
+
+    def active_panel(self):
+        return self._active_panel
+
+    def run_command(self, cmd, args=None):
+        args = args or {}
+        if cmd == 'show_panel':
+            self._active_panel = args.get('panel')
+        elif cmd == 'hide_panel':
+            self._active_panel = None
+        elif cmd == 'close_file':
+            if self._active_view is not None:
+                self._active_view.close()
+        elif cmd == 'close_window':
+            self._close()
+
+    def show_quick_panel(self, items, on_select, flags=0, selected_index=-1,
+                         on_highlight=None, placeholder=None):
+        self.last_quick_panel = {
+            'items': items,
+            'on_select': on_select,
+            'flags': flags,
+            'selected_index': selected_index,
+            'on_highlight': on_highlight,
+        }
+
+    def status_message(self, msg):
+        self._status_message = msg
+
+    def project_data(self):
+        return _clone(self._project_data)
+
+    def set_project_data(self, data):
+        self._project_data = _clone(data)
+
+    def extract_variables(self):
+        return {'platform': platform()}
+
+    def __getattr__(self, name):
+        match = re.match(r'(set|is|get)_(\w+)_visible$', name)
+        if match is None:
+            raise AttributeError(name)
+        element = match.group(2)
+        if match.group(1) == 'set':
+            return lambda flag: self._visibility.__setitem__(element, bool(flag))
+        return lambda: self._visibility.get(element, True)
+
+
+# Application
+
+def version():
+    return '4202'
+
+
+def platform():
+    return 'linux'
+
+
+def arch():
+    return 'x64'
+
+
+def channel():
+    return 'stable'
+
+
+def executable_path():
+    return str(_paths['executable'])
+
+
+def packages_path():
+    return str(_paths['packages'])
+
+
+def installed_packages_path():
+    return str(_paths['installed_packages'])
+
+
+def cache_path():
+    return str(_paths['cache'])
+
+
+def status_message(msg):
+    window = active_window()
+    if window is not None:
+        window.status_message(msg)
+
+
+def error_message(msg):
+    pass
+
+
+def message_dialog(msg):
+    pass
+
+
+def ok_cancel_dialog(msg, ok_title='', title=''):
+    return dialog_result == DialogResult.YES
+
+
+def yes_no_cancel_dialog(msg, yes_title='', no_title='', title=''):
+    return dialog_result
+
+
+def run_command(cmd, args=None):
+    if cmd == 'new_window':
+        _windows.append(Window(next(_ids)))
+
+
+def windows():
+    return list(_windows)
+
+
+def active_window():
+    return _windows[-1] if _windows else None
+
+
+def set_timeout(callback, delay=0):
+    with _lock:
+        heapq.heappush(_timeouts, (_clock + delay, next(_timeout_counter), callback))
+
+
+def set_timeout_async(callback, delay=0):
+    set_timeout(callback, delay)
+
+
+def score_selector(scope_name, selector):
+    return 1 if any(
+        scope.startswith(part.strip())
+        for part in selector.split(',')
+        for scope in scope_name.split()
+    ) else 0
+
+
+# Resources
+
+def _package_order(package):
+    if package == 'Default':
+        return (0, '')
+    elif package == 'User':
+        return (2, '')
+    else:
+        return (1, package.lower())
+
+
+def _index_resources():
+    """Return a dict mapping each resource path to a function that loads its bytes."""
+    global _resource_index
+    if _resource_index is not None:
+        return _resource_index
+
+    index = {}
+
+    def add_zip(package, archive, prefix=''):
+        for name in archive.namelist():
+            if name.endswith('/') or not name.startswith(prefix):
+                continue
+            resource = 'Packages/' + package + '/' + name[len(prefix):]
+            index.setdefault(resource, lambda name=name: archive.read(name))
+
+    packages = _paths['packages']
+    if packages.is_dir():
+        for package_dir in packages.iterdir():
+            if package_dir.is_dir():
+                for root, _, files in os.walk(str(package_dir)):
+                    for file in files:
+                        path = Path(root, file)
+                        resource = 'Packages/' + path.relative_to(packages).as_posix()
+                        index[resource] = path.read_bytes
+
+    installed = _paths['installed_packages']
+    if installed.is_dir():
+        for archive_path in installed.glob('*.sublime-package'):
+            add_zip(archive_path.stem, zipfile.ZipFile(str(archive_path)))
+
+    if _zip_fixture is not None:
+        packages_in_zip = {
+            name.split('/')[0] for name in _zip_fixture.namelist() if '/' in name
+        }
+        for package in packages_in_zip:
+            add_zip(package, _zip_fixture, package + '/')
+
+    _resource_index = dict(sorted(
+        index.items(),
+        key=lambda item: (_package_order(item[0].split('/')[1]), item[0])
+    ))
+    return _resource_index
+
+
+def find_resources(pattern):
+    return [
+        resource for resource in _index_resources()
+        if fnmatch.fnmatchcase(resource.rsplit('/', 1)[-1], pattern)
+    ] if pattern else list(_index_resources())
+
+
+def load_binary_resource(name, max_size=None):
+    try:
+        return _index_resources()[name]()
+    except KeyError:
+        raise IOError("resource not found") from None
+
+
+def load_resource(name, max_size=None):
+    return load_binary_resource(name).decode('utf-8').replace('\r\n', '\n')
+
+
+_COMMENT_RE = re.compile(r'''(?x)
+    ("(?:\\.|[^"\\])*")  # string
+    | //[^\n]*           # line comment
+    | /\*.*?\*/          # block comment
+    | ,(?=\s*[\]}])      # trailing comma
+''', re.DOTALL)
+
+
+def decode_value(data):
+    stripped = _COMMENT_RE.sub(lambda m: m.group(1) or '', data)
+    try:
+        return json.loads(stripped)
+    except ValueError as err:
+        raise ValueError(str(err)) from None
+
+
+def encode_value(value, pretty=False, update_text=None):
+    return json.dumps(value, indent=4 if pretty else None)
+
+
+def expand_variables(value, variables):
+    def expand(text):
+        return re.sub(
+            r'\$(\w+)|\$\{(\w+)\}',
+            lambda m: variables.get(m.group(1) or m.group(2), ''),
+            text
+        )
+
+    if isinstance(value, str):
+        return expand(value)
+    elif isinstance(value, list):
+        return [expand_variables(v, variables) for v in value]
+    elif isinstance(value, dict):
+        return {k: expand_variables(v, variables) for k, v in value.items()}
+    return value
+
+
+def load_settings(base_name):
+    with _lock:
+        settings = _settings_files.get(base_name)
+        if settings is None:
+            settings = Settings()
+            for resource in find_resources(base_name):
+                try:
+                    settings._values.update(decode_value(load_resource(resource)))
+                except ValueError:
+                    pass
+            _settings_files[base_name] = settings
+        return settings
+
+
+def save_settings(base_name):
+    settings = _settings_files.get(base_name)
+    if settings is None:
+        return
+    user_path = Path(packages_path(), 'User', base_name)
+    user_path.parent.mkdir(parents=True, exist_ok=True)
+    user_path.write_text(encode_value(settings._values, pretty=True), encoding='utf-8')
+
+
+# Syntaxes
+
+class Syntax:
+    def __init__(self, path, name, hidden, scope):
+        self.path = path
+        self.name = name
+        self.hidden = hidden
+        self.scope = scope
+
+    def __eq__(self, other):
+        return isinstance(other, Syntax) and self.path == other.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __repr__(self):
+        return f'Syntax({self.path!r}, {self.name!r}, {self.hidden!r}, {self.scope!r})'
+
+
+def list_syntaxes():
+    syntaxes = []
+    for resource in find_resources('*.sublime-syntax'):
+        text = load_resource(resource)
+        scope = re.search(r'^scope:\s*(\S+)', text, re.MULTILINE)
+        name = re.search(r'^name:\s*(.+)$', text, re.MULTILINE)
+        hidden = re.search(r'^hidden:\s*true', text, re.MULTILINE)
+        syntaxes.append(Syntax(
+            resource,
+            name.group(1).strip() if name else resource.rsplit('/', 1)[-1][:-15],
+            bool(hidden),
+            scope.group(1) if scope else '',
+        ))
+    return syntaxes
+
+
+def syntax_from_path(path):
+    return next((syntax for syntax in list_syntaxes() if syntax.path == path), None)
+
+
+def find_syntax_by_scope(scope):
+    return [syntax for syntax in list_syntaxes() if syntax.scope == scope]
+
+
+def find_syntax_by_name(name):
+    return [syntax for syntax in list_syntaxes() if syntax.name == name]
+
+
+def find_syntax_for_file(path, first_line=''):
+    return None
+
+
+# Miscellaneous
+
+class Phantom:
+    def __init__(self, region, content, layout, on_navigate=None):
+        self.region = region
+        self.content = content
+        self.layout = layout
+        self.on_navigate = on_navigate
+
+
+class PhantomSet:
+    def __init__(self, view, key=""):
+        self.view = view
+        self.key = key
+        self.phantoms = []
+
+    def update(self, phantoms):
+        self.phantoms = list(phantoms)
+
+
+_windows.append(Window(next(_ids)))
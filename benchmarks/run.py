@@ -0,0 +1,463 @@
+"""
+Benchmarks for :mod:`sublime_lib` hot paths.
+
+The benchmarks run under a normal Python interpreter
+against the headless ``sublime`` module in ``benchmarks/headless``.
+Results are written as JSON so that runs from different releases can be compared.
+To benchmark another checkout of :mod:`sublime_lib`,
+such as a previous release, point ``SUBLIME_LIB_PATH`` at it:
+
+.. code-block:: sh
+
+   git worktree add ../sublime_lib-previous <previous release tag>
+   SUBLIME_LIB_PATH=../sublime_lib-previous python benchmarks/run.py --output before.json
+   python benchmarks/run.py --output after.json --compare before.json
+
+Benchmarks of features that the benchmarked version lacks
+are skipped and recorded as missing.
+
+Each benchmark is run `repeat` times;
+every run calls the benchmarked function `number` times.
+Inputs are generated deterministically, so runs are comparable across machines
+up to the speed of the machine itself.
+"""
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'headless'))
+sys.path.insert(0, os.environ.get('SUBLIME_LIB_PATH') or os.path.dirname(HERE))
+
+import sublime  # noqa: E402
+
+import sublime_lib  # noqa: E402
+from sublime_lib import (  # noqa: E402
+    RegionManager, ResourcePath, SettingsDict, ViewStream, show_selection_panel
+)
+from sublime_lib._util.glob import get_glob_matcher  # noqa: E402
+from sublime_lib.flags import PointClass, QuickPanelOption, RegionOption  # noqa: E402
+
+
+def accepts(fn, parameter):
+    return parameter in inspect.signature(fn).parameters
+
+
+def runs(fn):
+    """Return whether `fn()` completes, rather than failing as an unimplemented feature."""
+    try:
+        fn()
+    except (NameError, NotImplementedError):
+        return False
+    return True
+
+
+# Features that not every release has, by name.
+FEATURES = {
+    'LayeredSettings': hasattr(sublime_lib, 'LayeredSettings'),
+    'SettingsDict(cached=)': accepts(SettingsDict, 'cached'),
+    # Before 2.2, `SettingsDict` could not be iterated and `update()` raised a NameError.
+    'iter(SettingsDict)': runs(lambda: list(SettingsDict(sublime.Settings()))),
+    'SettingsDict.update': runs(lambda: SettingsDict(sublime.Settings()).update({})),
+    'ViewStream(buffer_size=)': accepts(ViewStream, 'buffer_size'),
+    'ViewStream(append_mode=)': accepts(ViewStream, 'append_mode'),
+    'ViewStream.replace_many': hasattr(ViewStream, 'replace_many'),
+    'iter(ViewStream)': hasattr(ViewStream, '__iter__'),
+}
+
+BENCHMARKS = []
+
+REPEAT = 5
+
+
+def benchmark(name, *, number=1, repeat=REPEAT, requires=None, **params):
+    """Register `fn(**params)` as a benchmark.
+
+    `fn` is called once with `params` for setup and must return the function to time.
+    Before setup, the headless module is reset and any resource fixture is unloaded,
+    so results do not depend on which benchmarks ran before.
+    If `requires` names a feature in :data:`FEATURES` that is not available,
+    the benchmark is skipped.
+    """
+    def decorator(fn):
+        BENCHMARKS.append({
+            'name': name,
+            'params': params,
+            'number': number,
+            'repeat': repeat,
+            'requires': requires,
+            'setup': fn,
+        })
+        return fn
+    return decorator
+
+
+def resource_names(count):
+    """Return `count` resource paths spread across packages and directories."""
+    return [
+        f'Packages/Package{i % 50:02d}/dir{i % 7}/sub{i % 3}/file{i:06d}'
+        + ('.py', '.sublime-settings', '.sublime-syntax', '.txt')[i % 4]
+        for i in range(count)
+    ]
+
+
+_fixtures = {}
+
+
+def use_resource_fixture(count):
+    """Load a zip fixture containing `count` empty resources."""
+    path = _fixtures.get(count)
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.zip')
+        os.close(fd)
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name in resource_names(count):
+                archive.writestr(name[len('Packages/'):], '')
+        _fixtures[count] = path
+    sublime.load_fixture(path)
+
+
+def new_view():
+    return sublime.active_window().new_file()
+
+
+def new_views(count=REPEAT):
+    """Return an iterator over `count` new views, created now rather than while timing."""
+    return iter([new_view() for _ in range(count)])
+
+
+# Resource paths
+
+for count in (1_000, 10_000, 100_000):
+    @benchmark('ResourcePath.__init__', count=count)
+    def resource_path_construction(count):
+        names = resource_names(count)
+        return lambda: [ResourcePath(name) for name in names]
+
+    @benchmark('ResourcePath.glob_resources', count=count)
+    def resource_path_glob(count):
+        use_resource_fixture(count)
+        return lambda: ResourcePath.glob_resources('Packages/Package0*/**/*.py')
+
+    @benchmark('ResourcePath.parents', count=count)
+    def resource_path_parents(count):
+        paths = [ResourcePath(name) for name in resource_names(count)]
+        return lambda: [path.parents[-1] for path in paths]
+
+
+@benchmark('get_glob_matcher', number=100, patterns=8)
+def glob_matcher_compilation(patterns):
+    pattern_list = [
+        '*.py', '**/*.py', '/Packages/*/foo/*.txt', 'Packages/**/[abc]*.json',
+        '/Packages/Default/**', 'sub?/*.sublime-*', '**/dir*/**/file*', '/Cache/**/*.cache',
+    ][:patterns]
+    compile_pattern = get_glob_matcher.__wrapped__
+    return lambda: [compile_pattern(pattern) for pattern in pattern_list]
+
+
+# Settings
+
+for subscribers in (10, 200):
+    @benchmark('SettingsDict.subscribe fan-out', number=100, subscribers=subscribers)
+    def settings_subscription_fan_out(subscribers):
+        settings = SettingsDict(new_view().settings())
+        for i in range(subscribers):
+            settings[f'key_{i}'] = i
+            settings.subscribe(f'key_{i}', lambda new, old: None)
+
+        counter = iter(range(10 ** 9))
+        return lambda: settings.__setitem__('key_0', next(counter))
+
+
+@benchmark(
+    'SettingsDict.update', number=100, requires='SettingsDict.update', keys=30, subscribers=30
+)
+def settings_update(keys, subscribers):
+    settings = SettingsDict(new_view().settings())
+    for i in range(subscribers):
+        settings.subscribe(lambda this: None, lambda new, old: None)
+
+    counter = iter(range(10 ** 9))
+
+    def run():
+        value = next(counter)
+        settings.update({f'key_{i}': value for i in range(keys)})
+    return run
+
+
+@benchmark('dict(SettingsDict)', number=100, requires='iter(SettingsDict)', keys=100)
+def settings_to_dict(keys):
+    settings = SettingsDict(new_view().settings())
+    for i in range(keys):
+        settings[f'key_{i}'] = i
+
+    counter = iter(range(10 ** 9))
+
+    def run():
+        settings['key_0'] = next(counter)
+        dict(settings)
+    return run
+
+
+for cached in (False, True):
+    @benchmark(
+        'SettingsDict.__getitem__', number=1000,
+        requires='SettingsDict(cached=)' if cached else None, cached=cached
+    )
+    def settings_read(cached):
+        if cached:
+            settings = SettingsDict(new_view().settings(), cached=True)
+        else:
+            settings = SettingsDict(new_view().settings())
+        settings['example'] = {'a': [1, 2, 3]}
+        return lambda: settings['example']
+
+
+@benchmark('LayeredSettings.__getitem__', number=1000, requires='LayeredSettings', layers=4)
+def layered_settings_read(layers):
+    window = new_view().window()
+    settings = sublime_lib.LayeredSettings(
+        [(f'layer_{i}', SettingsDict(window.new_file().settings())) for i in range(layers - 1)]
+        + [('defaults', {'example': 1})]
+    )
+    return lambda: settings['example']
+
+
+# View streams
+
+@benchmark('ViewStream.write', number=1, lines=1000)
+def view_stream_write(lines):
+    views = new_views()
+
+    def run():
+        stream = ViewStream(next(views))
+        for i in range(lines):
+            stream.write(f'line {i}\n')
+    return run
+
+
+@benchmark('ViewStream.print', number=1, lines=1000)
+def view_stream_print(lines):
+    views = new_views()
+
+    def run():
+        stream = ViewStream(next(views))
+        for i in range(lines):
+            stream.print('line', i)
+    return run
+
+
+@benchmark(
+    'ViewStream.print (buffered)', number=1, requires='ViewStream(buffer_size=)', lines=1000
+)
+def view_stream_print_buffered(lines):
+    views = new_views()
+
+    def run():
+        stream = ViewStream(next(views), buffer_size=64 * 1024)
+        for i in range(lines):
+            stream.print('line', i)
+        stream.flush()
+    return run
+
+
+@benchmark(
+    'ViewStream.print (append mode)', number=1, requires='ViewStream(append_mode=)', lines=1000
+)
+def view_stream_print_append(lines):
+    views = new_views()
+
+    def run():
+        stream = ViewStream(next(views), append_mode=True)
+        for i in range(lines):
+            stream.print('line', i)
+    return run
+
+
+@benchmark('ViewStream.read', number=10, lines=10_000)
+def view_stream_read(lines):
+    stream = ViewStream(new_view())
+    stream.write(''.join(f'line {i}\n' for i in range(lines)))
+
+    def run():
+        stream.seek_start()
+        stream.read()
+    return run
+
+
+@benchmark('ViewStream.readline', number=1, lines=10_000)
+def view_stream_readline(lines):
+    stream = ViewStream(new_view())
+    stream.write(''.join(f'line {i}\n' for i in range(lines)))
+
+    def run():
+        stream.seek_start()
+        while stream.readline():
+            pass
+    return run
+
+
+@benchmark('ViewStream.replace_many', number=1, requires='ViewStream.replace_many', lines=1000)
+def view_stream_replace_many(lines):
+    views = new_views()
+
+    def run():
+        stream = ViewStream(next(views))
+        stream.write(''.join(f'line {i}\n' for i in range(lines)))
+        stream.replace_many((i * 10, '* ') for i in range(lines // 10))
+    return run
+
+
+@benchmark('iter(ViewStream)', number=1, requires='iter(ViewStream)', lines=10_000)
+def view_stream_iter(lines):
+    stream = ViewStream(new_view())
+    stream.write(''.join(f'line {i}\n' for i in range(lines)))
+
+    def run():
+        stream.seek_start()
+        for line in stream:
+            pass
+    return run
+
+
+# Regions and panels
+
+@benchmark('RegionManager.set', number=10, regions=10_000)
+def region_manager_set(regions):
+    view = new_view()
+    view.run_command('append', {'characters': 'x' * (regions * 2)})
+    manager = RegionManager(view, scope='comment', flags=RegionOption.DRAW_EMPTY)
+    region_list = [sublime.Region(i * 2, i * 2 + 1) for i in range(regions)]
+    return lambda: manager.set(region_list)
+
+
+@benchmark('show_selection_panel', number=1, items=100_000)
+def selection_panel_labels(items):
+    window = sublime.active_window()
+    item_list = list(range(items))
+    labels = [(f'Item {i}', f'Detail {i}') if i % 2 else f'Item {i}' for i in item_list]
+    return lambda: show_selection_panel(
+        window, item_list, labels=labels, flags=['MONOSPACE_FONT', 'WANT_EVENT']
+    )
+
+
+# Flags
+
+@benchmark('flags enum construction', number=1000)
+def flags_construction():
+    def run():
+        RegionOption('DRAW_EMPTY', 'HIDE_ON_MINIMAP', 'DRAW_NO_FILL')
+        PointClass(3)
+        PointClass('WORD_START', 'WORD_END')
+        QuickPanelOption('MONOSPACE_FONT')
+    return run
+
+
+# Runner
+
+def run_benchmark(spec):
+    if spec['requires'] is not None and not FEATURES[spec['requires']]:
+        return {
+            'name': spec['name'],
+            'params': spec['params'],
+            'missing': spec['requires'],
+        }
+
+    sublime.unload_fixture()
+    sublime.reset()
+    fn = spec['setup'](**spec['params'])
+    number = spec['number']
+    times = []
+    for _ in range(spec['repeat']):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+
+    return {
+        'name': spec['name'],
+        'params': spec['params'],
+        'number': number,
+        'repeat': spec['repeat'],
+        'times': times,
+        'min': min(times),
+        'median': statistics.median(times),
+    }
+
+
+def benchmark_id(result):
+    params = ','.join(f'{key}={value}' for key, value in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]" if params else result['name']
+
+
+def compare(results, baseline, threshold):
+    """Print the change from `baseline` and return the number of regressions."""
+    previous = {benchmark_id(result): result for result in baseline['results']}
+    regressions = 0
+    for result in results:
+        key = benchmark_id(result)
+        if key not in previous or 'missing' in result or 'missing' in previous[key]:
+            continue
+        ratio = result['min'] / previous[key]['min']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f'{key:<60} {ratio:6.2f}x{flag}', file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-o', '--output', help='write JSON results to this file')
+    parser.add_argument('-k', '--filter', default='', help='only run benchmarks containing this')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare against')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='relative slowdown reported as a regression (default: 0.1)'
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for spec in BENCHMARKS:
+        if args.filter not in spec['name']:
+            continue
+        result = run_benchmark(spec)
+        if 'missing' in result:
+            print(f"{benchmark_id(result):<60} missing {result['missing']}", file=sys.stderr)
+        else:
+            print(f"{benchmark_id(result):<60} {result['min'] * 1000:10.3f} ms", file=sys.stderr)
+        results.append(result)
+
+    report = {
+        'sublime_lib': sublime_lib.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            if compare(results, json.load(file), args.threshold):
+                return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,14 @@
 from .activity_indicator import ActivityIndicator
+from .layered_settings import LayeredSettings
 from .panel import Panel, OutputPanel
 from .region_manager import RegionManager
 from .resource_path import ResourcePath
-from .settings_dict import NamedSettingsDict, SettingsDict
+from .settings_dict import KeyPath, NamedSettingsDict, SettingsDict, SettingsDiff
+from .settings_resolver import clear_resolved_settings, resolve_settings
+from .settings_schema import Field, SchemaError, SettingsSchema, ValidatedSettings
 from .show_selection_panel import NO_SELECTION, show_selection_panel
 from .syntax import list_syntaxes, get_syntax_for_scope
-from .view_stream import ViewStream
+from .view_stream import QueuedWriter, ViewStream
 from .view_utils import LineEnding, close_view, new_view
 from .window_utils import close_window, new_window
 
@@ -25,11 +28,21 @@ __all__ = [
     "ResourcePath",
     "NamedSettingsDict",
     "SettingsDict",
+    "SettingsDiff",
+    "KeyPath",
+    "LayeredSettings",
+    "Field",
+    "SchemaError",
+    "SettingsSchema",
+    "ValidatedSettings",
+    "resolve_settings",
+    "clear_resolved_settings",
     "NO_SELECTION",
     "show_selection_panel",
     "list_syntaxes",
     "get_syntax_for_scope",
     "ViewStream",
+    "QueuedWriter",
     "LineEnding",
     "close_view",
     "new_view",
@@ -2,12 +2,148 @@ from __future__ import annotations
 from collections.abc import Iterable, Mapping
 from typing import TYPE_CHECKING
 
+from .named_value import NamedValue
+
 if TYPE_CHECKING:
     from sublime_types import Value
     from typing import Callable
 
+    PathPart = str | int
+
+
+__all__ = [
+    'projection', 'compile_projection', 'get_selector', 'get_selector_keys', 'diff_paths',
+    'KeyPath', 'get_path', 'replace_path',
+]
+
+
+_MISSING = NamedValue('MISSING')
+
+
+class KeyPath:
+    """
+    A path to a value nested inside a setting.
+
+    The first part is the name of a setting;
+    each further part is a dictionary key or a list index.
+
+    .. code-block:: python
+
+       >>> KeyPath('lsp', 'clients', 'pyright')
+       KeyPath('lsp', 'clients', 'pyright')
+       >>> KeyPath.parse('lsp.clients.pyright')
+       KeyPath('lsp', 'clients', 'pyright')
+
+    ..  versionadded:: 2.2
+    """
+
+    __slots__ = ['parts']
+
+    parts: tuple[PathPart, ...]
+
+    def __init__(self, *parts: PathPart):
+        if not parts or not isinstance(parts[0], str):
+            raise ValueError("The first part of a KeyPath must be the name of a setting.")
+        self.parts = parts
+
+    @classmethod
+    def parse(cls, path: str) -> KeyPath:
+        """Return a new :class:`KeyPath` from a dotted string.
+
+        Setting names or dictionary keys that contain dots
+        cannot be represented this way;
+        construct the :class:`KeyPath` from its parts instead.
+        """
+        return cls(*path.split('.'))
+
+    @classmethod
+    def coerce(cls, path: KeyPath | str | Iterable[PathPart]) -> KeyPath:
+        if isinstance(path, KeyPath):
+            return path
+        elif isinstance(path, str):
+            return cls.parse(path)
+        else:
+            return cls(*path)
 
-__all__ = ['projection', 'get_selector']
+    @property
+    def key(self) -> str:
+        """The name of the setting that contains the value."""
+        return self.parts[0]  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, KeyPath) and self.parts == other.parts
+
+    def __hash__(self) -> int:
+        return hash(self.parts)
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(type(self).__name__, ', '.join(map(repr, self.parts)))
+
+
+def _index(value: list, part: PathPart) -> int | None:
+    if isinstance(part, str):
+        if not part.isdigit():
+            return None
+        part = int(part)
+    return part if -len(value) <= part < len(value) else None
+
+
+def get_path(value: Value, parts: Iterable[PathPart], default: Value = None) -> Value:
+    """
+    Return the value nested inside `value` at `parts`, or `default` if there is none.
+
+    .. code-block:: python
+
+       >>> get_path({'a': [{'b': 1}]}, ('a', 0, 'b'))
+       1
+    """
+    if isinstance(value, NamedValue):
+        return default
+    for part in parts:
+        if isinstance(value, dict) and isinstance(part, str) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and _index(value, part) is not None:
+            value = value[_index(value, part)]  # type: ignore
+        else:
+            return default
+    return value
+
+
+def replace_path(
+    value: Value | NamedValue,
+    parts: tuple[PathPart, ...],
+    new_value: Value,
+) -> Value:
+    """
+    Return a copy of `value` in which the value at `parts` is replaced by `new_value`.
+
+    Only the dictionaries and lists along `parts` are copied;
+    all other values are shared with `value`.
+    Missing dictionaries are created.
+    `value` may be a :class:`NamedValue` sentinel to indicate a missing value.
+
+    :raise TypeError: if `parts` passes through a value that is not a container.
+    :raise IndexError: if `parts` contains an index that is out of range for its list.
+    """
+    if not parts:
+        return new_value
+
+    head, rest = parts[0], parts[1:]
+    if isinstance(value, list):
+        index = _index(value, head)
+        if index is None:
+            raise IndexError(head)
+        result_list = list(value)
+        result_list[index] = replace_path(value[index], rest, new_value)
+        return result_list
+    elif isinstance(value, (dict, NamedValue)):
+        if not isinstance(head, str):
+            raise TypeError(f"Cannot index a dictionary with {head!r}.")
+        result_dict = dict(value) if isinstance(value, dict) else {}
+        result_dict[head] = replace_path(result_dict.get(head, _MISSING), rest, new_value)
+        return result_dict
+    else:
+        raise TypeError(f"Cannot set {head!r} inside {value!r}.")
 
 
 def projection(d: Mapping[str, Value], keys: Mapping[str, str] | Iterable[str]) -> Value:
@@ -41,17 +177,145 @@ def projection(d: Mapping[str, Value], keys: Mapping[str, str] | Iterable[str])
         }
 
 
+def compile_projection(
+    keys: Mapping[str, str] | Iterable[str],
+) -> Callable[[Mapping[str, Value]], Value]:
+    """
+    Return a function equivalent to ``lambda d: projection(d, keys)``
+    that reuses its previous result when nothing it selects has changed.
+
+    Each call looks up every key once with :meth:`~Mapping.get`.
+    If every selected value is the same object as on the previous call
+    (and the same keys are present),
+    the previous result object is returned,
+    so comparing it with the previous result short-circuits on identity.
+    Results are shared between calls and must not be mutated.
+
+    .. code-block:: python
+
+       >>> project = compile_projection(['a'])
+       >>> d = {'a': [1], 'b': 2}
+       >>> project(d) is project(d)
+       True
+    """
+    if isinstance(keys, Mapping):
+        pairs = tuple(keys.items())
+    else:
+        pairs = tuple((key, key) for key in keys)
+
+    last_values: list[Value | NamedValue] | None = None
+    last_result: dict[str, Value] = {}
+
+    def project(d: Mapping[str, Value]) -> Value:
+        nonlocal last_values, last_result
+        values: list[Value | NamedValue] = [
+            d.get(original_key, _MISSING) for original_key, _ in pairs  # type: ignore
+        ]
+        if last_values is not None and all(
+            value is last for value, last in zip(values, last_values)
+        ):
+            return last_result
+
+        last_values = values
+        last_result = {
+            new_key: value
+            for (_, new_key), value in zip(pairs, values)
+            if not isinstance(value, NamedValue)
+        }
+        return last_result
+
+    return project
+
+
 def get_selector(
-    selector: Callable[[Mapping[str, Value]], Value] | Iterable[str] | str,
+    selector: Callable[[Mapping[str, Value]], Value] | KeyPath | Iterable[str] | str,
     default_value: Value = None
 ) -> Callable[[Mapping[str, Value]], Value]:
     if callable(selector):
         return selector
+    elif isinstance(selector, KeyPath):
+        key, parts = selector.key, selector.parts[1:]
+        return lambda this: get_path(this.get(key, _MISSING), parts, default_value)  # type: ignore
     elif isinstance(selector, str):
         return lambda this: this.get(selector, default_value)
     elif isinstance(selector, Iterable):
-        return lambda this: projection(this, selector)
+        return compile_projection(selector)
+    else:
+        raise TypeError(
+            'The selector should be a function, string, or iterable of strings.'
+        )
+
+
+def get_selector_keys(
+    selector: Callable[[Mapping[str, Value]], Value] | KeyPath | Iterable[str] | str,
+) -> frozenset[str] | None:
+    """
+    Return the keys that the value selected by ``get_selector(selector)`` depends on,
+    or ``None`` if they cannot be determined (i.e. `selector` is callable).
+
+    .. code-block:: python
+
+       >>> get_selector_keys('a')
+       frozenset({'a'})
+       >>> get_selector_keys({'a': 'x', 'b': 'y'})
+       frozenset({'a', 'b'})
+    """
+    if callable(selector):
+        return None
+    elif isinstance(selector, KeyPath):
+        return frozenset((selector.key,))
+    elif isinstance(selector, str):
+        return frozenset((selector,))
+    elif isinstance(selector, Iterable):
+        return frozenset(selector)
     else:
         raise TypeError(
             'The selector should be a function, string, or iterable of strings.'
         )
+
+
+def diff_paths(old: Value, new: Value) -> list[tuple[str | int, ...]]:
+    """
+    Return the paths at which the JSON-like values `old` and `new` differ.
+
+    A path is a tuple of the dictionary keys and list indices leading to a difference.
+    Dictionaries and lists are compared recursively;
+    any other difference is reported at the path of the differing value.
+    Identical subtrees are skipped without being traversed;
+    otherwise each value is visited once,
+    and only scalars are compared with ``==``.
+
+    .. code-block:: python
+
+       >>> diff_paths({'a': {'b': 1, 'c': 2}, 'd': [1, 2]}, {'a': {'b': 1, 'c': 3}, 'd': [1]})
+       [('a', 'c'), ('d', 1)]
+    """
+    paths: list[tuple[str | int, ...]] = []
+    _diff_paths(old, new, (), paths)
+    return paths
+
+
+def _diff_paths(
+    old: Value,
+    new: Value,
+    prefix: tuple[str | int, ...],
+    paths: list[tuple[str | int, ...]],
+) -> None:
+    if old is new:
+        return
+    elif isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key in new:
+                _diff_paths(old[key], new[key], prefix + (key,), paths)
+            else:
+                paths.append(prefix + (key,))
+        for key in new:
+            if key not in old:
+                paths.append(prefix + (key,))
+    elif isinstance(old, list) and isinstance(new, list):
+        for index in range(min(len(old), len(new))):
+            _diff_paths(old[index], new[index], prefix + (index,), paths)
+        for index in range(min(len(old), len(new)), max(len(old), len(new))):
+            paths.append(prefix + (index,))
+    elif isinstance(old, (dict, list)) or old != new:
+        paths.append(prefix)
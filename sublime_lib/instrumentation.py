@@ -0,0 +1,566 @@
+"""
+Opt-in instrumentation of the Sublime API calls made by :mod:`sublime_lib`.
+
+While instrumentation is enabled,
+every call that :mod:`sublime_lib` makes to a :mod:`sublime` function
+or to a method of :class:`~sublime.View`, :class:`~sublime.Window`,
+:class:`~sublime.Settings`, or :class:`~sublime.Selection`
+is counted and timed.
+Calls are grouped by the public :mod:`sublime_lib` function or method
+that the plugin called,
+and the call sites inside :mod:`sublime_lib` are recorded.
+
+.. code-block:: python
+
+   >>> from sublime_lib.instrumentation import instrument
+   >>> with instrument() as report:
+   ...     stream.write('Hello, World!')
+   >>> print(report)
+   ViewStream.write: 1 call, 0.412 ms
+       View.sel: 3 calls, 0.020 ms
+           sublime_lib.view_stream:49 (1), sublime_lib.view_stream:51 (1), ...
+       ...
+
+Instrumentation patches the :mod:`sublime` module and the classes of :mod:`sublime_lib`,
+so it adds overhead to every API call made while it is enabled.
+It is intended for debugging and should not be left enabled.
+
+Separately, :func:`profile_subscriptions` records how long each
+:meth:`SettingsDict.subscribe <sublime_lib.SettingsDict.subscribe>` selector and callback takes,
+how often the selected value actually changed,
+and a bounded history of recent changes to watched settings:
+
+.. code-block:: python
+
+   >>> from sublime_lib.instrumentation import profile_subscriptions, show_report
+   >>> with profile_subscriptions(history=50) as report:
+   ...     settings['tab_size'] = 2
+   >>> show_report(window, report)
+
+.. versionadded:: 2.2
+"""
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, local
+from time import perf_counter, time
+from typing import TYPE_CHECKING, NamedTuple
+
+import inspect
+import json
+import sys
+import sublime
+
+from ._util.named_value import NamedValue
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from typing import Any, Callable
+
+__all__ = [
+    'Report', 'enable', 'disable', 'instrument', 'show_report',
+    'ChangeEvent', 'SubscriptionReport',
+    'enable_subscription_profiling', 'disable_subscription_profiling', 'profile_subscriptions',
+]
+
+
+_API_CLASSES = ['View', 'Window', 'Settings', 'Selection']
+_DUNDER_METHODS = {
+    '__len__', '__iter__', '__getitem__', '__setitem__', '__delitem__', '__contains__',
+}
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.time = 0.0
+        self.api: dict[str, _ApiStats] = {}
+
+
+class _ApiStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.time = 0.0
+        self.sites: dict[str, int] = {}
+
+
+class Report:
+    """The API calls recorded while instrumentation was enabled.
+
+    ``str(report)`` returns a human-readable summary.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._entries: dict[str, _Stats] = {}
+
+    def _record_entry(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            stats = self._entries.setdefault(name, _Stats())
+            stats.calls += 1
+            stats.time += elapsed
+
+    def _record_api(self, entry: str, api_name: str, site: str, elapsed: float) -> None:
+        with self._lock:
+            stats = self._entries.setdefault(entry, _Stats())
+            api_stats = stats.api.setdefault(api_name, _ApiStats())
+            api_stats.calls += 1
+            api_stats.time += elapsed
+            api_stats.sites[site] = api_stats.sites.get(site, 0) + 1
+
+    def clear(self) -> None:
+        """Discard all recorded calls."""
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the recorded calls as a JSON-serializable :class:`dict`.
+
+        The result maps the name of each :mod:`sublime_lib` entry point
+        to its call count, its cumulative time in seconds,
+        and the API calls made on its behalf:
+
+        .. code-block:: python
+
+           {
+               "ViewStream.write": {
+                   "calls": 1,
+                   "time": 0.000412,
+                   "api": {
+                       "View.sel": {
+                           "calls": 3,
+                           "time": 0.00002,
+                           "sites": {"sublime_lib.view_stream:49": 1, ...}
+                       },
+                       ...
+                   }
+               }
+           }
+        """
+        with self._lock:
+            return {
+                entry: {
+                    'calls': stats.calls,
+                    'time': stats.time,
+                    'api': {
+                        api_name: {
+                            'calls': api_stats.calls,
+                            'time': api_stats.time,
+                            'sites': dict(api_stats.sites),
+                        }
+                        for api_name, api_stats in sorted(
+                            stats.api.items(), key=lambda item: -item[1].calls
+                        )
+                    },
+                }
+                for entry, stats in sorted(self._entries.items())
+            }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Return :meth:`to_dict` serialized as JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def __str__(self) -> str:
+        lines = []
+        for entry, stats in self.to_dict().items():
+            lines.append(_format_line(entry, stats))
+            for api_name, api_stats in stats['api'].items():
+                lines.append('    ' + _format_line(api_name, api_stats))
+                lines.append('        ' + ', '.join(
+                    f'{site} ({count})' for site, count in api_stats['sites'].items()
+                ))
+        return '\n'.join(lines)
+
+
+def _format_line(name: str, stats: dict[str, Any]) -> str:
+    calls = stats['calls']
+    plural = '' if calls == 1 else 's'
+    return f"{name}: {calls} call{plural}, {stats['time'] * 1000:.3f} ms"
+
+
+_report: Report | None = None
+_originals: list[tuple[object, str, object]] = []
+_state = local()
+
+
+def _entry_stack() -> list[str]:
+    try:
+        return _state.stack
+    except AttributeError:
+        _state.stack = []
+        return _state.stack
+
+
+def _library_frame(frame: Any) -> Any:
+    """Return the innermost frame at or above `frame` that belongs to :mod:`sublime_lib`."""
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('sublime_lib') and module != __name__:
+            return frame
+        elif module == __name__:
+            frame = frame.f_back
+        else:
+            return None
+    return None
+
+
+def _wrap_api(api_name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        report = _report
+        frame = _library_frame(sys._getframe(1)) if report is not None else None
+        if frame is None:
+            return function(*args, **kwargs)
+
+        stack = _entry_stack()
+        if stack:
+            entry = stack[0]
+        else:
+            entry = frame.f_globals['__name__'] + '.' + frame.f_code.co_name
+
+        site = f"{frame.f_globals['__name__']}:{frame.f_lineno}"
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            report._record_api(entry, api_name, site, perf_counter() - start)  # type: ignore
+
+    return wrapper
+
+
+def _wrap_entry(entry: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        stack = _entry_stack()
+        if stack or _report is None:
+            return function(*args, **kwargs)
+
+        stack.append(entry)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stack.pop()
+            if _report is not None:
+                _report._record_entry(entry, perf_counter() - start)
+
+    return wrapper
+
+
+def _patch(owner: object, name: str, replacement: object) -> None:
+    _originals.append((owner, name, inspect.getattr_static(owner, name)))
+    setattr(owner, name, replacement)
+
+
+def _patch_api() -> None:
+    for name, value in list(vars(sublime).items()):
+        if inspect.isfunction(value) and not name.startswith('_'):
+            _patch(sublime, name, _wrap_api(name, value))
+
+    for class_name in _API_CLASSES:
+        cls = getattr(sublime, class_name, None)
+        if cls is None:
+            continue
+        for name, value in list(vars(cls).items()):
+            if inspect.isfunction(value) and (
+                not name.startswith('_') or name in _DUNDER_METHODS
+            ):
+                _patch(cls, name, _wrap_api(f'{class_name}.{name}', value))
+
+
+def _patch_library() -> None:
+    import sublime_lib
+
+    for export in sublime_lib.__all__:
+        value = getattr(sublime_lib, export)
+        if inspect.isfunction(value):
+            _patch(sublime_lib, export, _wrap_entry(export, value))
+        elif inspect.isclass(value):
+            for name, member in list(vars(value).items()):
+                if name.startswith('_') and name not in _DUNDER_METHODS | {'__init__'}:
+                    continue
+                entry = f'{value.__name__}.{name}'
+                if inspect.isfunction(member):
+                    _patch(value, name, _wrap_entry(entry, member))
+                elif isinstance(member, classmethod):
+                    _patch(value, name, classmethod(_wrap_entry(entry, member.__func__)))
+                elif isinstance(member, staticmethod):
+                    _patch(value, name, staticmethod(_wrap_entry(entry, member.__func__)))
+
+
+def enable() -> Report:
+    """Enable instrumentation and return a new :class:`Report` that will record calls.
+
+    Public :mod:`sublime_lib` functions are only recognized as entry points
+    when they are looked up through the :mod:`sublime_lib` module
+    after instrumentation has been enabled.
+    API calls made outside any recognized entry point (e.g. in timeout callbacks)
+    are grouped under the :mod:`sublime_lib` function that made them.
+
+    :raise RuntimeError: if instrumentation is already enabled.
+    """
+    global _report
+    if _report is not None:
+        raise RuntimeError("Instrumentation is already enabled.")
+
+    _patch_api()
+    _patch_library()
+    _report = Report()
+    return _report
+
+
+def disable() -> None:
+    """Disable instrumentation and restore the original functions.
+
+    If instrumentation is not enabled, do nothing.
+    """
+    global _report
+    _report = None
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+
+
+@contextmanager
+def instrument() -> Generator[Report, None, None]:
+    """Return a context manager that enables instrumentation
+    and yields the :class:`Report`.
+
+    Instrumentation is disabled when the context manager exits.
+    """
+    report = enable()
+    try:
+        yield report
+    finally:
+        disable()
+
+
+def show_report(
+    window: sublime.Window,
+    report: Report | SubscriptionReport,
+    *,
+    name: str = 'sublime_lib',
+) -> None:
+    """Show `report` in an output panel called `name` in the given `window`.
+
+    ..  versionchanged:: 2.2
+        Accept a :class:`SubscriptionReport`.
+    """
+    view = window.create_output_panel(name)
+    view.run_command('select_all')
+    view.run_command('left_delete')
+    view.run_command('append', {'characters': str(report) + '\n'})
+    window.run_command('show_panel', {'panel': 'output.' + name})
+
+
+class ChangeEvent(NamedTuple):
+    """A change to a watched setting, recorded by :func:`profile_subscriptions`."""
+
+    #: The :attr:`~sublime.Settings.settings_id` of the settings object.
+    settings_id: int
+    #: The name of the setting.
+    key: str
+    #: The previous value, or ``None`` if the setting was absent.
+    old_value: Any
+    #: The new value, or ``None`` if the setting was removed.
+    new_value: Any
+    #: The time of the change, as returned by :func:`time.time`.
+    timestamp: float
+
+
+class _SubscriptionStats:
+    def __init__(self, label: str, settings_id: int) -> None:
+        self.label = label
+        self.settings_id = settings_id
+        self.evaluations = 0
+        self.changes = 0
+        self.callbacks = 0
+        self.selector_time = 0.0
+        self.callback_time = 0.0
+
+
+def _describe_subscription(subscription: Any) -> str:
+    callback = subscription.callback_ref()
+    name = getattr(callback, '__qualname__', repr(callback))
+    keys = 'function' if subscription.keys is None else ', '.join(sorted(subscription.keys))
+    return f'{name} [{keys}]'
+
+
+class SubscriptionReport:
+    """Statistics about settings subscriptions, recorded by :func:`profile_subscriptions`.
+
+    For each subscription, the report records
+    how many times its selected value was evaluated,
+    how many of those evaluations found a changed value,
+    how many times its callback was invoked,
+    and the cumulative time spent in the selector and in the callback.
+    It also keeps the most recent changes to watched settings
+    (settings that a :class:`str` or iterable selector depends on).
+
+    ``str(report)`` returns a human-readable summary.
+    """
+
+    def __init__(self, history: int = 100) -> None:
+        self._lock = Lock()
+        self._stats: dict[object, _SubscriptionStats] = {}
+        #: The most recent :class:`ChangeEvent` objects, oldest first.
+        self.history: deque[ChangeEvent] = deque(maxlen=history)
+
+    def _get_stats(self, subscription: Any) -> _SubscriptionStats:
+        stats = self._stats.get(subscription)
+        if stats is None:
+            stats = self._stats[subscription] = _SubscriptionStats(
+                _describe_subscription(subscription),
+                subscription.dispatcher.settings.settings_id,
+            )
+        return stats
+
+    def _record_update(self, subscription: object, elapsed: float, changed: bool) -> None:
+        with self._lock:
+            stats = self._get_stats(subscription)
+            stats.evaluations += 1
+            stats.changes += changed
+            stats.selector_time += elapsed
+
+    def _record_callback(self, subscription: object, elapsed: float) -> None:
+        with self._lock:
+            stats = self._get_stats(subscription)
+            stats.callbacks += 1
+            stats.callback_time += elapsed
+
+    def _record_change(self, settings_id: int, key: str, old: Any, new: Any) -> None:
+        with self._lock:
+            self.history.append(ChangeEvent(
+                settings_id,
+                key,
+                None if isinstance(old, NamedValue) else old,
+                None if isinstance(new, NamedValue) else new,
+                time(),
+            ))
+
+    def clear(self) -> None:
+        """Discard all recorded statistics and history."""
+        with self._lock:
+            self._stats.clear()
+            self.history.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the recorded statistics as a JSON-serializable :class:`dict`.
+
+        .. code-block:: python
+
+           {
+               "subscriptions": [
+                   {
+                       "subscription": "MyListener.on_change [tab_size]",
+                       "settings_id": 12,
+                       "evaluations": 10,
+                       "changes": 2,
+                       "callbacks": 2,
+                       "selector_time": 0.00001,
+                       "callback_time": 0.0042
+                   },
+                   ...
+               ],
+               "history": [
+                   {
+                       "settings_id": 12, "key": "tab_size",
+                       "old_value": 4, "new_value": 2, "timestamp": 1700000000.0
+                   },
+                   ...
+               ]
+           }
+
+        Subscriptions are sorted by total time, slowest first.
+        """
+        with self._lock:
+            return {
+                'subscriptions': [
+                    {
+                        'subscription': stats.label,
+                        'settings_id': stats.settings_id,
+                        'evaluations': stats.evaluations,
+                        'changes': stats.changes,
+                        'callbacks': stats.callbacks,
+                        'selector_time': stats.selector_time,
+                        'callback_time': stats.callback_time,
+                    }
+                    for stats in sorted(
+                        self._stats.values(),
+                        key=lambda stats: -(stats.selector_time + stats.callback_time),
+                    )
+                ],
+                'history': [event._asdict() for event in self.history],
+            }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Return :meth:`to_dict` serialized as JSON."""
+        return json.dumps(self.to_dict(), indent=indent, default=repr)
+
+    def __str__(self) -> str:
+        report = self.to_dict()
+        lines = ['Subscriptions:']
+        for stats in report['subscriptions']:
+            lines.append(
+                f"    {stats['subscription']} (settings {stats['settings_id']}): "
+                f"{stats['evaluations']} evaluations, {stats['changes']} changes, "
+                f"{stats['callbacks']} callbacks, "
+                f"selector {stats['selector_time'] * 1000:.3f} ms, "
+                f"callback {stats['callback_time'] * 1000:.3f} ms"
+            )
+        lines.append('Recent changes:')
+        for event in report['history']:
+            lines.append(
+                f"    {event['timestamp']:.3f} settings {event['settings_id']} "
+                f"{event['key']}: {event['old_value']!r} -> {event['new_value']!r}"
+            )
+        return '\n'.join(lines)
+
+
+def enable_subscription_profiling(history: int = 100) -> SubscriptionReport:
+    """Start profiling settings subscriptions
+    and return a new :class:`SubscriptionReport` that will record them.
+
+    At most `history` recent changes are kept.
+
+    :raise RuntimeError: if subscription profiling is already enabled.
+
+    ..  versionadded:: 2.2
+    """
+    from . import settings_dict
+
+    if settings_dict._profiler is not None:
+        raise RuntimeError("Subscription profiling is already enabled.")
+
+    report = SubscriptionReport(history)
+    settings_dict._profiler = report
+    return report
+
+
+def disable_subscription_profiling() -> None:
+    """Stop profiling settings subscriptions.
+
+    If subscription profiling is not enabled, do nothing.
+
+    ..  versionadded:: 2.2
+    """
+    from . import settings_dict
+
+    settings_dict._profiler = None
+
+
+@contextmanager
+def profile_subscriptions(history: int = 100) -> Generator[SubscriptionReport, None, None]:
+    """Return a context manager that enables subscription profiling
+    and yields the :class:`SubscriptionReport`.
+
+    Profiling is disabled when the context manager exits.
+
+    ..  versionadded:: 2.2
+    """
+    report = enable_subscription_profiling(history)
+    try:
+        yield report
+    finally:
+        disable_subscription_profiling()
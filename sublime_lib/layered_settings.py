@@ -0,0 +1,181 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from ._util.weak_method import weak_method
+from .settings_dict import SettingsDict, _add_change_listener, _remove_change_listener
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from sublime_types import Value
+    from typing import Callable
+
+    _MappingBase = Mapping[str, Value]
+else:
+    # collections.abc classes are not subscriptable before Python 3.9.
+    _MappingBase = Mapping
+
+__all__ = ['LayeredSettings']
+
+
+class _Layer:
+    def __init__(
+        self,
+        owner: LayeredSettings,
+        name: str,
+        source: SettingsDict | Mapping[str, Value],
+    ):
+        self.name = name
+        self.source = source
+        self.values: dict[str, Value] = {}
+        self.listener: Callable[[], None] | None = None
+
+        if isinstance(source, SettingsDict):
+            on_change = weak_method(owner._on_layer_change)
+            self.listener = lambda: on_change(self)
+            _add_change_listener(source.settings, self.listener)
+
+    def read(self) -> dict[str, Value]:
+        if isinstance(self.source, SettingsDict):
+            return self.source.settings.to_dict()
+        else:
+            return dict(self.source)
+
+    def close(self) -> None:
+        if self.listener is not None:
+            assert isinstance(self.source, SettingsDict)
+            _remove_change_listener(self.source.settings, self.listener)
+            self.listener = None
+
+
+class LayeredSettings(_MappingBase):
+    """A read-only :class:`~collections.abc.Mapping`
+    that merges several named layers of settings.
+
+    `layers` is an iterable of ``(name, settings)`` pairs,
+    ordered from highest to lowest precedence.
+    Each `settings` is either a :class:`SettingsDict`
+    or a plain :class:`~collections.abc.Mapping` of default values.
+    The value of each key is taken from the first layer that defines it.
+
+    .. code-block:: python
+
+       settings = LayeredSettings([
+           ('view', SettingsDict(view.settings())),
+           ('project', window.project_data().get('settings', {}).get('MyPlugin', {})),
+           ('package', NamedSettingsDict.shared('MyPlugin')),
+           ('defaults', {'max_results': 100}),
+       ])
+
+       settings['max_results']  # a single dict lookup
+       settings.source('max_results')  # 'defaults'
+
+    The merged values are kept in a snapshot,
+    so reading a value does not call the Sublime API.
+    When a :class:`SettingsDict` layer changes,
+    that layer is read again with one call to :meth:`~sublime.Settings.to_dict`,
+    and only the keys whose values in that layer changed are merged again.
+    Mapping layers are not watched;
+    call :meth:`update_layer` when their contents change.
+
+    Values are shared with the snapshot and must not be mutated.
+
+    ..  versionadded:: 2.2
+    """
+
+    def __init__(self, layers: Iterable[tuple[str, SettingsDict | Mapping[str, Value]]]):
+        self._layers: list[_Layer] = []
+        self._values: dict[str, Value] = {}
+        self._sources: dict[str, str] = {}
+
+        for name, source in layers:
+            if any(layer.name == name for layer in self._layers):
+                raise ValueError(f"Duplicate layer name {name!r}.")
+            layer = _Layer(self, name, source)
+            layer.values = layer.read()
+            self._layers.append(layer)
+
+        self._merge(set().union(*(layer.values for layer in self._layers)))
+
+    def __del__(self) -> None:
+        for layer in getattr(self, '_layers', ()):
+            layer.close()
+
+    def _layer(self, name: str) -> _Layer:
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        raise KeyError(name)
+
+    def _merge(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            for layer in self._layers:
+                if key in layer.values:
+                    self._values[key] = layer.values[key]
+                    self._sources[key] = layer.name
+                    break
+            else:
+                self._values.pop(key, None)
+                self._sources.pop(key, None)
+
+    def _replace(self, layer: _Layer, values: dict[str, Value]) -> None:
+        previous = layer.values
+        layer.values = values
+        self._merge(
+            key for key in previous.keys() | values.keys()
+            if key not in previous or key not in values or previous[key] != values[key]
+        )
+
+    def _on_layer_change(self, layer: _Layer) -> None:
+        if layer in self._layers:
+            self._replace(layer, layer.read())
+
+    @property
+    def layers(self) -> list[str]:
+        """The names of the layers, from highest to lowest precedence."""
+        return [layer.name for layer in self._layers]
+
+    def __getitem__(self, key: str) -> Value:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def source(self, key: str) -> str:
+        """Return the name of the layer that supplies the value of `key`.
+
+        :raise KeyError: if no layer defines `key`.
+        """
+        return self._sources[key]
+
+    def sources(self) -> dict[str, str]:
+        """Return a new :class:`dict` mapping each key to the name of the layer
+        that supplies its value."""
+        return dict(self._sources)
+
+    def update_layer(self, name: str, values: Mapping[str, Value]) -> None:
+        """Replace the contents of the layer called `name` with `values`.
+
+        Use this for :class:`~collections.abc.Mapping` layers
+        whose contents have changed (e.g. project data).
+        Only keys whose values differ are merged again.
+
+        :raise KeyError: if there is no layer called `name`.
+        :raise TypeError: if the layer is a :class:`SettingsDict`.
+        """
+        layer = self._layer(name)
+        if isinstance(layer.source, SettingsDict):
+            raise TypeError(f"Layer {name!r} is a SettingsDict and is updated automatically.")
+        layer.source = values
+        self._replace(layer, dict(values))
+
+    def refresh(self) -> None:
+        """Read every layer again and merge any keys that changed."""
+        for layer in self._layers:
+            self._replace(layer, layer.read())
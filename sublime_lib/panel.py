@@ -1,7 +1,9 @@
 from __future__ import annotations
+from collections.abc import Iterable
 from typing import Any
 
 import sublime
+from sublime import Region
 
 from .view_stream import ViewStream
 from .view_utils import set_view_options, validate_view_options
@@ -80,8 +82,25 @@ class OutputPanel(ViewStream, Panel):
 
     :raise ValueError: if `window` has no output panel called `name`.
 
+    :argument max_lines: If given, the maximum number of lines to keep in the panel.
+    :argument max_chars: If given, the maximum number of characters to keep in the panel.
+    :argument spill_path: If given, the path of a file
+        to which trimmed text is appended (as UTF-8).
+
+    If `max_lines` or `max_chars` is given,
+    the oldest lines are erased after writes that exceed the limit.
+    To amortize the cost, the panel is allowed to grow
+    to a quarter more than the limit before it is trimmed back to the limit
+    with a single erase.
+    Text is only erased in whole lines.
+    The cursor and any regions added with :meth:`~sublime.View.add_regions`
+    are moved to remain on the same text.
+
     .. versionchanged:: 1.3
         Now a subclass of :class:`Panel`.
+
+    .. versionchanged:: 2.2
+        Added the `max_lines`, `max_chars`, and `spill_path` options.
     """
     @classmethod
     def create(
@@ -92,12 +111,26 @@ class OutputPanel(ViewStream, Panel):
         force_writes: bool = False,
         follow_cursor: bool = False,
         unlisted: bool = False,
+        buffer_size: int = 0,
+        flush_delay: int | None = 0,
+        append_mode: bool = False,
+        max_lines: int | None = None,
+        max_chars: int | None = None,
+        spill_path: str | None = None,
         **kwargs: Any
     ) -> OutputPanel:
         """Create a new output panel with the given `name` in the given `window`.
 
+        The `force_writes`, `follow_cursor`, `buffer_size`, `flush_delay`,
+        and `append_mode` options are interpreted as for :class:`~sublime_lib.ViewStream`.
+        The `max_lines`, `max_chars`, and `spill_path` options
+        are interpreted as for :class:`OutputPanel`.
         If `kwargs` are given,
         they will be interpreted as for :func:`~sublime_lib.view_utils.new_view`.
+
+        ..  versionchanged:: 2.2
+            Added the `buffer_size`, `flush_delay`, `append_mode`,
+            `max_lines`, `max_chars`, and `spill_path` options.
         """
         validate_view_options(kwargs)
 
@@ -105,7 +138,18 @@ class OutputPanel(ViewStream, Panel):
         view = window.create_output_panel(name, unlisted)
         set_view_options(view, **kwargs)
 
-        return cls(window, name, force_writes=force_writes, follow_cursor=follow_cursor)
+        return cls(
+            window,
+            name,
+            force_writes=force_writes,
+            follow_cursor=follow_cursor,
+            buffer_size=buffer_size,
+            flush_delay=flush_delay,
+            append_mode=append_mode,
+            max_lines=max_lines,
+            max_chars=max_chars,
+            spill_path=spill_path,
+        )
 
     def __init__(
         self,
@@ -113,16 +157,41 @@ class OutputPanel(ViewStream, Panel):
         name: str,
         *,
         force_writes: bool = False,
-        follow_cursor: bool = False
+        follow_cursor: bool = False,
+        buffer_size: int = 0,
+        flush_delay: int | None = 0,
+        append_mode: bool = False,
+        max_lines: int | None = None,
+        max_chars: int | None = None,
+        spill_path: str | None = None,
     ):
         view = window.find_output_panel(name)
         if view is None:
             raise ValueError('Output panel "%s" does not exist.' % name)
 
-        ViewStream.__init__(self, view, force_writes=force_writes, follow_cursor=follow_cursor)
+        ViewStream.__init__(
+            self,
+            view,
+            force_writes=force_writes,
+            follow_cursor=follow_cursor,
+            buffer_size=buffer_size,
+            flush_delay=flush_delay,
+            append_mode=append_mode,
+        )
         Panel.__init__(self, window, "output." + name)
 
-        self.name: str = name
+        self.max_lines: int | None = max_lines
+        self.max_chars: int | None = max_chars
+        self.spill_path: str | None = spill_path
+
+        # Characters and lines written since the size of the panel was last measured.
+        self._unmeasured_chars = 0
+        self._unmeasured_lines = 0
+
+    @property
+    def name(self) -> str:
+        """The output panel name, without the ``'output.'`` prefix."""
+        return self.panel_name[len('output.'):]
 
     @property
     def full_name(self) -> str:
@@ -144,3 +213,76 @@ class OutputPanel(ViewStream, Panel):
     def destroy(self) -> None:
         """Destroy the output panel."""
         self.window.destroy_output_panel(self.name)
+
+    def _write(self, s: str) -> int:
+        result = super()._write(s)
+        self._after_write(s)
+        return result
+
+    def _append(self, s: str) -> int:
+        result = super()._append(s)
+        self._after_write(s)
+        return result
+
+    def replace_many(self, edits: Iterable[tuple[Region | int, str]]) -> None:
+        edits = list(edits)
+        super().replace_many(edits)
+        self._after_write(''.join(s for _, s in edits))
+
+    def clear(self) -> None:
+        super().clear()
+        self._unmeasured_chars = 0
+        self._unmeasured_lines = 0
+
+    def _after_write(self, s: str) -> None:
+        if self.max_chars is None and self.max_lines is None:
+            return
+
+        self._unmeasured_chars += len(s)
+        self._unmeasured_lines += s.count('\n')
+        if (
+            (self.max_chars is not None and self._unmeasured_chars * 4 > self.max_chars)
+            or (self.max_lines is not None and self._unmeasured_lines * 4 > self.max_lines)
+        ):
+            self._unmeasured_chars = 0
+            self._unmeasured_lines = 0
+            self._trim()
+
+    def _trim(self) -> None:
+        view = self.view
+        size = view.size()
+        cut = 0
+
+        if self.max_chars is not None and size > self.max_chars:
+            cut = view.full_line(size - self.max_chars - 1).end()
+
+        if self.max_lines is not None:
+            row, col = view.rowcol(size)
+            # The last line counts only if it is not empty.
+            excess_lines = row + (col > 0) - self.max_lines
+            if excess_lines > 0:
+                cut = max(cut, view.text_point(excess_lines, 0))
+
+        if cut == 0:
+            return
+
+        if self.spill_path is not None:
+            with open(self.spill_path, 'a', encoding='utf-8') as file:
+                file.write(view.substr(Region(0, cut)))
+
+        selection = view.sel()
+        saved = list(selection)
+        read_only = view.is_read_only()
+        if read_only:
+            view.set_read_only(False)
+
+        selection.clear()
+        selection.add(Region(0, cut))
+        view.run_command('left_delete')
+
+        selection.clear()
+        selection.add_all(
+            Region(max(region.a - cut, 0), max(region.b - cut, 0)) for region in saved
+        )
+        if read_only:
+            view.set_read_only(True)
@@ -1,17 +1,26 @@
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING, overload
+from zipfile import BadZipFile, ZipFile
 
 import os
 import posixpath
 import sublime
+import zlib
 
 from ._util.glob import get_glob_matcher
 
 __all__ = ['ResourcePath']
 
+if TYPE_CHECKING:
+    _ParentsBase = Sequence['ResourcePath']
+else:
+    # collections.abc classes are not subscriptable before Python 3.9.
+    _ParentsBase = Sequence
+
 
 class ResourceRoot(metaclass=ABCMeta):
     """
@@ -103,6 +112,35 @@ class InstalledResourceRoot(ResourceRoot):
         return package_path.joinpath(*rest)
 
 
+def find_resource_source(resource_path: ResourcePath) -> tuple[Path, str | None] | None:
+    """
+    Find the file or archive that Sublime would load `resource_path` from.
+
+    Return a tuple of a filesystem path and an archive member name
+    (``None`` for a loose file),
+    or ``None`` if the source cannot be determined without the resource system.
+    """
+    if resource_path.root != 'Packages' or len(resource_path.parts) < 3:
+        return None
+
+    package, *rest = resource_path.parts[1:]
+
+    loose_path = Path(sublime.packages_path(), package, *rest)
+    if loose_path.is_file():
+        return (loose_path, None)
+
+    # An installed package completely replaces a default package of the same name.
+    archive_name = package + '.sublime-package'
+    for archive_path in (
+        Path(sublime.installed_packages_path(), archive_name),
+        Path(sublime.executable_path()).parent / 'Packages' / archive_name,
+    ):
+        if archive_path.is_file():
+            return (archive_path, '/'.join(rest))
+
+    return None
+
+
 def wrap_path(p: Path | str) -> Path:
     if isinstance(p, Path):
         return p
@@ -125,6 +163,64 @@ def get_roots() -> list[ResourceRoot]:
     return _roots
 
 
+class ResourcePathParents(_ParentsBase):
+    """
+    An immutable sequence of the logical ancestors of a :class:`ResourcePath`.
+
+    Ancestors are constructed from the parts of the original path
+    when they are first accessed.
+    """
+
+    def __init__(self, path: ResourcePath) -> None:
+        # Keep the class rather than the path, so that the path's cached
+        # parents do not form a reference cycle.
+        self._cls = type(path)
+        self._parts = path.parts
+        self._cache: dict[int, ResourcePath] = {}
+
+    def __len__(self) -> int:
+        return len(self._parts) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> ResourcePath:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[ResourcePath, ...]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> ResourcePath | tuple[ResourcePath, ...]:
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+
+        try:
+            return self._cache[index]
+        except KeyError:
+            parent = self._cls._from_parts(self._parts[:length - index])
+            self._cache[index] = parent
+            return parent
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResourcePathParents):
+            return self._parts[:-1] == other._parts[:-1]
+        elif isinstance(other, tuple):
+            return tuple(self) == other
+        else:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"<{self._cls._from_parts(self._parts)!r}.parents>"
+
+
 class ResourcePath():
     """
     A pathlib-inspired representation of a Sublime Text resource path.
@@ -158,6 +254,9 @@ class ResourcePath():
     .. versionadded:: 1.2
     """
 
+    _parts: tuple[str, ...]
+    _parents: ResourcePathParents
+
     @classmethod
     def glob_resources(cls, pattern: str) -> list[ResourcePath]:
         """
@@ -206,6 +305,96 @@ class ResourcePath():
         else:
             raise ValueError(f"Path {file_path!r} does not correspond to any resource path.")
 
+    @classmethod
+    def read_many(
+        cls, paths: Iterable[object], *, binary: bool = False
+    ) -> dict[ResourcePath, str | bytes | Exception]:
+        """
+        Load the resources at all of the given paths
+        and return a :class:`dict` mapping each path to its contents.
+
+        If `binary` is ``True``, then the contents are returned as bytes.
+        Otherwise, they are decoded as UTF-8
+        and line endings are normalized as for :meth:`read_text`.
+
+        Errors are reported per path rather than raised:
+        if a resource cannot be read,
+        then its value in the result is the exception that :meth:`read_text`
+        (or :meth:`read_bytes`) would have raised,
+        such as :exc:`FileNotFoundError` or :exc:`UnicodeDecodeError`,
+        or the error raised while reading a damaged package archive.
+
+        Resources are grouped by the file or package archive that they are loaded from.
+        Each archive is opened only once
+        and its members are read in the order they are stored.
+        Resources whose source cannot be determined
+        are loaded individually through the Sublime API.
+
+        .. versionadded:: 2.2
+        """
+        resource_paths = [
+            path if isinstance(path, ResourcePath) else cls(path)
+            for path in paths
+        ]
+
+        raw: dict[ResourcePath, bytes | Exception] = {}
+        archives: dict[Path, list[tuple[ResourcePath, str]]] = {}
+        fallback = []
+
+        for path in resource_paths:
+            source = find_resource_source(path)
+            if source is None:
+                fallback.append(path)
+            else:
+                file_path, member = source
+                if member is None:
+                    try:
+                        raw[path] = file_path.read_bytes()
+                    except OSError:
+                        fallback.append(path)
+                else:
+                    archives.setdefault(file_path, []).append((path, member))
+
+        for archive_path, members in archives.items():
+            try:
+                with ZipFile(str(archive_path)) as archive:
+                    infos = []
+                    for path, member in members:
+                        try:
+                            infos.append((archive.getinfo(member), path))
+                        except KeyError:
+                            fallback.append(path)
+
+                    infos.sort(key=lambda item: item[0].header_offset)
+                    for info, path in infos:
+                        try:
+                            raw[path] = archive.read(info)
+                        except (OSError, BadZipFile, zlib.error, NotImplementedError) as err:
+                            # A corrupt or unsupported member affects only its own path.
+                            raw[path] = err
+            except (OSError, BadZipFile):
+                fallback.extend(path for path, member in members if path not in raw)
+
+        for path in fallback:
+            try:
+                raw[path] = path.read_bytes()
+            except OSError as err:
+                raw[path] = err
+
+        result: dict[ResourcePath, str | bytes | Exception] = {}
+        for path in resource_paths:
+            data = raw[path]
+            if binary or isinstance(data, Exception):
+                result[path] = data
+            else:
+                try:
+                    # Normalize line endings as :func:`sublime.load_resource` does.
+                    result[path] = data.decode('utf-8').replace('\r\n', '\n')
+                except UnicodeDecodeError as err:
+                    result[path] = err
+
+        return result
+
     def __init__(self, *pathsegments: object):
         """
         Construct a :class:`ResourcePath` object with the given parts.
@@ -221,6 +410,15 @@ class ResourcePath():
         if self._parts == ():
             raise ValueError("Empty path.")
 
+    @classmethod
+    def _from_parts(cls, parts: tuple[str, ...]) -> ResourcePath:
+        """
+        Return a new path of the same class with the given already-parsed parts.
+        """
+        path = object.__new__(cls)
+        path._parts = parts
+        return path
+
     def _parse_segments(self, pathsegments: Iterable[object]) -> tuple[str, ...]:
         return tuple(
             part
@@ -258,18 +456,24 @@ class ResourcePath():
         if len(self._parts) == 1:
             return self
         else:
-            return self.__class__(*self._parts[:-1])
+            return self._from_parts(self._parts[:-1])
 
     @property
-    def parents(self) -> tuple[ResourcePath, ...]:
+    def parents(self) -> ResourcePathParents:
         """
         An immutable sequence providing access to the path's logical ancestors.
+
+        The sequence is created once per path,
+        and each ancestor is only constructed when it is accessed.
+
+        .. versionchanged:: 2.2
+            Return a lazy sequence instead of a :class:`tuple`.
         """
-        parent = self.parent
-        if self == parent:
-            return ()
-        else:
-            return (parent,) + parent.parents
+        try:
+            return self._parents
+        except AttributeError:
+            self._parents = ResourcePathParents(self)
+            return self._parents
 
     @property
     def name(self) -> str:
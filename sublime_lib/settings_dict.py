@@ -1,53 +1,538 @@
 from __future__ import annotations
-from functools import partial
-from typing import TYPE_CHECKING
+from collections.abc import (
+    ItemsView, Iterable, Iterator, KeysView, Mapping, MutableMapping, ValuesView
+)
+from contextlib import contextmanager, nullcontext
+from copy import deepcopy
+from time import perf_counter
+from types import MethodType
+from typing import TYPE_CHECKING, NamedTuple
 from uuid import uuid4
 
+import weakref
+
 import sublime
 
-from ._util.collections import get_selector
+from ._util.collections import (
+    KeyPath, diff_paths, get_path, get_selector, get_selector_keys, replace_path
+)
 from ._util.named_value import NamedValue
+from ._util.weak_method import weak_method
 
-__all__ = ['SettingsDict', 'NamedSettingsDict']
+__all__ = ['SettingsDict', 'NamedSettingsDict', 'SettingsDiff', 'KeyPath']
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping
+    from collections.abc import Generator
     from sublime_types import Value
-    from typing import Callable
+    from typing import Any, Callable
+
+    from ._util.collections import PathPart
+
+    Selector = Callable[[Mapping[str, Value]], Value] | KeyPath | Iterable[str] | str
 
 _NO_DEFAULT = NamedValue('SettingsDict.NO_DEFAULT')
+_MISSING = NamedValue('SettingsDict.MISSING')
+
+# Set by :func:`sublime_lib.instrumentation.enable_subscription_profiling`.
+_profiler: Any = None
+
+# Above this many watched keys, fetch them with one call to `to_dict()`
+# rather than calling `has()` and `get()` for each.
+_BULK_FETCH_KEYS = 8
+
+
+def _differs(new: Value, old: Value) -> bool:
+    # Selectors reuse unchanged values, so most comparisons end here.
+    return new is not old and new != old
+
+
+class SettingsDiff(NamedTuple):
+    """The difference between two states of the settings
+    that a subscription depends on.
+
+    Passed to subscription callbacks registered with ``diff=True``
+    (see :meth:`SettingsDict.subscribe`).
+
+    ..  versionadded:: 2.2
+    """
+
+    #: The names of the settings that were not present before.
+    added: frozenset[str]
+
+    #: The names of the settings that are no longer present.
+    removed: frozenset[str]
+
+    #: The names of the settings that are present in both states with different values.
+    changed: frozenset[str]
+
+    #: The paths at which the settings differ,
+    #: each a tuple of a setting name followed by the dictionary keys and list indices
+    #: leading to the difference within its value.
+    paths: tuple[tuple[str | int, ...], ...]
+
+
+class _Subscription:
+    """A single callback registered with :meth:`SettingsDict.subscribe`."""
+
+    def __init__(
+        self,
+        dispatcher: _SettingsDispatcher,
+        source: SettingsDict,
+        selector: Selector,
+        callback: Callable[..., None],
+        default_value: Value,
+        *,
+        diff: bool = False,
+        debounce_ms: int | None = None,
+        throttle_ms: int | None = None,
+        run_async: bool = False,
+        weak: bool = False,
+    ):
+        self.dispatcher = dispatcher
+        self.source = source
+        self.default_value = default_value
+        self.selector_fn = get_selector(selector, default_value)
+        self.keys = get_selector_keys(selector)
+        # Key selectors normally read the dispatcher's shared snapshot of watched values,
+        # unless a subclass customizes lookups. Values read from the snapshot are
+        # copied before they are passed to the callback.
+        self.use_snapshot = self.keys is not None and type(source).get is SettingsDict.get
+        self.callback_ref: Callable[[], Callable[..., None] | None]
+        if not weak:
+            self.callback_ref = lambda: callback
+        elif isinstance(callback, MethodType):
+            self.callback_ref = weakref.WeakMethod(callback, self.on_collected)
+        else:
+            self.callback_ref = weakref.ref(callback, self.on_collected)
+        self.diff = diff
+        self.debounce_ms = debounce_ms
+        self.throttle_ms = throttle_ms
+        self.run_async = run_async
+        self.active = True
+        self.saved_value: Value = None
+        self.saved_raw: dict[str, Value] = {}
+
+        # The last value delivered to the callback, while a delayed delivery is pending.
+        self.delivered_value: Value | NamedValue = _MISSING
+        self.delivered_raw: dict[str, Value] = {}
+        self.generation = 0
+        self.throttled = False
+
+    def select(self) -> Value:
+        if not self.use_snapshot:
+            return self.selector_fn(self.source)  # type: ignore
+        else:
+            return self.selector_fn(self.dispatcher.values)
+
+    def select_raw(self) -> dict[str, Value]:
+        values = self.dispatcher.values
+        return {key: values[key] for key in self.keys or () if key in values}
+
+    def update(self) -> None:
+        profiler = _profiler
+        if profiler is None:
+            new_value = self.select()
+            changed = _differs(new_value, self.saved_value)
+        else:
+            start = perf_counter()
+            new_value = self.select()
+            changed = _differs(new_value, self.saved_value)
+            profiler._record_update(self, perf_counter() - start, changed)
+
+        if not changed:
+            return
+
+        previous_value = self.saved_value
+        previous_raw = self.saved_raw
+        self.saved_value = new_value
+        if self.diff:
+            self.saved_raw = self.select_raw()
+
+        if self.debounce_ms is None and self.throttle_ms is None:
+            self.deliver(new_value, previous_value, previous_raw)
+            return
+
+        if self.delivered_value is _MISSING:
+            self.delivered_value = previous_value
+            self.delivered_raw = previous_raw
+
+        if self.debounce_ms is not None:
+            self.generation += 1
+            generation = self.generation
+            sublime.set_timeout(lambda: self.debounced(generation), self.debounce_ms)
+        elif not self.throttled:
+            self.flush()
+
+    def debounced(self, generation: int) -> None:
+        if generation == self.generation:
+            self.flush()
+
+    def flush(self) -> None:
+        previous_value = self.delivered_value
+        self.delivered_value = _MISSING
+        if not self.active or isinstance(previous_value, NamedValue):
+            return
+
+        if self.throttle_ms is not None:
+            self.throttled = True
+            sublime.set_timeout(self.end_throttle, self.throttle_ms)
+
+        if _differs(self.saved_value, previous_value):
+            self.deliver(self.saved_value, previous_value, self.delivered_raw)
+
+    def end_throttle(self) -> None:
+        self.throttled = False
+        self.flush()
+
+    def deliver(
+        self,
+        new_value: Value,
+        previous_value: Value,
+        previous_raw: dict[str, Value],
+    ) -> None:
+        args: tuple
+        if self.use_snapshot:
+            # Copy values read from the snapshot, but pass the caller's default as is.
+            default = self.default_value
+            args = (
+                deepcopy(new_value, {id(default): default}),
+                deepcopy(previous_value, {id(default): default}),
+            )
+        else:
+            args = (new_value, previous_value)
+        if self.diff:
+            args += (self.dispatcher.diff(previous_raw, self.saved_raw),)
+
+        callback = self.callback_ref()
+        if callback is None:
+            self.unsubscribe()
+        elif self.run_async:
+            sublime.set_timeout_async(lambda: self.invoke(callback, args))  # type: ignore
+        else:
+            self.invoke(callback, args)
+
+    def invoke(self, callback: Callable[..., None], args: tuple) -> None:
+        profiler = _profiler
+        if profiler is None:
+            callback(*args)
+        else:
+            start = perf_counter()
+            try:
+                callback(*args)
+            finally:
+                profiler._record_callback(self, perf_counter() - start)
+
+    def on_collected(self, ref: object) -> None:
+        self.unsubscribe()
+
+    def unsubscribe(self) -> None:
+        if self.active:
+            self.active = False
+            self.dispatcher.remove(self)
+
+
+class _SettingsDispatcher:
+    """Dispatches changes to a :class:`sublime.Settings` object to its subscriptions.
+
+    There is at most one dispatcher for each underlying settings object,
+    registered with a single :meth:`~sublime.Settings.add_on_change` callback.
+    That callback owns the dispatcher;
+    the registry holds it weakly so that it is released along with the settings object
+    (for instance, when a view is closed).
+    The dispatcher keeps a snapshot of the keys that subscriptions depend on.
+    When the settings change,
+    only subscriptions whose keys changed (or whose keys are unknown) are re-evaluated.
+    """
+
+    def __init__(self, settings: sublime.Settings):
+        self.settings = settings
+        self.key = str(uuid4())
+        self.subscriptions: list[_Subscription] = []
+        self.listeners: list[Callable[[], None]] = []
+        self.values: dict[str, Value] = {}
+        self.key_counts: dict[str, int] = {}
+        self.diff_memo: dict[str, tuple[Value, Value, list[tuple[str | int, ...]]]] = {}
+        self.suspend_depth = 0
+        self.pending_change = False
+
+    @classmethod
+    def for_settings(cls, settings: sublime.Settings) -> _SettingsDispatcher:
+        try:
+            return _dispatchers[settings.settings_id]
+        except KeyError:
+            dispatcher = cls(settings)
+            _dispatchers[settings.settings_id] = dispatcher
+            settings.add_on_change(dispatcher.key, dispatcher.on_change)
+            return dispatcher
+
+    def subscribe(self, subscription: _Subscription) -> None:
+        keys = subscription.keys or ()
+        self.values.update(self.fetch([key for key in keys if key not in self.key_counts]))
+        for key in keys:
+            self.key_counts[key] = self.key_counts.get(key, 0) + 1
+
+        subscription.saved_value = subscription.select()
+        if subscription.diff:
+            subscription.saved_raw = subscription.select_raw()
+        self.subscriptions.append(subscription)
+
+    def remove(self, subscription: _Subscription) -> None:
+        self.subscriptions.remove(subscription)
+
+        for key in subscription.keys or ():
+            self.key_counts[key] -= 1
+            if self.key_counts[key] == 0:
+                del self.key_counts[key]
+                self.values.pop(key, None)
+                self.diff_memo.pop(key, None)
+
+        self._release_if_unused()
+
+    def diff(self, old: dict[str, Value], new: dict[str, Value]) -> SettingsDiff:
+        """Return the difference between two sets of watched values.
+
+        Paths within each setting are memoized by the identity of the compared values,
+        so subscriptions that see the same change share one comparison.
+        """
+        changed = set()
+        paths: list[tuple[str | int, ...]] = []
+        for key in sorted(old.keys() | new.keys()):
+            if key not in old or key not in new:
+                paths.append((key,))
+                continue
+
+            memo = self.diff_memo.get(key)
+            if memo is not None and memo[0] is old[key] and memo[1] is new[key]:
+                key_paths = memo[2]
+            else:
+                key_paths = diff_paths(old[key], new[key])
+                self.diff_memo[key] = (old[key], new[key], key_paths)
+
+            if key_paths:
+                changed.add(key)
+                paths.extend((key,) + path for path in key_paths)
+
+        return SettingsDiff(
+            added=frozenset(new.keys() - old.keys()),
+            removed=frozenset(old.keys() - new.keys()),
+            changed=frozenset(changed),
+            paths=tuple(paths),
+        )
+
+    def fetch(self, keys: list[str]) -> dict[str, Value]:
+        """Return the current values of those `keys` that are present."""
+        values = {}
+        if len(keys) > _BULK_FETCH_KEYS:
+            snapshot = self.settings.to_dict()
+            values = {key: snapshot[key] for key in keys if key in snapshot}
+            # `to_dict()` omits inherited values, such as a view's Preferences.
+            keys = [key for key in keys if key not in snapshot]
+        for key in keys:
+            if self.settings.has(key):
+                values[key] = self.settings.get(key)
+        return values
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener` with no arguments before dispatching each change."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        self.listeners.remove(listener)
+        self._release_if_unused()
+
+    def _release_if_unused(self) -> None:
+        if not self.subscriptions and not self.listeners:
+            self.settings.clear_on_change(self.key)
+            if _dispatchers.get(self.settings.settings_id) is self:
+                del _dispatchers[self.settings.settings_id]
+
+    @contextmanager
+    def suspended(self) -> Generator[None, None, None]:
+        """Defer change notifications until the outermost block exits,
+        then dispatch them at most once.
+        """
+        self.suspend_depth += 1
+        try:
+            yield
+        finally:
+            self.suspend_depth -= 1
+            if self.suspend_depth == 0 and self.pending_change:
+                self.pending_change = False
+                self.on_change()
+
+    def on_change(self) -> None:
+        if self.suspend_depth:
+            self.pending_change = True
+            return
+
+        for listener in list(self.listeners):
+            listener()
+
+        changed = set()
+        profiler = _profiler
+        current = self.fetch(list(self.key_counts))
+        for key in list(self.key_counts):
+            previous = self.values.get(key, _MISSING)
+            if key in current:
+                value = current[key]
+                if key not in self.values or self.values[key] != value:
+                    self.values[key] = value
+                    changed.add(key)
+            elif key in self.values:
+                del self.values[key]
+                changed.add(key)
+
+            if profiler is not None and key in changed:
+                profiler._record_change(
+                    self.settings.settings_id, key, previous, self.values.get(key, _MISSING)
+                )
+
+        for subscription in list(self.subscriptions):
+            if subscription.active and (
+                subscription.keys is None or not subscription.keys.isdisjoint(changed)
+            ):
+                subscription.update()
+
+
+_dispatchers: weakref.WeakValueDictionary[int, _SettingsDispatcher] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _add_change_listener(settings: sublime.Settings, listener: Callable[[], None]) -> None:
+    """Call `listener` with no arguments whenever `settings` changes.
+
+    All listeners and subscriptions for a settings object share one
+    :meth:`~sublime.Settings.add_on_change` callback.
+    """
+    _SettingsDispatcher.for_settings(settings).add_listener(listener)
+
+
+def _remove_change_listener(settings: sublime.Settings, listener: Callable[[], None]) -> None:
+    """Remove a listener added with :func:`_add_change_listener`, if it is registered."""
+    dispatcher = _dispatchers.get(settings.settings_id)
+    if dispatcher is not None and listener in dispatcher.listeners:
+        dispatcher.remove_listener(listener)
 
 
 class SettingsDict:
     """Wraps a :class:`sublime.Settings` object `settings`
     with a :class:`dict`-like interface.
 
-    There is no way to list or iterate over the keys of a
-    :class:`~sublime.Settings` object. As a result, the following methods are
-    not implemented:
-
-    - :meth:`__len__`
-    - :meth:`__iter__`
-    - :meth:`clear`
-    - :meth:`copy`
-    - :meth:`items`
-    - :meth:`keys`
-    - :meth:`popitem`
-    - :meth:`values`
+    :class:`SettingsDict` implements the full
+    :class:`~collections.abc.MutableMapping` protocol
+    and is registered as a virtual subclass of it.
+    Methods that list the settings (:meth:`__iter__`, :meth:`__len__`, :meth:`keys`, and so on)
+    use a snapshot taken with a single call to :meth:`~sublime.Settings.to_dict`.
+    The snapshot is discarded whenever the settings object changes
+    and is taken again the next time it is needed.
+    While a snapshot is held, reading a setting that it contains
+    does not call the Sublime API,
+    so ``dict(settings_dict)`` costs one API call.
+    Settings inherited from a parent settings object
+    (e.g. a view's settings inheriting from ``Preferences.sublime-settings``)
+    may not be listed.
 
     You can use :class:`collections.ChainMap` to chain a :class:`SettingsDict`
-    with other dict-like objects. If you do, calling the above unimplemented
-    methods on the :class:`~collections.ChainMap` will raise an error.
+    with other dict-like objects.
+
+    :argument cached: If ``True``,
+        then values that have been read are kept in a Python-side cache,
+        so that reading the same setting again does not call the Sublime API.
+        The cache is discarded whenever the settings object changes.
+        Values returned from the cache are shared between reads
+        and must not be mutated.
+
+    ..  versionchanged:: 2.2
+        Added the `cached` option.
+
+    ..  versionchanged:: 2.2
+        Implement :meth:`__len__`, :meth:`__iter__`, :meth:`clear`, :meth:`copy`,
+        :meth:`items`, :meth:`keys`, :meth:`popitem`, and :meth:`values`.
     """
 
     NO_DEFAULT: NamedValue = _NO_DEFAULT
 
-    def __init__(self, settings: sublime.Settings):
+    def __init__(self, settings: sublime.Settings, *, cached: bool = False):
         self.settings: sublime.Settings = settings
+        self._cache: dict[str, Value | NamedValue] | None = None
+        self._pending: dict[str, Value | NamedValue] | None = None
+        self._snapshot: dict[str, Value] | None = None
+        self._invalidate_ref: Callable[[], None] | None = None
+
+        if cached:
+            self._cache = {}
+            self._listen()
+
+    def __del__(self) -> None:
+        invalidate_ref = getattr(self, '_invalidate_ref', None)
+        if invalidate_ref is not None:
+            _remove_change_listener(self.settings, invalidate_ref)
+
+    def _listen(self) -> None:
+        if self._invalidate_ref is None:
+            self._invalidate_ref = weak_method(self._invalidate)
+            _add_change_listener(self.settings, self._invalidate_ref)
+
+    def _invalidate(self) -> None:
+        self._snapshot = None
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _to_dict(self) -> dict[str, Value]:
+        if self._snapshot is None:
+            self._listen()
+            self._snapshot = self.settings.to_dict()
+
+        if not self._pending:
+            return self._snapshot
+
+        merged = dict(self._snapshot)
+        for key, value in self._pending.items():
+            if isinstance(value, NamedValue):
+                merged.pop(key, None)
+            else:
+                merged[key] = value
+        return merged
+
+    def _cached(self, key: str) -> Value | NamedValue:
+        cache = self._cache
+        assert cache is not None
+        try:
+            return cache[key]
+        except KeyError:
+            value: Value | NamedValue
+            if self._snapshot is not None and key in self._snapshot:
+                value = self._snapshot[key]
+            elif self.settings.has(key):
+                value = self.settings.get(key)
+            else:
+                value = _MISSING
+            cache[key] = value
+            return value
 
-    def __iter__(self) -> None:
-        """Raise NotImplementedError."""
-        raise NotImplementedError()
+    @property
+    def cached(self) -> bool:
+        """Whether values that have been read are cached.
+
+        ..  versionadded:: 2.2
+        """
+        return self._cache is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the names of the settings.
+
+        ..  versionchanged:: 2.2
+            Iterate over the settings instead of raising :exc:`NotImplementedError`.
+        """
+        return iter(self._to_dict())
+
+    def __len__(self) -> int:
+        """Return the number of settings.
+
+        ..  versionadded:: 2.2
+        """
+        return len(self._to_dict())
 
     def __eq__(self, other: object) -> bool:
         """Return ``True`` if `self` and `other` are of the same type
@@ -84,20 +569,38 @@ class SettingsDict:
 
     def __setitem__(self, key: str, value: Value) -> None:
         """Set `self[key]` to `value`."""
+        if self._pending is not None:
+            self._pending[key] = value
+            return
+
         self.settings.set(key, value)
+        self._snapshot = None
+        if self._cache is not None:
+            self._cache.pop(key, None)
 
     def __delitem__(self, key: str) -> None:
         """Remove `self[key]` from `self`.
 
         :raise KeyError: if there us no setting with the given `key`.
         """
-        if key in self:
-            self.settings.erase(key)
-        else:
+        if key not in self:
             raise KeyError(key)
+        elif self._pending is not None:
+            self._pending[key] = _MISSING
+        else:
+            self.settings.erase(key)
+            self._snapshot = None
+            if self._cache is not None:
+                self._cache.pop(key, None)
 
     def __contains__(self, item: str) -> bool:
         """Return ``True`` if `self` has a setting named `key`, else ``False``."""
+        if self._pending is not None and item in self._pending:
+            return self._pending[item] is not _MISSING
+        if self._cache is not None:
+            return self._cached(item) is not _MISSING
+        if self._snapshot is not None and item in self._snapshot:
+            return True
         return self.settings.has(item)
 
     def get(self, key: str, default: Value | None = None) -> Value:
@@ -105,8 +608,110 @@ class SettingsDict:
 
         If `default` is not given, it defaults to ``None``,
         so that this method never raises :exc:`KeyError`."""
+        if self._pending is not None and key in self._pending:
+            value = self._pending[key]
+            return default if value is _MISSING else value  # type: ignore
+        if self._cache is not None:
+            value = self._cached(key)
+            return default if value is _MISSING else value  # type: ignore
+        if self._snapshot is not None and key in self._snapshot:
+            return deepcopy(self._snapshot[key])
         return self.settings.get(key, default)
 
+    def get_path(
+        self,
+        path: KeyPath | str | Iterable[PathPart],
+        default: Value = None,
+    ) -> Value:
+        """Return the value nested at `path` if there is one, or `default` otherwise.
+
+        `path` may be a :class:`KeyPath`, a dotted string,
+        or an iterable of a setting name followed by dictionary keys and list indices.
+
+        .. code-block:: python
+
+           >>> settings.get_path('lsp.clients.pyright.enabled')
+           True
+           >>> settings.get_path(('lsp', 'clients', 'pyright', 'enabled'))
+           True
+
+        ..  versionadded:: 2.2
+        """
+        key_path = KeyPath.coerce(path)
+        value = self.get(key_path.key, _MISSING)  # type: ignore
+        return get_path(value, key_path.parts[1:], default)
+
+    def set_path(self, path: KeyPath | str | Iterable[PathPart], value: Value) -> None:
+        """Set the value nested at `path` to `value`.
+
+        `path` is interpreted as for :meth:`get_path`.
+        The setting is written back as a copy in which
+        only the dictionaries and lists along `path` are copied;
+        unrelated branches are shared, not rebuilt.
+        Missing dictionaries along `path` are created.
+
+        :raise TypeError: if `path` passes through a value that is not a container.
+        :raise IndexError: if `path` contains an index that is out of range for its list.
+
+        ..  versionadded:: 2.2
+        """
+        key_path = KeyPath.coerce(path)
+        self[key_path.key] = replace_path(
+            self.get(key_path.key, _MISSING),  # type: ignore
+            key_path.parts[1:],
+            value,
+        )
+
+    def copy(self) -> dict[str, Value]:
+        """Return a new :class:`dict` containing the settings.
+
+        ..  versionadded:: 2.2
+        """
+        return deepcopy(self._to_dict())
+
+    def keys(self) -> KeysView[str]:
+        """Return a new view of the names of the settings.
+
+        ..  versionadded:: 2.2
+        """
+        return KeysView(self)  # type: ignore
+
+    def items(self) -> ItemsView[str, Value]:
+        """Return a new view of the settings as ``(key, value)`` pairs.
+
+        ..  versionadded:: 2.2
+        """
+        return ItemsView(self)  # type: ignore
+
+    def values(self) -> ValuesView[Value]:
+        """Return a new view of the values of the settings.
+
+        ..  versionadded:: 2.2
+        """
+        return ValuesView(self)  # type: ignore
+
+    def popitem(self) -> tuple[str, Value]:
+        """Remove a setting from `self` and return it as a ``(key, value)`` pair.
+
+        :raise KeyError: if there are no settings.
+
+        ..  versionadded:: 2.2
+        """
+        try:
+            key = next(iter(self))
+        except StopIteration:
+            raise KeyError('popitem(): settings are empty') from None
+        return key, self.pop(key)
+
+    def clear(self) -> None:
+        """Remove all settings from `self` in a single :meth:`batch`.
+
+        ..  versionadded:: 2.2
+        """
+        with self.batch():
+            for key in list(self):
+                del self[key]
+
     def pop(self, key: str, default: Value | NamedValue = _NO_DEFAULT) -> Value:
         """Remove the setting `self[key]` and return its value or `default`.
 
@@ -147,21 +752,101 @@ class SettingsDict:
         If keyword arguments are specified,
         the dictionary is then updated with those key/value pairs:
         ``self.update(red=1, blue=2)``.
+
+        The changes are applied in a single :meth:`batch`.
+
+        ..  versionchanged:: 2.2
+            Apply the changes in a single batch.
         """
         if isinstance(other, Mapping):
             other = other.items()  # type: ignore
 
-        for key, value in other:
-            self[key] = value
+        with self.batch():
+            for key, value in other:
+                self[key] = value
 
-        for key, value in kwargs.items():  # type: ignore
-            self[key] = value
+            for key, value in kwargs.items():  # type: ignore
+                self[key] = value
+
+    @contextmanager
+    def batch(self) -> Generator[SettingsDict, None, None]:
+        """Return a context manager that queues changes to `self`
+        and applies them together when the block exits.
+
+        Inside the block, writes and deletions are not passed to the settings object,
+        but reads through `self` see them.
+        When the block exits normally,
+        the queued values are written with one call to :meth:`~sublime.Settings.update`
+        (or :meth:`~sublime.Settings.set` for each key if that is not available),
+        and the queued keys are erased.
+        Subscriptions are notified once, with the net change.
+        If the block raises an exception, the queued changes are discarded.
+
+        Nested batches are merged into the outermost batch.
+
+        .. code-block:: python
+
+           with settings.batch():
+               settings['tab_size'] = 4
+               settings['translate_tabs_to_spaces'] = True
+               del settings['detect_indentation']
+
+        ..  versionadded:: 2.2
+        """
+        if self._pending is not None:
+            yield self
+            return
+
+        pending: dict[str, Value | NamedValue] = {}
+        self._pending = pending
+        try:
+            yield self
+        finally:
+            self._pending = None
+
+        self._apply(pending)
+
+    def _apply(self, pending: dict[str, Value | NamedValue]) -> None:
+        if not pending:
+            return
+
+        dispatcher = _dispatchers.get(self.settings.settings_id)
+        with dispatcher.suspended() if dispatcher is not None else nullcontext():
+            values: dict[str, Value] = {}
+            erased = []
+            for key, value in pending.items():
+                if isinstance(value, NamedValue):
+                    erased.append(key)
+                else:
+                    values[key] = value
+
+            if values:
+                update = getattr(self.settings, 'update', None)
+                if update is not None:
+                    update(values)
+                else:
+                    for key, value in values.items():
+                        self.settings.set(key, value)
+
+            for key in erased:
+                self.settings.erase(key)
+
+        self._snapshot = None
+        if self._cache is not None:
+            for key in pending:
+                self._cache.pop(key, None)
 
     def subscribe(
         self,
-        selector: Callable[[Mapping[str, Value]], Value] | Iterable[str] | str,
-        callback: Callable[[Value, Value], None],
-        default_value: Value = None
+        selector: Selector,
+        callback: Callable[..., None],
+        default_value: Value = None,
+        *,
+        diff: bool = False,
+        debounce_ms: int | None = None,
+        throttle_ms: int | None = None,
+        run_async: bool = False,
+        weak: bool = False,
     ) -> Callable[[], None]:
         """Register a callback to be invoked
         when the value derived from the settings object changes
@@ -172,6 +857,9 @@ class SettingsDict:
         If `selector` is callable, then ``selector(self)`` is passed.
         If `selector` is a :class:`str`,
         then ``self.get(selector, default_value)`` is passed.
+        If `selector` is a :class:`KeyPath`,
+        then ``self.get_path(selector, default_value)`` is passed,
+        and only that nested value is compared on each change.
         Otherwise, ``projection(self, selector)`` is passed.
 
         Changes in the selected value are detected
@@ -179,33 +867,110 @@ class SettingsDict:
         using the equality operator.
         If you use a selector function,
         the result must be equatable and should not be mutated.
+        Otherwise, each callback receives its own copies of the values,
+        which it may mutate freely.
 
         `callback` should accept two arguments:
         the new derived value and the previous derived value.
 
+        All subscriptions to the same underlying settings object
+        share a single :meth:`~sublime.Settings.add_on_change` callback.
+        If `selector` is a :class:`str` or an iterable,
+        then the selected value is only recomputed
+        when one of the keys it depends on has changed.
+        Selector functions are called on every change.
+
+        :argument diff: If ``True``,
+            then `callback` receives a third argument:
+            a :class:`SettingsDiff` describing which settings changed
+            and the paths of the changes within their values.
+            The diff is computed once per change and shared by subscriptions
+            that depend on the same settings.
+            `selector` must be a :class:`str` or an iterable.
+
+        :argument debounce_ms: If given,
+            then `callback` is only invoked
+            once the selected value has not changed for `debounce_ms` milliseconds.
+
+        :argument throttle_ms: If given,
+            then `callback` is invoked at most once every `throttle_ms` milliseconds.
+            The first change is delivered immediately;
+            later changes within the interval are delivered when it ends.
+
+        :argument run_async: If ``True``,
+            then `callback` is invoked on the async thread
+            using :func:`sublime.set_timeout_async`.
+
+        :argument weak: If ``True``,
+            then only a weak reference to `callback` is kept
+            (a :class:`weakref.WeakMethod` if it is a bound method).
+            When `callback` (or the object it is bound to) is garbage-collected,
+            the subscription is removed automatically,
+            and the shared :meth:`~sublime.Settings.add_on_change` callback
+            is cleared if no other subscriptions remain.
+            Do not pass a lambda or other temporary function,
+            which would be collected immediately.
+
+        When changes are coalesced by `debounce_ms` or `throttle_ms`,
+        `callback` receives the value that was current before the first change
+        and the value after the last change.
+        If those are equal, `callback` is not invoked.
+        Timers are scheduled on the main thread with :func:`sublime.set_timeout`.
+
+        :raise ValueError: if both `debounce_ms` and `throttle_ms` are given.
+        :raise ValueError: if `diff` is ``True`` and `selector` is callable.
+
         ..  versionchanged:: 1.1
             Return an unsubscribe callback.
+
+        ..  versionchanged:: 2.2
+            Share one change listener per settings object.
+
+        ..  versionchanged:: 2.2
+            Added the `diff`, `debounce_ms`, `throttle_ms`, `run_async`, and `weak` options.
         """
-        selector_fn = get_selector(selector, default_value)
+        if debounce_ms is not None and throttle_ms is not None:
+            raise ValueError("Cannot both debounce and throttle a subscription.")
+        if diff and callable(selector):
+            raise ValueError("A diff subscription requires a key or iterable selector.")
 
-        saved_value = selector_fn(self)  # type: ignore
+        if not (callable(selector) or isinstance(selector, (str, KeyPath, Mapping))):
+            selector = tuple(selector)
 
-        def onchange() -> None:
-            nonlocal saved_value
-            new_value = selector_fn(self)  # type: ignore
+        dispatcher = _SettingsDispatcher.for_settings(self.settings)
+        subscription = _Subscription(
+            dispatcher, self, selector, callback, default_value,
+            diff=diff,
+            debounce_ms=debounce_ms,
+            throttle_ms=throttle_ms,
+            run_async=run_async,
+            weak=weak,
+        )
+        dispatcher.subscribe(subscription)
+        return subscription.unsubscribe
 
-            if new_value != saved_value:
-                previous_value = saved_value
-                saved_value = new_value
-                callback(new_value, previous_value)
+    def subscription_count(self) -> int:
+        """Return the number of active subscriptions to the underlying settings object.
 
-        key = str(uuid4())
-        self.settings.add_on_change(key, onchange)
-        return partial(self.settings.clear_on_change, key)
+        Subscriptions made through any :class:`SettingsDict`
+        that wraps the same settings object are counted.
+        Weak subscriptions whose callbacks have been garbage-collected are not.
+
+        ..  versionadded:: 2.2
+        """
+        dispatcher = _dispatchers.get(self.settings.settings_id)
+        return 0 if dispatcher is None else len(dispatcher.subscriptions)
+
+
+MutableMapping.register(SettingsDict)
 
 
 class NamedSettingsDict(SettingsDict):
-    """Wraps a :class:`sublime.Settings` object corresponding to a `sublime-settings` file."""
+    """Wraps a :class:`sublime.Settings` object corresponding to a `sublime-settings` file.
+
+    Use :meth:`shared` to get a single instance per file
+    instead of constructing a new one each time.
+    """
 
     @property
     def file_name(self) -> str:
@@ -213,16 +978,76 @@ class NamedSettingsDict(SettingsDict):
         associated with the :class:`NamedSettingsDict`."""
         return self.name + '.sublime-settings'
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, *, cached: bool = False):
         """Return a new :class:`NamedSettingsDict` corresponding to the given name."""
 
-        if name.endswith('.sublime-settings'):
-            self.name = name[:-17]
-        else:
-            self.name = name
+        self.name = _base_name(name)
+
+        super().__init__(sublime.load_settings(self.file_name), cached=cached)
+
+    @classmethod
+    def shared(cls, name: str, *, cached: bool = False) -> NamedSettingsDict:
+        """Return the process-wide :class:`NamedSettingsDict` for the given name.
+
+        The first call for each name (and `cached` option) constructs the instance;
+        later calls return the same instance
+        without calling :func:`sublime.load_settings` again.
+
+        ..  versionadded:: 2.2
+        """
+        key = (cls, _base_name(name), cached)
+        try:
+            return _shared[key]
+        except KeyError:
+            instance = _shared[key] = cls(name, cached=cached)
+            return instance
+
+    def save(self, delay_ms: int | None = None) -> None:
+        """Flush any in-memory changes to the :class:`NamedSettingsDict` to disk.
+
+        If `delay_ms` is given, then schedule the save to happen
+        after `delay_ms` milliseconds instead.
+        Further calls to :meth:`save` with a delay
+        before the scheduled save happens are coalesced into it,
+        so that a burst of changes is written to disk once.
+        A call without a delay saves immediately
+        and cancels any scheduled save for the same file.
+
+        ..  versionchanged:: 2.2
+            Added the `delay_ms` argument.
+        """
+        if delay_ms is None:
+            _pending_saves.discard(self.file_name)
+            sublime.save_settings(self.file_name)
+        elif self.file_name not in _pending_saves:
+            _pending_saves.add(self.file_name)
+            sublime.set_timeout(lambda: _save_pending(self.file_name), delay_ms)
+
+    @staticmethod
+    def flush_all() -> None:
+        """Immediately perform all saves scheduled by :meth:`save` with a delay.
+
+        Call this from :func:`plugin_unloaded`
+        so that scheduled saves are not lost.
+
+        ..  versionadded:: 2.2
+        """
+        for file_name in list(_pending_saves):
+            _save_pending(file_name)
+
+
+def _base_name(name: str) -> str:
+    if name.endswith('.sublime-settings'):
+        return name[:-17]
+    else:
+        return name
+
+
+def _save_pending(file_name: str) -> None:
+    if file_name in _pending_saves:
+        _pending_saves.discard(file_name)
+        sublime.save_settings(file_name)
 
-        super().__init__(sublime.load_settings(self.file_name))
 
-    def save(self) -> None:
-        """Flush any in-memory changes to the :class:`NamedSettingsDict` to disk."""
-        sublime.save_settings(self.file_name)
+_shared: dict[tuple[type, str, bool], NamedSettingsDict] = {}
+_pending_saves: set[str] = set()
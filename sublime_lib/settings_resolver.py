@@ -0,0 +1,155 @@
+from __future__ import annotations
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+import sublime
+
+from .resource_path import ResourcePath, find_resource_source
+
+if TYPE_CHECKING:
+    from sublime_types import Value
+
+    Fingerprint = tuple[str, str | None, int, int] | int
+
+__all__ = ['resolve_settings', 'clear_resolved_settings']
+
+
+_PLATFORM_NAMES = {
+    'osx': 'OSX',
+    'windows': 'Windows',
+    'linux': 'Linux',
+}
+
+# Parsed settings files, by resource path.
+_parsed: dict[ResourcePath, tuple[Fingerprint, dict[str, Value]]] = {}
+# Merged settings, by file name.
+_resolved: dict[str, tuple[tuple[tuple[ResourcePath, Fingerprint], ...], dict[str, Value]]] = {}
+
+
+def _settings_resources(base_name: str, platform: str) -> list[ResourcePath]:
+    """Return the resources for `base_name` in the order that Sublime applies them."""
+    variant = f'{base_name} ({platform}).sublime-settings'
+    resources = [
+        path for path in ResourcePath.glob_resources(f'{base_name}*.sublime-settings')
+        if path.name in (base_name + '.sublime-settings', variant)
+    ]
+
+    package_order: dict[str, int] = {}
+    for path in resources:
+        package_order.setdefault(path.package, len(package_order))  # type: ignore
+
+    def sort_key(path: ResourcePath) -> tuple[int, int, bool]:
+        package = path.package
+        group = 0 if package == 'Default' else 2 if package == 'User' else 1
+        return (group, package_order[package], path.name == variant)  # type: ignore
+
+    return sorted(resources, key=sort_key)
+
+
+def _fingerprint(path: ResourcePath) -> Fingerprint | None:
+    source = find_resource_source(path)
+    if source is None:
+        return None
+    file_path, member = source
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return (str(file_path), member, stat.st_mtime_ns, stat.st_size)
+
+
+def _parse(path: ResourcePath, text: str, strict: bool) -> dict[str, Value]:
+    try:
+        value = sublime.decode_value(text)
+        if not isinstance(value, dict):
+            raise ValueError('expected an object')
+        return value
+    except ValueError as error:
+        if strict:
+            raise ValueError(f'Error parsing {path}: {error}') from None
+        print(f'sublime_lib: error parsing {path}: {error}')
+        return {}
+
+
+def resolve_settings(
+    name: str,
+    *,
+    platform: str | None = None,
+    strict: bool = False,
+) -> dict[str, Value]:
+    """Return the effective contents of the settings file `name`
+    without using :func:`sublime.load_settings`.
+
+    `name` may be given with or without the ``.sublime-settings`` extension.
+    Every resource with that name is merged, in the order that Sublime applies them:
+    the ``Default`` package first, then other packages, then the ``User`` package.
+    Within each package, the platform-specific file
+    (e.g. ``Preferences (Linux).sublime-settings``) is applied after the general one.
+    As in Sublime, later files override top-level keys of earlier files.
+    Files are parsed with :func:`sublime.decode_value`.
+
+    :argument platform: The platform whose specific files are applied.
+        Defaults to :func:`sublime.platform`.
+    :argument strict: If ``True``, raise :exc:`ValueError` if a file cannot be parsed.
+        Otherwise, print an error and skip the file.
+
+    Each file is fingerprinted by the modification time and size
+    of the file or package archive that it is loaded from.
+    Parsed files and merged results are cached,
+    so a repeated call only reads files that have changed.
+    Resources whose source cannot be determined
+    (e.g. files in the data directory of a development build) are always read,
+    but are only parsed again if their contents changed.
+
+    ..  versionadded:: 2.2
+    """
+    base_name = name[:-17] if name.endswith('.sublime-settings') else name
+    platform_name = _PLATFORM_NAMES.get(platform or sublime.platform(), platform or '')
+
+    resources = _settings_resources(base_name, platform_name)
+    fingerprints: dict[ResourcePath, Fingerprint | None] = {
+        path: _fingerprint(path) for path in resources
+    }
+
+    unknown = [path for path, fingerprint in fingerprints.items() if fingerprint is None]
+    texts = ResourcePath.read_many(unknown)
+    for path in unknown:
+        text = texts[path]
+        fingerprints[path] = hash(text) if isinstance(text, str) else None
+
+    key = tuple((path, fingerprints[path]) for path in resources)
+    cached = _resolved.get(base_name)
+    if cached is not None and cached[0] == key and None not in fingerprints.values():
+        return deepcopy(cached[1])
+
+    stale = [
+        path for path in resources
+        if fingerprints[path] is None
+        or path not in _parsed
+        or _parsed[path][0] != fingerprints[path]
+    ]
+    texts.update(ResourcePath.read_many(path for path in stale if path not in texts))
+
+    result: dict[str, Value] = {}
+    for path in resources:
+        if path in stale:
+            text = texts[path]
+            if isinstance(text, Exception):
+                if strict:
+                    raise text
+                print(f'sublime_lib: error reading {path}: {text}')
+                continue
+            _parsed[path] = (fingerprints[path], _parse(path, text, strict))  # type: ignore
+        result.update(_parsed[path][1])
+
+    _resolved[base_name] = (key, result)  # type: ignore
+    return deepcopy(result)
+
+
+def clear_resolved_settings() -> None:
+    """Discard all cached results of :func:`resolve_settings`.
+
+    ..  versionadded:: 2.2
+    """
+    _parsed.clear()
+    _resolved.clear()
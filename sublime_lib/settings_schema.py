@@ -0,0 +1,369 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from ._util.collections import KeyPath, get_path
+from ._util.named_value import NamedValue
+from ._util.weak_method import weak_method
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from sublime_types import Value
+    from typing import Any, Callable
+
+    from .settings_dict import SettingsDict
+
+    Validator = Callable[[Value], Value]
+
+__all__ = ['Field', 'SchemaError', 'SettingsSchema', 'ValidatedSettings']
+
+
+_MISSING = NamedValue('SettingsSchema.MISSING')
+
+
+class SchemaError(ValueError):
+    """Raised when a setting does not match its :class:`Field`.
+
+    ..  versionadded:: 2.2
+    """
+
+    def __init__(self, path: str, value: Value, message: str):
+        super().__init__(f'{path}: {message} (got {value!r})')
+        #: The path of the invalid value, e.g. ``'clients.pyright.timeout'`` or ``'exclude[2]'``.
+        self.path = path
+        #: The invalid value.
+        self.value = value
+        #: A description of the problem.
+        self.message = message
+
+
+def _format_path(prefix: str, part: str | int) -> str:
+    if isinstance(part, int):
+        return f'{prefix}[{part}]'
+    elif prefix:
+        return f'{prefix}.{part}'
+    else:
+        return part
+
+
+_TYPE_NAMES = {
+    bool: 'a boolean',
+    int: 'an integer',
+    float: 'a number',
+    str: 'a string',
+    list: 'a list',
+    dict: 'a dictionary',
+}
+
+
+def _check_type(expected: type | tuple[type, ...]) -> Callable[[str, Value], Value]:
+    types = expected if isinstance(expected, tuple) else (expected,)
+    description = ' or '.join(_TYPE_NAMES.get(t, t.__name__) for t in types)
+
+    def check(path: str, value: Value) -> Value:
+        # bool is a subclass of int, but JSON distinguishes them.
+        if isinstance(value, bool) and bool not in types:
+            raise SchemaError(path, value, f'expected {description}')
+        if isinstance(value, types):
+            return value
+        if float in types and isinstance(value, int):
+            return float(value)
+        raise SchemaError(path, value, f'expected {description}')
+
+    return check
+
+
+class Field:
+    """A declarative description of one setting (or a value nested inside one).
+
+    :argument type: The expected type or tuple of types of the value.
+        A :class:`bool` is never accepted as an :class:`int`,
+        and an :class:`int` is accepted (and converted) where a :class:`float` is expected.
+    :argument default: The value to use when the setting is missing or invalid.
+    :argument choices: If given, the value must be one of these.
+    :argument min: If given, the value must not be less than this.
+    :argument max: If given, the value must not be greater than this.
+    :argument coerce: If given, a function that is applied to the value
+        before it is checked.
+        If it raises :exc:`TypeError` or :exc:`ValueError`, the value is invalid.
+    :argument items: If given, a :class:`Field` that each item of a list value must match.
+    :argument fields: If given, a mapping from keys of a dictionary value
+        to the :class:`Field` that each must match.
+        Missing keys are filled in with their defaults.
+
+    :raise SchemaError: if `default` does not match the field.
+
+    ..  versionadded:: 2.2
+    """
+
+    def __init__(
+        self,
+        type: type | tuple[type, ...] | None = None,
+        *,
+        default: Value = None,
+        choices: Iterable[Value] | None = None,
+        min: Any = None,
+        max: Any = None,
+        coerce: Callable[[Any], Value] | None = None,
+        items: Field | None = None,
+        fields: Mapping[str, Field] | None = None,
+    ):
+        self.type = type
+        self.default = default
+        self.choices = None if choices is None else list(choices)
+        self.min = min
+        self.max = max
+        self.coerce = coerce
+        self.items = items
+        self.fields = None if fields is None else dict(fields)
+
+        if default is not None:
+            self.compile('default')(default)
+
+    def compile(self, path: str) -> Validator:
+        """Return a function that validates and coerces a value at `path`.
+
+        The function returns the coerced value
+        or raises :exc:`SchemaError` if the value is invalid.
+        """
+        checks: list[Callable[[str, Value], Value]] = []
+
+        if self.coerce is not None:
+            coerce = self.coerce
+
+            def check_coerce(path: str, value: Value) -> Value:
+                try:
+                    return coerce(value)
+                except (TypeError, ValueError) as error:
+                    raise SchemaError(path, value, str(error)) from None
+            checks.append(check_coerce)
+
+        if self.type is not None:
+            checks.append(_check_type(self.type))
+
+        if self.choices is not None:
+            choices = self.choices
+
+            def check_choices(path: str, value: Value) -> Value:
+                if value not in choices:
+                    expected = ', '.join(map(repr, choices))
+                    raise SchemaError(path, value, f'expected one of {expected}')
+                return value
+            checks.append(check_choices)
+
+        if self.min is not None or self.max is not None:
+            low, high = self.min, self.max
+
+            def check_range(path: str, value: Value) -> Value:
+                try:
+                    in_range = (low is None or value >= low) and (high is None or value <= high)
+                except TypeError:
+                    in_range = False
+                if not in_range:
+                    raise SchemaError(path, value, f'expected a value from {low} to {high}')
+                return value
+            checks.append(check_range)
+
+        if self.items is not None:
+            item_field = self.items
+            item_validators: dict[int, Validator] = {}
+
+            def check_items(path: str, value: Value) -> Value:
+                if not isinstance(value, list):
+                    raise SchemaError(path, value, 'expected a list')
+                result = []
+                for index, item in enumerate(value):
+                    validator = item_validators.get(index)
+                    if validator is None:
+                        validator = item_validators[index] = item_field.compile(
+                            _format_path(path, index)
+                        )
+                    result.append(validator(item))
+                return result
+            checks.append(check_items)
+
+        if self.fields is not None:
+            field_validators = {
+                key: (field.compile(_format_path(path, key)), field.default)
+                for key, field in self.fields.items()
+            }
+
+            def check_fields(path: str, value: Value) -> Value:
+                if not isinstance(value, dict):
+                    raise SchemaError(path, value, 'expected a dictionary')
+                result = dict(value)
+                for key, (validator, default) in field_validators.items():
+                    result[key] = validator(value[key]) if key in value else default
+                return result
+            checks.append(check_fields)
+
+        def validate(value: Value) -> Value:
+            for check in checks:
+                value = check(path, value)
+            return value
+
+        return validate
+
+
+class SettingsSchema:
+    """A compiled schema for a set of settings.
+
+    `fields` maps setting names (or :class:`KeyPath` objects for nested values)
+    to :class:`Field` descriptions.
+    Each field is compiled once into a validation function.
+
+    .. code-block:: python
+
+       SCHEMA = SettingsSchema({
+           'max_results': Field(int, default=100, min=1),
+           'mode': Field(str, default='auto', choices=['auto', 'manual']),
+           KeyPath('clients', 'pyright', 'timeout'): Field(float, default=1.0, min=0),
+       })
+
+       settings = SCHEMA.bind(NamedSettingsDict.shared('MyPlugin'))
+       settings['max_results']  # always a positive int
+
+    ..  versionadded:: 2.2
+    """
+
+    def __init__(self, fields: Mapping[str | KeyPath, Field]):
+        self.fields = dict(fields)
+        self._validators: dict[str | KeyPath, Validator] = {
+            key: field.compile(_path_name(key))
+            for key, field in self.fields.items()
+        }
+
+    def validate(
+        self,
+        values: Mapping[str, Value],
+    ) -> tuple[dict[str | KeyPath, Value], list[SchemaError]]:
+        """Validate `values` without binding to a settings object.
+
+        Return the validated values for every field
+        (with defaults substituted for missing or invalid values)
+        and a list of the errors found.
+        """
+        result = {}
+        errors = []
+        for key, validator in self._validators.items():
+            try:
+                result[key] = self._validate_one(key, validator, _lookup(values, key))
+            except SchemaError as error:
+                result[key] = self.fields[key].default
+                errors.append(error)
+        return result, errors
+
+    def _validate_one(self, key: str | KeyPath, validator: Validator, value: Any) -> Value:
+        if value is _MISSING:
+            return self.fields[key].default
+        return validator(value)
+
+    def bind(
+        self,
+        settings: SettingsDict,
+        *,
+        on_error: Callable[[SchemaError], None] | None = None,
+    ) -> ValidatedSettings:
+        """Return a :class:`ValidatedSettings` that validates `settings` against this schema.
+
+        `on_error` is called with each new :exc:`SchemaError`.
+        By default, errors are printed to the console.
+        """
+        return ValidatedSettings(self, settings, on_error=on_error)
+
+
+def _path_name(key: str | KeyPath) -> str:
+    if isinstance(key, KeyPath):
+        name = ''
+        for part in key.parts:
+            name = _format_path(name, part)
+        return name
+    return key
+
+
+def _lookup(values: Mapping[str, Value] | SettingsDict, key: str | KeyPath) -> Any:
+    if isinstance(key, KeyPath):
+        return get_path(values.get(key.key, _MISSING), key.parts[1:], _MISSING)  # type: ignore
+    return values.get(key, _MISSING)  # type: ignore
+
+
+def _print_error(error: SchemaError) -> None:
+    print(f'sublime_lib: invalid setting {error}')
+
+
+class ValidatedSettings:
+    """Validated, read-only access to a :class:`SettingsDict` through a :class:`SettingsSchema`.
+
+    Each setting in the schema is validated and coerced when the binding is created
+    and again only when that setting changes.
+    Reading a setting is a single dictionary lookup.
+    Missing or invalid settings read as the default of their :class:`Field`.
+    Each error is reported once, when the invalid value is first seen.
+
+    Construct this with :meth:`SettingsSchema.bind`.
+    The binding stops listening for changes when it is garbage-collected
+    or when :meth:`close` is called.
+
+    ..  versionadded:: 2.2
+    """
+
+    def __init__(
+        self,
+        schema: SettingsSchema,
+        settings: SettingsDict,
+        *,
+        on_error: Callable[[SchemaError], None] | None = None,
+    ):
+        self.schema = schema
+        self.settings = settings
+        self.on_error = on_error or _print_error
+        self._values: dict[str | KeyPath, Value] = {}
+        #: The current errors, by setting name or :class:`KeyPath`.
+        self.errors: dict[str | KeyPath, SchemaError] = {}
+
+        on_change = weak_method(self._on_change)
+        self._unsubscribes = []
+        for key in schema.fields:
+            self._on_change(key, _lookup(settings, key))
+            self._unsubscribes.append(settings.subscribe(
+                key,
+                lambda new, old, key=key: on_change(key, new),
+                _MISSING,  # type: ignore
+            ))
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop listening for changes to the settings."""
+        for unsubscribe in getattr(self, '_unsubscribes', ()):
+            unsubscribe()
+        self._unsubscribes = []
+
+    def _on_change(self, key: str | KeyPath, value: Any) -> None:
+        schema = self.schema
+        try:
+            self._values[key] = schema._validate_one(key, schema._validators[key], value)
+        except SchemaError as error:
+            self._values[key] = schema.fields[key].default
+            self.errors[key] = error
+            self.on_error(error)
+        else:
+            self.errors.pop(key, None)
+
+    def __getitem__(self, key: str | KeyPath) -> Value:
+        """Return the validated value of `key`.
+
+        :raise KeyError: if `key` is not in the schema.
+        """
+        return self._values[key]
+
+    def getter(self, key: str | KeyPath) -> Callable[[], Value]:
+        """Return a function of no arguments that returns the validated value of `key`.
+
+        :raise KeyError: if `key` is not in the schema.
+        """
+        if key not in self._values:
+            raise KeyError(key)
+        values = self._values
+        return lambda: values[key]
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from collections.abc import Generator
+from collections import deque
+from collections.abc import Generator, Iterable, Iterator
 from contextlib import contextmanager
 from io import SEEK_SET, SEEK_CUR, SEEK_END
+from threading import Condition, current_thread, main_thread
 from typing import Any, TextIO
 
 import sublime
@@ -10,6 +12,10 @@ from sublime import Region
 from ._util.guard import define_guard
 
 
+# The number of characters fetched by each call to `substr` when iterating.
+_CHUNK_SIZE = 2 ** 16
+
+
 @define_guard
 @contextmanager
 def guard_read_only(vs: ViewStream) -> Generator[Any, None, None]:
@@ -42,6 +48,12 @@ def guard_validity(vs: ViewStream) -> None:
         raise ValueError("The underlying view is invalid.")
 
 
+@define_guard
+def guard_flushed(vs: ViewStream) -> None:
+    if vs._buffer:
+        vs._flush()
+
+
 @define_guard
 def guard_selection(vs: ViewStream) -> None:
     if len(vs.view.sel()) == 0:
@@ -52,10 +64,20 @@ def guard_selection(vs: ViewStream) -> None:
         raise ValueError("The underlying view's selection is not empty.")
 
 
+def _shift_point(point: int, begin: int, end: int, inserted: int) -> int:
+    """Adjust `point` for the replacement of [begin, end) with `inserted` characters."""
+    if point <= begin:
+        return point
+    elif point >= end:
+        return point - (end - begin) + inserted
+    else:
+        return begin
+
+
 class ViewStream(TextIO):
     """A :class:`~io.TextIOBase` encapsulating a :class:`~sublime.View` object.
 
-    All public methods (except :meth:`flush`) require
+    All public methods (except :meth:`flush` and buffered :meth:`write` calls) require
     that the underlying View object be valid (using :meth:`View.is_valid`).
     Otherwise, :class:`ValueError` will be raised.
 
@@ -73,18 +95,54 @@ class ViewStream(TextIO):
         that moves the cursor position will scroll the view
         to ensure that the new position is visible.
 
+    :argument buffer_size: If positive, then :meth:`write` and :meth:`print`
+        collect text in memory instead of inserting it immediately.
+        The buffered text is inserted at the cursor with a single command
+        when :meth:`flush` is called,
+        when at least `buffer_size` characters are buffered,
+        or `flush_delay` milliseconds after the first buffered write
+        (via :func:`sublime.set_timeout`).
+        Every other method flushes the buffer first,
+        so reading, seeking, and :meth:`tell` see the buffered text.
+
+    :argument flush_delay: The number of milliseconds
+        after which buffered text is flushed automatically,
+        or ``None`` to flush only when the buffer is full or :meth:`flush` is called.
+
+    :argument append_mode: If ``True``, then :meth:`write` and :meth:`print`
+        add text to the end of the view using :meth:`append`,
+        regardless of the cursor position.
+
     ..  versionchanged:: 1.2
         Added the `follow_cursor` option.
+
+    ..  versionchanged:: 2.2
+        Added the `buffer_size`, `flush_delay`, and `append_mode` options.
     """
 
     def __init__(
-        self, view: sublime.View, *, force_writes: bool = False, follow_cursor: bool = False
+        self,
+        view: sublime.View,
+        *,
+        force_writes: bool = False,
+        follow_cursor: bool = False,
+        buffer_size: int = 0,
+        flush_delay: int | None = 0,
+        append_mode: bool = False,
     ):
         self.view: sublime.View = view
         self.force_writes: bool = force_writes
         self.follow_cursor: bool = follow_cursor
+        self.buffer_size: int = buffer_size
+        self.flush_delay: int | None = flush_delay
+        self.append_mode: bool = append_mode
+
+        self._buffer: list[str] = []
+        self._buffered_length = 0
+        self._flush_generation = 0
 
     @guard_validity
+    @guard_flushed
     @guard_selection
     def read(self, size: int | None = -1) -> str:
         """Read and return at most `size` characters from the stream as a single :class:`str`.
@@ -100,6 +158,7 @@ class ViewStream(TextIO):
         return self._read(begin, end, size)
 
     @guard_validity
+    @guard_flushed
     @guard_selection
     def readline(self, size: int | None = -1) -> str:
         """Read and return one line from the stream, to a maximum of `size` characters.
@@ -122,9 +181,114 @@ class ViewStream(TextIO):
         return self.view.substr(Region(begin, end))
 
     @guard_validity
+    @guard_flushed
     @guard_selection
-    @guard_read_only
-    @guard_auto_indent
+    def readlines(self, hint: int | None = -1) -> list[str]:
+        """Read and return a list of lines from the stream.
+
+        If `hint` is positive, stop reading lines
+        once their total size reaches `hint` characters.
+
+        The text is fetched in large blocks,
+        and the cursor is moved once, after the last line read.
+
+        ..  versionadded:: 2.2
+        """
+        lines = []
+        total = 0
+        iterator = self._iter_lines(self._tell(), self.view.size(), True)
+        for line in iterator:
+            lines.append(line)
+            total += len(line)
+            if hint is not None and 0 < hint <= total:
+                break
+        iterator.close()
+        return lines
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the lines from the cursor to the end of the view.
+
+        Equivalent to :meth:`iter_lines`.
+
+        ..  versionadded:: 2.2
+        """
+        return self.iter_lines()
+
+    def __next__(self) -> str:
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    @guard_validity
+    @guard_flushed
+    @guard_selection
+    def iter_lines(self, *, consume: bool = True) -> Iterator[str]:
+        """Return an iterator over the lines from the cursor to the end of the view.
+
+        The text is fetched in blocks with :meth:`~sublime.View.substr`
+        and split into lines in Python.
+        If `consume` is ``True``,
+        the cursor is moved once, after the last line yielded,
+        when the iterator is exhausted or closed.
+        Otherwise, the cursor is not moved.
+
+        ..  versionadded:: 2.2
+        """
+        return self._iter_lines(self._tell(), self.view.size(), consume)
+
+    @guard_validity
+    @guard_flushed
+    @guard_selection
+    def iter_chunks(self, size: int = _CHUNK_SIZE, *, consume: bool = True) -> Iterator[str]:
+        """Return an iterator over the text from the cursor to the end of the view
+        in chunks of at most `size` characters.
+
+        If `consume` is ``True``,
+        the cursor is moved once, after the last chunk yielded,
+        when the iterator is exhausted or closed.
+        Otherwise, the cursor is not moved.
+
+        :raise ValueError: if `size` is not positive.
+
+        ..  versionadded:: 2.2
+        """
+        if size <= 0:
+            raise ValueError("The chunk size must be positive.")
+        return self._iter_chunks(self._tell(), self.view.size(), size, consume)
+
+    def _iter_chunks(
+        self, begin: int, end: int, size: int, consume: bool
+    ) -> Generator[str, None, None]:
+        position = begin
+        try:
+            while position < end:
+                chunk = self.view.substr(Region(position, min(position + size, end)))
+                if not chunk:
+                    break
+                position += len(chunk)
+                yield chunk
+        finally:
+            if consume and self.view.is_valid():
+                self._seek(position)
+
+    def _iter_lines(self, begin: int, end: int, consume: bool) -> Generator[str, None, None]:
+        position = begin
+        try:
+            partial = ''
+            for chunk in self._iter_chunks(begin, end, _CHUNK_SIZE, False):
+                lines = (partial + chunk).split('\n')
+                partial = lines.pop()
+                for line in lines:
+                    position += len(line) + 1
+                    yield line + '\n'
+            if partial:
+                position += len(partial)
+                yield partial
+        finally:
+            if consume and self.view.is_valid():
+                self._seek(position)
+
     def write(self, s: str) -> int:
         """Insert the string `s` into the view immediately before the cursor
         and return the number of characters inserted.
@@ -132,21 +296,105 @@ class ViewStream(TextIO):
         Because Sublime may convert tabs to spaces,
         the number of characters inserted may not match
         the length of the argument.
+
+        If the stream is buffered,
+        append `s` to the buffer and return ``len(s)``.
+        Errors (such as a read-only view) are raised when the buffer is flushed.
         """
+        if self.buffer_size <= 0:
+            return self.append(s) if self.append_mode else self._write(s)
+
+        if not self._buffer and self.flush_delay is not None:
+            generation = self._flush_generation
+            sublime.set_timeout(lambda: self._flush_timeout(generation), self.flush_delay)
+
+        self._buffer.append(s)
+        self._buffered_length += len(s)
+        if self._buffered_length >= self.buffer_size:
+            self._flush()
+        return len(s)
+
+    @guard_validity
+    @guard_selection
+    @guard_read_only
+    @guard_auto_indent
+    def _write(self, s: str) -> int:
         old_size = self.view.size()
         self.view.run_command('insert', {'characters': s})
         self._maybe_show_cursor()
         return self.view.size() - old_size
 
+    @guard_validity
+    @guard_flushed
+    def append(self, s: str) -> int:
+        """Insert the string `s` at the end of the view
+        and return the number of characters inserted.
+
+        Unlike :meth:`write`, this does not use or require the selection,
+        does not change the ``auto_indent`` setting,
+        and does not convert tabs to spaces.
+        Read-only views are written with the ``force`` option of the ``append`` command
+        rather than by toggling :meth:`~sublime.View.set_read_only`.
+        If `follow_cursor` is ``True`` and the cursor is at the end of the view,
+        the view scrolls to show the new end.
+
+        ..  versionadded:: 2.2
+        """
+        return self._append(s)
+
+    def _append(self, s: str) -> int:
+        if not self.force_writes and self.view.is_read_only():
+            raise ValueError("The underlying view is read-only.")
+
+        scroll_to_end = False
+        if self.follow_cursor:
+            selection = self.view.sel()
+            scroll_to_end = (
+                len(selection) == 1
+                and selection[0].empty()
+                and selection[0].b == self.view.size()
+            )
+
+        self.view.run_command('append', {
+            'characters': s,
+            'force': self.force_writes,
+            'scroll_to_end': scroll_to_end,
+        })
+        return len(s)
+
     def print(self, *objects: object, sep: str = ' ', end: str = '\n') -> None:
         """Shorthand for :func:`print()` passing this ViewStream as the `file` argument."""
         print(*objects, file=self, sep=sep, end=end)
 
     def flush(self) -> None:
-        """Do nothing. (The stream is not buffered.)"""
-        pass
+        """Insert any buffered text into the view.
+
+        If the stream is not buffered, do nothing.
+
+        ..  versionchanged:: 2.2
+            Flush buffered text.
+        """
+        if self._buffer:
+            self._flush()
+
+    def _flush(self) -> None:
+        # Empty the buffer first so that a failed write is reported only once.
+        text = ''.join(self._buffer)
+        self._buffer.clear()
+        self._buffered_length = 0
+        self._flush_generation += 1
+        if self.append_mode:
+            self._append(text)
+        else:
+            self._write(text)
+
+    def _flush_timeout(self, generation: int) -> None:
+        # Skip timeouts scheduled before a flush; a newer one covers the remaining text.
+        if generation == self._flush_generation and self._buffer:
+            self._flush()
 
     @guard_validity
+    @guard_flushed
     def seek(self, offset: int, whence: int = SEEK_SET) -> int:
         """Move the cursor in the view and return the new offset.
 
@@ -177,16 +425,19 @@ class ViewStream(TextIO):
         return self._tell()
 
     @guard_validity
+    @guard_flushed
     def seek_start(self) -> int:
         """Move the cursor in the view to before the first character."""
         return self._seek(0)
 
     @guard_validity
+    @guard_flushed
     def seek_end(self) -> int:
         """Move the cursor in the view to after the last character."""
         return self._seek(self.view.size())
 
     @guard_validity
+    @guard_flushed
     @guard_selection
     def tell(self) -> int:
         """Return the character offset of the cursor."""
@@ -196,6 +447,7 @@ class ViewStream(TextIO):
         return self.view.sel()[0].b
 
     @guard_validity
+    @guard_flushed
     @guard_selection
     def show_cursor(self) -> None:
         """Scroll the view to show the position of the cursor."""
@@ -212,6 +464,229 @@ class ViewStream(TextIO):
     @guard_selection
     @guard_read_only
     def clear(self) -> None:
-        """Erase all text in the view."""
+        """Erase all text in the view, discarding any buffered text."""
+        self._buffer.clear()
+        self._buffered_length = 0
+        self._flush_generation += 1
         self.view.run_command('select_all')
         self.view.run_command('left_delete')
+
+    @guard_validity
+    @guard_flushed
+    def read_at(self, offset: int, size: int | None = -1) -> str:
+        """Read and return at most `size` characters starting at `offset`
+        without moving the cursor.
+
+        If `size` is negative or None, read until EOF.
+
+        ..  versionadded:: 2.2
+        """
+        end = self.view.size()
+        if size is not None and size >= 0:
+            end = min(end, offset + size)
+        return self.view.substr(Region(offset, end))
+
+    def write_at(self, offset: int, s: str) -> None:
+        """Insert the string `s` into the view at `offset`
+        without moving the cursor.
+
+        Equivalent to ``replace(Region(offset), s)``.
+
+        ..  versionadded:: 2.2
+        """
+        self.replace_many([(Region(offset), s)])
+
+    def replace(self, region: Region, s: str) -> None:
+        """Replace the text in `region` with the string `s`
+        without moving the cursor.
+
+        Equivalent to ``replace_many([(region, s)])``.
+
+        ..  versionadded:: 2.2
+        """
+        self.replace_many([(region, s)])
+
+    @guard_validity
+    @guard_flushed
+    @guard_read_only
+    @guard_auto_indent
+    def replace_many(self, edits: Iterable[tuple[Region | int, str]]) -> None:
+        """Apply several positional writes.
+
+        `edits` is an iterable of ``(region, s)`` pairs,
+        where `region` is a :class:`~sublime.Region` or a point.
+        Each `region` refers to the text before any of the edits are applied,
+        so callers need not adjust offsets for earlier edits.
+        Insertions at the same point are applied in order.
+
+        The selection is saved once,
+        the edits are applied from the end of the view to the beginning,
+        and the selection is restored (adjusted for the edits) at the end.
+        Regions added with :meth:`~sublime.View.add_regions` are adjusted by Sublime.
+
+        :raise ValueError: if any `region` is outside the view
+            or if any two regions overlap.
+
+        ..  versionadded:: 2.2
+        """
+        size = self.view.size()
+        ordered = sorted(
+            ((Region(target) if isinstance(target, int) else target, s) for target, s in edits),
+            key=lambda edit: (edit[0].begin(), edit[0].end()),
+        )
+        previous_end = 0
+        for region, _ in ordered:
+            if region.begin() < previous_end or region.end() > size:
+                raise ValueError(f"Invalid or overlapping region {region!r}.")
+            previous_end = region.end()
+
+        selection = self.view.sel()
+        saved = [(region.a, region.b) for region in selection]
+        try:
+            for region, s in reversed(ordered):
+                begin, end = region.begin(), region.end()
+                selection.clear()
+                selection.add(region)
+                if s:
+                    # Sublime may convert tabs to spaces.
+                    old_size = self.view.size() if '\t' in s else None
+                    self.view.run_command('insert', {'characters': s})
+                    if old_size is None:
+                        inserted = len(s)
+                    else:
+                        inserted = self.view.size() - old_size + (end - begin)
+                elif begin < end:
+                    self.view.run_command('left_delete')
+                    inserted = 0
+                else:
+                    continue
+                saved = [
+                    (_shift_point(a, begin, end, inserted), _shift_point(b, begin, end, inserted))
+                    for a, b in saved
+                ]
+        finally:
+            selection.clear()
+            selection.add_all(Region(a, b) for a, b in saved)
+
+
+_OVERFLOW_MODES = ('block', 'drop_oldest', 'drop_newest')
+
+
+class QueuedWriter:
+    """A thread-safe front-end for writing to a :class:`ViewStream`.
+
+    :meth:`write` and :meth:`print` may be called from any thread.
+    Text written from other threads is queued
+    and written to `stream` on the main thread,
+    with one :func:`sublime.set_timeout` callback for all text queued in the meantime.
+    Text written from the main thread is written immediately,
+    after any text that is still queued.
+    Text from a single thread is written in order.
+
+    :argument max_size: The maximum number of characters to queue,
+        or ``None`` for no limit.
+
+    :argument overflow: What to do when a write would exceed `max_size`:
+
+        ``'block'``
+            Wait until the queue has been written to the view.
+        ``'drop_oldest'``
+            Discard the oldest queued writes to make room.
+        ``'drop_newest'``
+            Discard the new write.
+
+        A single write that is larger than `max_size` is accepted
+        when the queue is empty.
+
+    :raise ValueError: if `overflow` is not one of the above.
+
+    ..  versionadded:: 2.2
+    """
+
+    def __init__(
+        self,
+        stream: ViewStream,
+        *,
+        max_size: int | None = None,
+        overflow: str = 'block',
+    ):
+        if overflow not in _OVERFLOW_MODES:
+            raise ValueError(f"Invalid overflow mode {overflow!r}.")
+
+        self.stream: ViewStream = stream
+        self.max_size: int | None = max_size
+        self.overflow: str = overflow
+        #: The number of writes discarded because the queue was full.
+        self.dropped: int = 0
+
+        self._queue: deque[str] = deque()
+        self._queued_length = 0
+        self._scheduled = False
+        self._condition = Condition()
+
+    def write(self, s: str) -> int:
+        """Queue the string `s` to be written to the stream.
+
+        Return ``len(s)``, or ``0`` if the write was discarded.
+        If called on the main thread,
+        write the queue and `s` immediately
+        and return the result of :meth:`ViewStream.write`.
+        """
+        if current_thread() is main_thread():
+            self._drain()
+            return self.stream.write(s)
+
+        with self._condition:
+            if self.max_size is not None and not self._reserve(len(s), self.max_size):
+                self.dropped += 1
+                return 0
+
+            self._queue.append(s)
+            self._queued_length += len(s)
+            if not self._scheduled:
+                self._scheduled = True
+                sublime.set_timeout(self._drain)
+        return len(s)
+
+    def _reserve(self, length: int, max_size: int) -> bool:
+        # Called with the lock held.
+        if self.overflow == 'block':
+            self._condition.wait_for(
+                lambda: not self._queue or self._queued_length + length <= max_size
+            )
+        elif self.overflow == 'drop_newest':
+            if self._queue and self._queued_length + length > max_size:
+                return False
+        else:
+            while self._queue and self._queued_length + length > max_size:
+                self._queued_length -= len(self._queue.popleft())
+                self.dropped += 1
+        return True
+
+    def print(self, *objects: object, sep: str = ' ', end: str = '\n') -> None:
+        """Shorthand for :func:`print()` passing this writer as the `file` argument."""
+        print(*objects, file=self, sep=sep, end=end)
+
+    def flush(self) -> None:
+        """Write all queued text to the stream.
+
+        On the main thread, write the queue immediately and flush the stream.
+        On other threads, wait until the main thread has written the queue.
+        """
+        if current_thread() is main_thread():
+            self._drain()
+            self.stream.flush()
+        else:
+            with self._condition:
+                self._condition.wait_for(lambda: not self._queue)
+
+    def _drain(self) -> None:
+        with self._condition:
+            text = ''.join(self._queue)
+            self._queue.clear()
+            self._queued_length = 0
+            self._scheduled = False
+            self._condition.notify_all()
+
+        if text:
+            self.stream.write(text)
@@ -1,4 +1,7 @@
-from sublime_lib._util.collections import projection, get_selector
+from sublime_lib._util.collections import (
+    projection, compile_projection, get_selector, get_selector_keys, diff_paths,
+    KeyPath, get_path, replace_path,
+)
 from unittest import TestCase
 
 
@@ -85,6 +88,99 @@ class TestSettingsDict(TestCase):
             }
         )
 
+    def test_compile_projection(self):
+        project = compile_projection(('a', 'b'))
+        d = {'a': [1], 'c': 3}
+
+        result = project(d)
+        self.assertEqual(result, {'a': [1]})
+        self.assertIs(project(dict(d)), result)
+
+        d['a'] = [1]
+        self.assertIsNot(project(d), result)
+        self.assertEqual(project(d), result)
+
+        d['b'] = 2
+        self.assertEqual(project(d), {'a': [1], 'b': 2})
+        del d['b']
+        self.assertEqual(project(d), {'a': [1]})
+
+    def test_compile_projection_mapping(self):
+        project = compile_projection({'a': 'x'})
+        d = {'a': 1, 'b': 2}
+
+        self.assertEqual(project(d), {'x': 1})
+        self.assertIs(project(d), project(d))
+
     def test_get_selector_error(self):
         with self.assertRaises(TypeError):
             get_selector(42)
+
+    def test_get_selector_keys(self):
+        self.assertEqual(get_selector_keys('a'), {'a'})
+        self.assertEqual(get_selector_keys(('a', 'b')), {'a', 'b'})
+        self.assertEqual(get_selector_keys({'a': 'x', 'b': 'y'}), {'a', 'b'})
+        self.assertIsNone(get_selector_keys(lambda d: d['a']))
+
+    def test_get_selector_keys_error(self):
+        with self.assertRaises(TypeError):
+            get_selector_keys(42)
+
+    def test_diff_paths(self):
+        self.assertEqual(diff_paths(1, 1), [])
+        self.assertEqual(diff_paths(1, 2), [()])
+        self.assertEqual(diff_paths([1], {'a': 1}), [()])
+
+        self.assertEqual(
+            diff_paths(
+                {'a': {'b': 1, 'c': 2}, 'd': [1, 2], 'e': 1},
+                {'a': {'b': 1, 'c': 3}, 'd': [1], 'f': 1},
+            ),
+            [('a', 'c'), ('d', 1), ('e',), ('f',)]
+        )
+
+    def test_diff_paths_identical(self):
+        value = {'a': [1, 2, {'b': 3}]}
+        self.assertEqual(diff_paths(value, value), [])
+
+    def test_diff_paths_no_deep_equality(self):
+        class Value(dict):
+            def __eq__(self, other):
+                raise AssertionError("Containers should not be compared with ==.")
+
+        old = Value(a=Value(b=[1, 2]))
+        new = Value(a=Value(b=[1, 3]))
+        self.assertEqual(diff_paths(old, new), [('a', 'b', 1)])
+
+    def test_key_path(self):
+        self.assertEqual(KeyPath.parse('a.b.0'), KeyPath('a', 'b', '0'))
+        self.assertEqual(KeyPath.coerce(('a', 0)).parts, ('a', 0))
+        self.assertEqual(KeyPath('a', 'b').key, 'a')
+        self.assertEqual(repr(KeyPath('a', 0)), "KeyPath('a', 0)")
+        self.assertRaises(ValueError, KeyPath)
+        self.assertRaises(ValueError, KeyPath, 0)
+
+    def test_get_path(self):
+        value = {'a': [{'b': 1}]}
+        self.assertEqual(get_path(value, ()), value)
+        self.assertEqual(get_path(value, ('a', 0, 'b')), 1)
+        self.assertEqual(get_path(value, ('a', '0', 'b')), 1)
+        self.assertEqual(get_path(value, ('a', 1, 'b'), 42), 42)
+        self.assertEqual(get_path(value, ('a', 0, 'b', 'c'), 42), 42)
+
+    def test_replace_path(self):
+        value = {'a': {'b': 1}, 'c': [1, {'d': 2}], 'e': {'f': 3}}
+
+        result = replace_path(value, ('c', 1, 'd'), 20)
+
+        self.assertEqual(result, {'a': {'b': 1}, 'c': [1, {'d': 20}], 'e': {'f': 3}})
+        self.assertEqual(value['c'][1]['d'], 2)
+        self.assertIs(result['a'], value['a'])
+        self.assertIs(result['e'], value['e'])
+
+    def test_replace_path_create(self):
+        self.assertEqual(replace_path({}, ('a', 'b'), 1), {'a': {'b': 1}})
+
+    def test_replace_path_error(self):
+        self.assertRaises(TypeError, replace_path, {'a': 1}, ('a', 'b'), 1)
+        self.assertRaises(IndexError, replace_path, [1], (1,), 1)
@@ -0,0 +1,125 @@
+import sublime
+import sublime_lib
+from sublime_lib.instrumentation import (
+    enable, disable, instrument,
+    disable_subscription_profiling, enable_subscription_profiling, profile_subscriptions,
+)
+
+from unittest import TestCase
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.view.set_scratch(True)
+
+    def tearDown(self):
+        disable()
+        if self.view:
+            self.view.window().focus_view(self.view)
+            self.view.window().run_command("close_file")
+
+    def test_records_api_calls(self):
+        stream = sublime_lib.ViewStream(self.view)
+
+        with instrument() as report:
+            stream.write('Hello, World!')
+
+        result = report.to_dict()
+        self.assertEqual(list(result), ['ViewStream.write'])
+        self.assertEqual(result['ViewStream.write']['calls'], 1)
+
+        api = result['ViewStream.write']['api']
+        self.assertEqual(api['View.run_command']['calls'], 1)
+        self.assertTrue(all(
+            site.startswith('sublime_lib.view_stream:')
+            for site in api['View.run_command']['sites']
+        ))
+
+    def test_nested_calls_attributed_to_entry_point(self):
+        settings = sublime_lib.SettingsDict(self.view.settings())
+        settings['example_setting'] = 1
+
+        with instrument() as report:
+            settings.pop('example_setting')
+
+        self.assertEqual(list(report.to_dict()), ['SettingsDict.pop'])
+
+    def test_ignores_other_calls(self):
+        with instrument() as report:
+            self.view.size()
+
+        self.assertEqual(report.to_dict(), {})
+
+    def test_disable_restores(self):
+        original = sublime.View.size
+        enable()
+        self.assertIsNot(sublime.View.size, original)
+        disable()
+        self.assertIs(sublime.View.size, original)
+
+    def test_enable_twice_error(self):
+        enable()
+        with self.assertRaises(RuntimeError):
+            enable()
+
+
+class TestSubscriptionProfiling(TestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.view.set_scratch(True)
+        self.settings = sublime_lib.SettingsDict(self.view.settings())
+
+    def tearDown(self):
+        disable_subscription_profiling()
+        if self.view:
+            self.view.window().focus_view(self.view)
+            self.view.window().run_command("close_file")
+
+    def test_records_subscriptions(self):
+        def on_change(new, old):
+            pass
+
+        self.settings.subscribe('example_setting', on_change)
+
+        with profile_subscriptions() as report:
+            self.settings['example_setting'] = 1
+            self.settings['other_setting'] = 1
+            self.settings['example_setting'] = 1
+
+        stats, = report.to_dict()['subscriptions']
+        self.assertIn('on_change', stats['subscription'])
+        self.assertIn('example_setting', stats['subscription'])
+        self.assertEqual(stats['evaluations'], 1)
+        self.assertEqual(stats['changes'], 1)
+        self.assertEqual(stats['callbacks'], 1)
+
+        self.assertIn('on_change', str(report))
+
+    def test_history(self):
+        self.settings.subscribe('example_setting', lambda new, old: None)
+
+        with profile_subscriptions(history=2) as report:
+            for value in range(3):
+                self.settings['example_setting'] = value
+            del self.settings['example_setting']
+
+        self.assertEqual(
+            [(event.key, event.old_value, event.new_value) for event in report.history],
+            [('example_setting', 1, 2), ('example_setting', 2, None)],
+        )
+
+    def test_disabled(self):
+        self.settings.subscribe('example_setting', lambda new, old: None)
+        with profile_subscriptions() as report:
+            pass
+
+        self.settings['example_setting'] = 1
+        self.assertEqual(report.to_dict(), {'subscriptions': [], 'history': []})
+
+    def test_enable_twice_error(self):
+        enable_subscription_profiling()
+        with self.assertRaises(RuntimeError):
+            enable_subscription_profiling()
@@ -0,0 +1,75 @@
+import sublime
+from sublime_lib import LayeredSettings, SettingsDict
+
+from unittest import TestCase
+
+
+class TestLayeredSettings(TestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.view_settings = SettingsDict(self.view.settings())
+        self.other_view = sublime.active_window().new_file()
+        self.other_settings = SettingsDict(self.other_view.settings())
+
+        self.view_settings['sublime_lib_test_a'] = 'view'
+        self.other_settings.update(sublime_lib_test_a='other', sublime_lib_test_b='other')
+
+        self.layered = LayeredSettings([
+            ('view', self.view_settings),
+            ('other', self.other_settings),
+            ('defaults', {
+                'sublime_lib_test_a': 'default',
+                'sublime_lib_test_c': 'default',
+            }),
+        ])
+
+    def tearDown(self):
+        for view in (self.view, self.other_view):
+            if view:
+                view.set_scratch(True)
+                view.window().focus_view(view)
+                view.window().run_command("close_file")
+
+    def test_get(self):
+        self.assertEqual(self.layered['sublime_lib_test_a'], 'view')
+        self.assertEqual(self.layered['sublime_lib_test_b'], 'other')
+        self.assertEqual(self.layered['sublime_lib_test_c'], 'default')
+        self.assertNotIn('sublime_lib_test_d', self.layered)
+        self.assertEqual(self.layered.get('sublime_lib_test_d', 42), 42)
+
+    def test_source(self):
+        self.assertEqual(self.layered.source('sublime_lib_test_a'), 'view')
+        self.assertEqual(self.layered.source('sublime_lib_test_b'), 'other')
+        self.assertEqual(self.layered.source('sublime_lib_test_c'), 'defaults')
+        self.assertRaises(KeyError, self.layered.source, 'sublime_lib_test_d')
+
+        self.assertEqual(self.layered.sources()['sublime_lib_test_c'], 'defaults')
+
+    def test_layers(self):
+        self.assertEqual(self.layered.layers, ['view', 'other', 'defaults'])
+
+    def test_duplicate_layer(self):
+        with self.assertRaises(ValueError):
+            LayeredSettings([('a', {}), ('a', {})])
+
+    def test_layer_change(self):
+        del self.view_settings['sublime_lib_test_a']
+        self.assertEqual(self.layered['sublime_lib_test_a'], 'other')
+        self.assertEqual(self.layered.source('sublime_lib_test_a'), 'other')
+
+        self.other_settings['sublime_lib_test_c'] = 'other'
+        self.assertEqual(self.layered['sublime_lib_test_c'], 'other')
+
+        self.other_settings.clear()
+        self.assertEqual(self.layered['sublime_lib_test_a'], 'default')
+        self.assertNotIn('sublime_lib_test_b', self.layered)
+
+    def test_update_layer(self):
+        self.layered.update_layer('defaults', {'sublime_lib_test_d': 'default'})
+
+        self.assertEqual(self.layered['sublime_lib_test_d'], 'default')
+        self.assertNotIn('sublime_lib_test_c', self.layered)
+
+        self.assertRaises(KeyError, self.layered.update_layer, 'missing', {})
+        self.assertRaises(TypeError, self.layered.update_layer, 'view', {})
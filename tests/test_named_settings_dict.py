@@ -55,3 +55,32 @@ class TestNamedSettingsDict(DeferrableTestCase):
         other = SettingsDict(self.fancy.settings)
         self.assertNotEqual(self.fancy, other)
         self.assertNotEqual(other, self.fancy)
+
+    def test_shared(self):
+        shared = NamedSettingsDict.shared(self.name)
+
+        self.assertIs(NamedSettingsDict.shared(self.name + '.sublime-settings'), shared)
+        self.assertIsNot(NamedSettingsDict.shared(self.name, cached=True), shared)
+        self.assertEqual(shared, self.fancy)
+
+    def test_save_delayed(self):
+        self.fancy["example_setting"] = "Hello, World!"
+
+        self.fancy.save(delay_ms=100)
+        self.fancy.save(delay_ms=100)
+
+        self.assertFalse(path.exists(self.settings_path))
+
+        yield 300
+
+        self.assertTrue(path.exists(self.settings_path))
+
+    def test_flush_all(self):
+        self.fancy["example_setting"] = "Hello, World!"
+
+        self.fancy.save(delay_ms=10000)
+        NamedSettingsDict.flush_all()
+
+        yield
+
+        self.assertTrue(path.exists(self.settings_path))
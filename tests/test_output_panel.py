@@ -2,6 +2,8 @@ import sublime
 from sublime_lib import OutputPanel
 
 from unittest import TestCase
+import os
+import tempfile
 
 
 class TestOutputPanel(TestCase):
@@ -110,3 +112,84 @@ class TestOutputPanel(TestCase):
     def test_init_nonexistent_error(self):
         with self.assertRaises(ValueError):
             OutputPanel(self.window, 'nonexistent_output_panel')
+
+    def test_name(self):
+        self.panel = OutputPanel.create(self.window, self.panel_name)
+        self.assertEqual(self.panel.name, self.panel_name)
+        self.assertEqual(self.panel.full_name, 'output.' + self.panel_name)
+
+    def test_max_lines(self):
+        self.panel = OutputPanel.create(self.window, self.panel_name, max_lines=100)
+
+        for i in range(1000):
+            self.panel.print(i)
+            self.assertLessEqual(self.panel.view.rowcol(self.panel.view.size())[0], 125)
+
+        lines = self.panel.view.substr(sublime.Region(0, self.panel.view.size())).splitlines()
+        self.assertGreaterEqual(len(lines), 100)
+        self.assertEqual(lines[-1], '999')
+        self.assertEqual(self.panel.tell(), self.panel.view.size())
+
+    def test_max_chars(self):
+        self.panel = OutputPanel.create(
+            self.window, self.panel_name, max_chars=100, append_mode=True
+        )
+
+        for i in range(100):
+            self.panel.print('line')
+            self.assertLessEqual(self.panel.view.size(), 125)
+
+        contents = self.panel.view.substr(sublime.Region(0, self.panel.view.size()))
+        self.assertEqual(contents, 'line\n' * (len(contents) // 5))
+
+    def test_max_lines_last_line(self):
+        self.panel = OutputPanel.create(self.window, self.panel_name, max_lines=2)
+        self.panel.write('a\nb\nc')
+
+        self.assertEqual(self.panel.view.substr(sublime.Region(0, self.panel.view.size())), 'b\nc')
+
+    def test_max_lines_replace_many(self):
+        self.panel = OutputPanel.create(self.window, self.panel_name, max_lines=4)
+        self.panel.write_at(0, 'a\nb\nc\nd\ne\n')
+
+        self.assertEqual(
+            self.panel.view.substr(sublime.Region(0, self.panel.view.size())), 'b\nc\nd\ne\n'
+        )
+
+    def test_clear_resets_trim(self):
+        self.panel = OutputPanel.create(self.window, self.panel_name, max_lines=4)
+        self.panel.print('a')
+        self.panel.clear()
+        self.assertEqual(self.panel._unmeasured_lines, 0)
+
+        self.panel.print('a\nb\nc\nd')
+        self.assertEqual(
+            self.panel.view.substr(sublime.Region(0, self.panel.view.size())), 'a\nb\nc\nd\n'
+        )
+
+    def test_trim_keeps_regions(self):
+        self.panel = OutputPanel.create(self.window, self.panel_name, max_lines=4)
+        self.panel.print('a\nb\nc')
+        self.panel.view.add_regions('test', [sublime.Region(4, 5)])
+
+        self.panel.print('d\ne')
+
+        view = self.panel.view
+        region, = view.get_regions('test')
+        self.assertEqual(view.substr(region), 'c')
+
+    def test_spill(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        self.panel = OutputPanel.create(
+            self.window, self.panel_name, max_lines=4, spill_path=path
+        )
+        for i in range(10):
+            self.panel.print(i)
+
+        with open(path, encoding='utf-8') as file:
+            spilled = file.read()
+        contents = self.panel.view.substr(sublime.Region(0, self.panel.view.size()))
+        self.assertEqual(spilled + contents, ''.join('{}\n'.format(i) for i in range(10)))
@@ -1,5 +1,8 @@
 from sublime_lib import ResourcePath
 
+import gc
+import weakref
+
 from unittest import TestCase
 
 
@@ -80,6 +83,42 @@ class TestPureResourcePath(TestCase):
             ()
         )
 
+    def test_parents_sequence(self):
+        parents = ResourcePath("Packages/Foo/bar/baz.py").parents
+
+        self.assertEqual(len(parents), 3)
+        self.assertEqual(parents[0], ResourcePath("Packages/Foo/bar"))
+        self.assertEqual(parents[-1], ResourcePath("Packages"))
+        self.assertEqual(
+            parents[1:],
+            (ResourcePath("Packages/Foo"), ResourcePath("Packages"))
+        )
+        self.assertEqual(list(parents), [
+            ResourcePath("Packages/Foo/bar"),
+            ResourcePath("Packages/Foo"),
+            ResourcePath("Packages"),
+        ])
+
+        with self.assertRaises(IndexError):
+            parents[3]
+
+    def test_parents_cached(self):
+        path = ResourcePath("Packages/Foo/bar.py")
+        self.assertIs(path.parents, path.parents)
+        self.assertIs(path.parents[0], path.parents[0])
+
+    def test_parents_no_cycle(self):
+        path = ResourcePath("Packages/Foo/bar.py")
+        path.parents[0]
+        ref = weakref.ref(path)
+
+        gc.disable()
+        try:
+            del path
+            self.assertIsNone(ref())
+        finally:
+            gc.enable()
+
     def test_name(self):
         self.assertEqual(
             ResourcePath("Packages/Foo/bar.py").name,
@@ -161,6 +161,45 @@ class TestResourcePath(DeferrableTestCase):
         # Should not raise UnicodeDecodeError
         ResourcePath("Packages/test_package/UTF-8-test.txt").read_bytes()
 
+    def test_read_many(self):
+        hello = ResourcePath("Packages/test_package/helloworld.txt")
+        goodbye = ResourcePath("Packages/test_package/directory/goodbyeworld.txt")
+
+        self.assertEqual(
+            ResourcePath.read_many([hello, str(goodbye)]),
+            {
+                hello: hello.read_text(),
+                goodbye: goodbye.read_text(),
+            }
+        )
+
+    def test_read_many_binary(self):
+        path = ResourcePath("Packages/test_package/UTF-8-test.txt")
+
+        self.assertEqual(
+            ResourcePath.read_many([path], binary=True),
+            {path: path.read_bytes()}
+        )
+
+    def test_read_many_errors(self):
+        hello = ResourcePath("Packages/test_package/helloworld.txt")
+        missing = ResourcePath("Packages/test_package/nonexistentfile.txt")
+        invalid = ResourcePath("Packages/test_package/UTF-8-test.txt")
+
+        result = ResourcePath.read_many([hello, missing, invalid])
+
+        self.assertEqual(result[hello], "Hello, World!\n")
+        self.assertIsInstance(result[missing], FileNotFoundError)
+        self.assertIsInstance(result[invalid], UnicodeDecodeError)
+
+    def test_read_many_line_endings(self):
+        path = ResourcePath("Packages/test_package/crlf.txt")
+        path.file_path().write_bytes(b'a\r\nb\r\n')
+        yield path.exists
+
+        self.assertEqual(ResourcePath.read_many([path]), {path: path.read_text()})
+        self.assertEqual(ResourcePath.read_many([path])[path], 'a\nb\n')
+
     def test_glob(self):
         self.assertEqual(
             ResourcePath("Packages/test_package").glob('*.txt'),
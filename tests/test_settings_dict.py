@@ -1,8 +1,12 @@
 import sublime
-from sublime_lib import SettingsDict
+from sublime_lib import KeyPath, SettingsDict, SettingsDiff
+
+import gc
 
 from unittest import TestCase
+from unittesting import DeferrableTestCase
 from collections import ChainMap
+from collections.abc import MutableMapping
 
 
 class TestSettingsDict(TestCase):
@@ -104,8 +108,71 @@ class TestSettingsDict(TestCase):
         self.assertEqual(self.fancy['xyzzy'], 3)
         self.assertEqual(self.fancy['yzzyx'], 4)
 
-    def test_not_iterable(self):
-        self.assertRaises(NotImplementedError, iter, self.fancy)
+    def test_iter(self):
+        self.fancy.update(foo=1, bar=2)
+
+        self.assertIn('foo', list(self.fancy))
+        self.assertIn('bar', self.fancy.keys())
+        self.assertIn(('foo', 1), self.fancy.items())
+        self.assertIn(2, self.fancy.values())
+        self.assertEqual(len(self.fancy), len(self.settings.to_dict()))
+        self.assertEqual(dict(self.fancy), self.settings.to_dict())
+
+    def test_iter_after_change(self):
+        self.assertNotIn('foo', list(self.fancy))
+
+        self.settings.set('foo', 1)
+        self.assertIn('foo', list(self.fancy))
+        self.assertEqual(self.fancy['foo'], 1)
+
+        self.settings.erase('foo')
+        self.assertNotIn('foo', list(self.fancy))
+        self.assertNotIn('foo', self.fancy)
+
+    def test_iter_batch(self):
+        self.fancy['foo'] = 1
+
+        with self.fancy.batch():
+            self.fancy['bar'] = 2
+            del self.fancy['foo']
+            keys = list(self.fancy)
+
+        self.assertIn('bar', keys)
+        self.assertNotIn('foo', keys)
+
+    def test_copy(self):
+        self.fancy['foo'] = [1]
+
+        copy = self.fancy.copy()
+        self.assertIsInstance(copy, dict)
+        self.assertEqual(copy['foo'], [1])
+
+        copy['foo'].append(2)
+        self.assertEqual(self.fancy['foo'], [1])
+
+    def test_snapshot_values_not_shared(self):
+        self.fancy['foo'] = [1]
+        list(self.fancy)
+
+        self.fancy['foo'].append(2)
+        self.assertEqual(self.fancy['foo'], [1])
+
+    def test_clear(self):
+        self.fancy.update(foo=1, bar=2)
+
+        self.fancy.clear()
+
+        self.assertNotIn('foo', self.fancy)
+        self.assertNotIn('bar', self.settings.to_dict())
+
+    def test_popitem(self):
+        self.fancy['foo'] = 1
+
+        key, value = self.fancy.popitem()
+        self.assertNotIn(key, self.settings.to_dict())
+
+    def test_mapping(self):
+        self.assertIsInstance(self.fancy, MutableMapping)
 
     def test_get_default(self):
         defaults = {'example_1': 'Hello, World!'}
@@ -124,7 +191,7 @@ class TestSettingsDict(TestCase):
 
         self.assertRaises(KeyError, chained.__getitem__, 'example_2')
 
-        self.assertRaises(NotImplementedError, iter, chained)
+        self.assertIn('example_1', list(chained))
 
     def test_equal(self):
         other = SettingsDict(self.settings)
@@ -136,6 +203,132 @@ class TestSettingsDict(TestCase):
         other = SettingsDict(other_view.settings())
         self.assertNotEqual(self.fancy, other)
 
+    def test_get_path(self):
+        self.fancy['lsp'] = {'clients': {'pyright': {'enabled': True}}}
+
+        self.assertEqual(self.fancy.get_path('lsp.clients.pyright.enabled'), True)
+        self.assertEqual(self.fancy.get_path(('lsp', 'clients', 'pyright')), {'enabled': True})
+        self.assertEqual(self.fancy.get_path(KeyPath('lsp', 'clients', 'other'), 42), 42)
+        self.assertEqual(self.fancy.get_path('missing.path', 42), 42)
+
+    def test_set_path(self):
+        self.fancy['lsp'] = {'clients': {'pyright': {'enabled': True}}, 'other': [1]}
+
+        self.fancy.set_path('lsp.clients.pyright.enabled', False)
+        self.fancy.set_path(('lsp', 'other', 0), 2)
+        self.fancy.set_path('missing.path', 3)
+
+        self.assertEqual(self.fancy['lsp'], {
+            'clients': {'pyright': {'enabled': False}},
+            'other': [2],
+        })
+        self.assertEqual(self.fancy['missing'], {'path': 3})
+
+    def test_batch(self):
+        self.fancy['foo'] = 1
+        self.fancy['bar'] = 2
+
+        with self.fancy.batch():
+            self.fancy['foo'] = 10
+            self.fancy['baz'] = 30
+            del self.fancy['bar']
+
+            self.assertEqual(self.fancy['foo'], 10)
+            self.assertNotIn('bar', self.fancy)
+            self.assertEqual(self.fancy.get('baz'), 30)
+
+            self.assertEqual(self.settings.get('foo'), 1)
+            self.assertTrue(self.settings.has('bar'))
+            self.assertFalse(self.settings.has('baz'))
+
+        self.assertEqual(self.settings.get('foo'), 10)
+        self.assertFalse(self.settings.has('bar'))
+        self.assertEqual(self.settings.get('baz'), 30)
+
+    def test_batch_rollback(self):
+        self.fancy['foo'] = 1
+
+        with self.assertRaises(ValueError):
+            with self.fancy.batch():
+                self.fancy['foo'] = 10
+                del self.fancy['foo']
+                raise ValueError()
+
+        self.assertEqual(self.fancy['foo'], 1)
+
+    def test_batch_nested(self):
+        with self.fancy.batch():
+            with self.fancy.batch():
+                self.fancy['foo'] = 1
+            self.assertFalse(self.settings.has('foo'))
+
+        self.assertEqual(self.settings.get('foo'), 1)
+
+    def test_read_own_writes_without_notification(self):
+        self.fancy['example_setting'] = 1
+        dict(self.fancy)
+
+        # Simulate a change notification that has not been delivered yet.
+        from sublime_lib.settings_dict import _remove_change_listener
+        _remove_change_listener(self.settings, self.fancy._invalidate_ref)
+
+        self.fancy['example_setting'] = 2
+        self.assertEqual(dict(self.fancy)['example_setting'], 2)
+
+        del self.fancy['example_setting']
+        self.assertNotIn('example_setting', dict(self.fancy))
+
+
+class TestCachedSettingsDict(TestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.settings = self.view.settings()
+        self.fancy = SettingsDict(self.settings, cached=True)
+
+    def tearDown(self):
+        if self.view:
+            self.view.set_scratch(True)
+            self.view.window().focus_view(self.view)
+            self.view.window().run_command("close_file")
+
+    def test_cached(self):
+        self.assertTrue(self.fancy.cached)
+        self.assertFalse(SettingsDict(self.settings).cached)
+
+    def test_read(self):
+        self.settings.set("example_setting", "Hello, World!")
+
+        self.assertEqual(self.fancy['example_setting'], "Hello, World!")
+        self.assertEqual(self.fancy.get('example_setting'), "Hello, World!")
+        self.assertIn('example_setting', self.fancy)
+
+    def test_missing(self):
+        self.assertNotIn('example_setting', self.fancy)
+        self.assertEqual(self.fancy.get('example_setting', 42), 42)
+        self.assertRaises(KeyError, lambda k: self.fancy[k], "example_setting")
+
+    def test_invalidate_on_change(self):
+        self.assertNotIn('example_setting', self.fancy)
+
+        self.settings.set("example_setting", 1)
+        self.assertEqual(self.fancy['example_setting'], 1)
+
+        self.settings.set("example_setting", 2)
+        self.assertEqual(self.fancy['example_setting'], 2)
+
+        self.settings.erase("example_setting")
+        self.assertNotIn('example_setting', self.fancy)
+
+    def test_write(self):
+        self.fancy['example_setting'] = 1
+        self.assertEqual(self.fancy['example_setting'], 1)
+
+        del self.fancy['example_setting']
+        self.assertNotIn('example_setting', self.fancy)
+
+        self.assertEqual(self.fancy.pop('example_setting', 42), 42)
+
 
 class TestSettingsDictSubscription(TestCase):
 
@@ -189,6 +382,70 @@ class TestSettingsDictSubscription(TestCase):
             'example_2': 2
         })
 
+    def test_subscribe_many_keys(self):
+        keys = ['example_{}'.format(i) for i in range(12)]
+        self.fancy.update({key: [i] for i, key in enumerate(keys)})
+
+        calls = []
+        self.fancy.subscribe(keys, lambda new, old: calls.append((new, old)))
+
+        self.fancy['other_setting'] = 1
+        self.fancy['example_3'] = [3]
+        self.assertEqual(calls, [])
+
+        self.fancy['example_3'] = [33]
+        (new, old), = calls
+        self.assertEqual(new['example_3'], [33])
+        self.assertEqual(old['example_3'], [3])
+        self.assertEqual(len(new), 12)
+
+    def test_subscribe_mutate(self):
+        self.fancy['lst'] = [1]
+        received = []
+
+        def mutate(new, old):
+            new.append(99)
+
+        self.fancy.subscribe('lst', mutate)
+        self.fancy.subscribe('lst', lambda new, old: received.append(new))
+        self.fancy.subscribe(['lst'], lambda new, old: received.append(new))
+
+        self.fancy['lst'] = [2]
+        self.assertEqual(received, [[2], {'lst': [2]}])
+
+        self.fancy['lst'] = [2]
+        self.assertEqual(len(received), 2)
+
+    def test_subscribe_subclass_get(self):
+        class Doubled(SettingsDict):
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                return value * 2 if isinstance(value, int) else value
+
+        settings = Doubled(self.settings)
+        values = []
+        settings.subscribe('example_setting', lambda new, old: values.append(new))
+
+        settings['example_setting'] = 2
+        self.assertEqual(values, [4])
+
+    def test_subscribe_erase_sentinel_default(self):
+        self.fancy['foo'] = 1
+        self.fancy['bar'] = {'baz': 1}
+        calls = []
+        sentinel = SettingsDict.NO_DEFAULT
+        self.fancy.subscribe('foo', lambda new, old: calls.append(new), sentinel)
+        self.fancy.subscribe(
+            KeyPath('bar', 'baz'), lambda new, old: calls.append(new), sentinel
+        )
+
+        del self.fancy['foo']
+        del self.fancy['bar']
+
+        self.assertEqual(len(calls), 2)
+        self.assertIs(calls[0], sentinel)
+        self.assertIs(calls[1], sentinel)
+
     def test_settings_change_in_callback(self):
         calls = []
 
@@ -203,3 +460,313 @@ class TestSettingsDictSubscription(TestCase):
         self.assertEqual(calls, [
             (True, None)
         ])
+
+    def test_subscribe_unrelated_key(self):
+        calls = []
+        self.fancy.subscribe('foo', lambda new, old: calls.append((new, old)))
+
+        self.fancy['bar'] = 1
+        self.fancy['foo'] = 1
+        self.fancy['bar'] = 2
+
+        self.assertEqual(calls, [
+            (1, None)
+        ])
+
+    def test_subscribe_erase(self):
+        self.fancy['foo'] = 1
+        calls = []
+        self.fancy.subscribe('foo', lambda new, old: calls.append((new, old)), 42)
+
+        del self.fancy['foo']
+
+        self.assertEqual(calls, [
+            (42, 1)
+        ])
+
+    def test_subscribe_batch(self):
+        self.fancy.update(foo=1, bar=2)
+        calls = []
+        self.fancy.subscribe(['foo', 'bar'], lambda new, old: calls.append((new, old)))
+
+        with self.fancy.batch():
+            self.fancy['foo'] = 10
+            self.fancy['foo'] = 20
+            del self.fancy['bar']
+
+        self.assertEqual(calls, [
+            ({'foo': 20}, {'foo': 1, 'bar': 2}),
+        ])
+
+    def test_subscribe_update(self):
+        calls = []
+        self.fancy.subscribe(
+            lambda this: (this.get('foo'), this.get('bar')),
+            lambda new, old: calls.append((new, old))
+        )
+
+        self.fancy.update(foo=1, bar=2)
+
+        self.assertEqual(calls, [
+            ((1, 2), (None, None)),
+        ])
+
+    def test_subscribe_diff(self):
+        self.fancy.update(foo={'a': 1, 'b': [1, 2]}, bar=1)
+        calls = []
+        self.fancy.subscribe(
+            ['foo', 'bar', 'baz'],
+            lambda new, old, diff: calls.append(diff),
+            diff=True,
+        )
+
+        with self.fancy.batch():
+            self.fancy['foo'] = {'a': 1, 'b': [1, 3]}
+            del self.fancy['bar']
+            self.fancy['baz'] = 1
+
+        self.assertEqual(calls, [
+            SettingsDiff(
+                added=frozenset({'baz'}),
+                removed=frozenset({'bar'}),
+                changed=frozenset({'foo'}),
+                paths=(('bar',), ('baz',), ('foo', 'b', 1)),
+            ),
+        ])
+
+    def test_subscribe_diff_str(self):
+        calls = []
+        self.fancy.subscribe('foo', lambda *args: calls.append(args), 0, diff=True)
+
+        self.fancy['foo'] = {'a': 1}
+        self.fancy['foo'] = {'a': 2}
+
+        self.assertEqual(calls, [
+            ({'a': 1}, 0, SettingsDiff(frozenset({'foo'}), frozenset(), frozenset(), (('foo',),))),
+            ({'a': 2}, {'a': 1}, SettingsDiff(
+                frozenset(), frozenset(), frozenset({'foo'}), (('foo', 'a'),)
+            )),
+        ])
+
+    def test_subscribe_diff_function(self):
+        with self.assertRaises(ValueError):
+            self.fancy.subscribe(lambda this: None, lambda new, old, diff: None, diff=True)
+
+    def test_subscribe_path(self):
+        self.fancy['lsp'] = {'a': {'enabled': True}, 'b': 1}
+        calls = []
+        self.fancy.subscribe(
+            KeyPath('lsp', 'a', 'enabled'), lambda new, old: calls.append((new, old)), False
+        )
+
+        self.fancy.set_path('lsp.b', 2)
+        self.fancy.set_path('lsp.a.enabled', False)
+        del self.fancy['lsp']
+        self.fancy.set_path('lsp.a.enabled', True)
+
+        self.assertEqual(calls, [
+            (False, True),
+            (True, False),
+        ])
+
+    def test_subscribe_weak(self):
+        calls = []
+
+        class Listener:
+            def on_change(self, new, old):
+                calls.append((new, old))
+
+        listener = Listener()
+        self.fancy.subscribe('foo', listener.on_change, weak=True)
+        self.assertEqual(self.fancy.subscription_count(), 1)
+
+        self.fancy['foo'] = 1
+        self.assertEqual(calls, [(1, None)])
+
+        del listener
+        gc.collect()
+        self.assertEqual(self.fancy.subscription_count(), 0)
+
+        self.fancy['foo'] = 2
+        self.assertEqual(calls, [(1, None)])
+
+    def test_subscribe_weak_function(self):
+        calls = []
+
+        def callback(new, old):
+            calls.append((new, old))
+
+        self.fancy.subscribe('foo', callback, weak=True)
+        self.fancy['foo'] = 1
+        self.assertEqual(calls, [(1, None)])
+
+        del callback
+        gc.collect()
+        self.assertEqual(self.fancy.subscription_count(), 0)
+
+    def test_subscription_count(self):
+        other = SettingsDict(self.settings)
+        self.assertEqual(self.fancy.subscription_count(), 0)
+
+        unsubscribe = self.fancy.subscribe('foo', lambda new, old: None)
+        other.subscribe('bar', lambda new, old: None)
+        self.assertEqual(self.fancy.subscription_count(), 2)
+        self.assertEqual(other.subscription_count(), 2)
+
+        unsubscribe()
+        self.assertEqual(self.fancy.subscription_count(), 1)
+
+    def test_subscribe_function(self):
+        calls = []
+        self.fancy.subscribe(
+            lambda this: this.get('foo', 0) + this.get('bar', 0),
+            lambda new, old: calls.append((new, old))
+        )
+
+        self.fancy['foo'] = 1
+        self.fancy['bar'] = 2
+
+        self.assertEqual(calls, [
+            (1, 0),
+            (3, 1),
+        ])
+
+    def test_subscribe_shared_settings(self):
+        other = SettingsDict(self.settings)
+        calls = []
+
+        unsubscribe = self.fancy.subscribe('foo', lambda new, old: calls.append('fancy'))
+        other.subscribe('foo', lambda new, old: calls.append('other'))
+
+        self.fancy['foo'] = 1
+        unsubscribe()
+        other['foo'] = 2
+
+        self.assertEqual(calls, ['fancy', 'other', 'other'])
+
+    def test_subscribe_inherited_settings(self):
+        preferences = sublime.load_settings('Preferences.sublime-settings')
+        preferences.set('sublime_lib_inherited_setting', 1)
+        self.addCleanup(preferences.erase, 'sublime_lib_inherited_setting')
+
+        keys = ['sublime_lib_inherited_setting'] + ['key_{}'.format(i) for i in range(9)]
+        calls = []
+        self.fancy.subscribe('sublime_lib_inherited_setting', lambda new, old: calls.append(new))
+        self.fancy.subscribe(keys, lambda new, old: calls.append(new))
+
+        self.fancy['unrelated'] = 1
+        self.assertEqual(calls, [])
+
+        self.fancy['key_0'] = 1
+        self.assertEqual(calls, [{'sublime_lib_inherited_setting': 1, 'key_0': 1}])
+
+    def test_subscribe_closed_view(self):
+        from sublime_lib.settings_dict import _dispatchers
+
+        view = sublime.active_window().new_file()
+        settings_id = view.settings().settings_id
+        SettingsDict(view.settings()).subscribe('foo', lambda new, old: None)
+        self.assertIn(settings_id, _dispatchers)
+
+        view.set_scratch(True)
+        view.close()
+        del view
+        gc.collect()
+
+        self.assertNotIn(settings_id, _dispatchers)
+
+    def test_unsubscribe_twice(self):
+        unsubscribe = self.fancy.subscribe('foo', lambda new, old: None)
+        unsubscribe()
+        unsubscribe()
+
+
+class TestDelayedSubscription(DeferrableTestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.settings = self.view.settings()
+        self.fancy = SettingsDict(self.settings)
+        self.fancy['foo'] = 0
+
+    def tearDown(self):
+        if self.view:
+            self.view.set_scratch(True)
+            self.view.window().focus_view(self.view)
+            self.view.window().run_command("close_file")
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self.fancy.subscribe('foo', lambda new, old: None, debounce_ms=1, throttle_ms=1)
+
+    def test_debounce(self):
+        calls = []
+        self.fancy.subscribe('foo', lambda new, old: calls.append((new, old)), debounce_ms=100)
+
+        for i in range(1, 5):
+            self.fancy['foo'] = i
+        self.assertEqual(calls, [])
+
+        yield 200
+
+        self.assertEqual(calls, [(4, 0)])
+
+    def test_debounce_net_unchanged(self):
+        calls = []
+        self.fancy.subscribe('foo', lambda new, old: calls.append((new, old)), debounce_ms=100)
+
+        self.fancy['foo'] = 1
+        self.fancy['foo'] = 0
+
+        yield 200
+
+        self.assertEqual(calls, [])
+
+    def test_debounce_unsubscribe(self):
+        calls = []
+        unsubscribe = self.fancy.subscribe(
+            'foo', lambda new, old: calls.append((new, old)), debounce_ms=100
+        )
+
+        self.fancy['foo'] = 1
+        unsubscribe()
+
+        yield 200
+
+        self.assertEqual(calls, [])
+
+    def test_debounce_diff(self):
+        calls = []
+        self.fancy.subscribe(
+            'foo', lambda new, old, diff: calls.append(diff.paths), debounce_ms=100, diff=True
+        )
+
+        self.fancy['foo'] = 1
+        self.fancy['foo'] = 2
+
+        yield 200
+
+        self.assertEqual(calls, [(('foo',),)])
+
+    def test_throttle(self):
+        calls = []
+        self.fancy.subscribe('foo', lambda new, old: calls.append((new, old)), throttle_ms=100)
+
+        self.fancy['foo'] = 1
+        self.fancy['foo'] = 2
+        self.fancy['foo'] = 3
+        self.assertEqual(calls, [(1, 0)])
+
+        yield 200
+
+        self.assertEqual(calls, [(1, 0), (3, 1)])
+
+    def test_run_async(self):
+        calls = []
+        self.fancy.subscribe('foo', lambda new, old: calls.append((new, old)), run_async=True)
+
+        self.fancy['foo'] = 1
+
+        yield lambda: calls
+
+        self.assertEqual(calls, [(1, 0)])
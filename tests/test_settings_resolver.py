@@ -0,0 +1,96 @@
+import sublime
+
+from pathlib import Path
+from unittest.mock import call, patch
+from sublime_lib import ResourcePath, clear_resolved_settings, resolve_settings
+from .temporary_package import TemporaryPackage
+
+from unittesting import DeferrableTestCase
+
+
+class TestSettingsResolver(DeferrableTestCase):
+
+    def setUp(self):
+        self.temp = TemporaryPackage(
+            'sublime_lib_resolver_test_package',
+            ResourcePath("Packages/sublime_lib/tests/test_settings_package")
+        )
+        self.temp.create()
+        self.user_path = Path(
+            sublime.packages_path(), 'User', 'sublime_lib_resolver_test.sublime-settings'
+        )
+        clear_resolved_settings()
+
+        yield self.temp.exists
+
+    def tearDown(self):
+        self.temp.destroy()
+        try:
+            self.user_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def test_resolve(self):
+        self.assertEqual(
+            resolve_settings('sublime_lib_resolver_test', platform='osx'),
+            {'a': 'package', 'b': 'package', 'c': {'x': 1}}
+        )
+
+    def test_resolve_platform(self):
+        self.assertEqual(
+            resolve_settings('sublime_lib_resolver_test.sublime-settings', platform='linux'),
+            {'a': 'package', 'b': 'linux', 'c': {'x': 1}}
+        )
+
+    def test_resolve_user(self):
+        self.user_path.write_text('{"a": "user", "c": {"y": 2}}')
+
+        yield lambda: ResourcePath(
+            'Packages/User/sublime_lib_resolver_test.sublime-settings'
+        ).exists()
+
+        self.assertEqual(
+            resolve_settings('sublime_lib_resolver_test', platform='osx'),
+            {'a': 'user', 'b': 'package', 'c': {'y': 2}}
+        )
+
+    def test_resolve_cached(self):
+        first = resolve_settings('sublime_lib_resolver_test', platform='osx')
+        first['a'] = 'modified'
+
+        self.assertEqual(
+            resolve_settings('sublime_lib_resolver_test', platform='osx')['a'],
+            'package'
+        )
+
+    def test_resolve_unchanged_not_reread(self):
+        resolve_settings('sublime_lib_resolver_test', platform='osx')
+
+        with patch.object(
+            ResourcePath, 'read_many', wraps=ResourcePath.read_many
+        ) as read_many, patch('sublime.decode_value', wraps=sublime.decode_value) as decode:
+            resolve_settings('sublime_lib_resolver_test', platform='osx')
+
+        self.assertEqual(read_many.call_args_list, [call([])])
+        self.assertFalse(decode.called)
+
+    def test_resolve_changed_file(self):
+        self.user_path.write_text('{"a": "user"}')
+
+        yield lambda: ResourcePath(
+            'Packages/User/sublime_lib_resolver_test.sublime-settings'
+        ).exists()
+
+        self.assertEqual(
+            resolve_settings('sublime_lib_resolver_test', platform='osx')['a'],
+            'user'
+        )
+
+        self.user_path.write_text('{"a": "changed"}')
+        self.assertEqual(
+            resolve_settings('sublime_lib_resolver_test', platform='osx')['a'],
+            'changed'
+        )
+
+    def test_resolve_missing(self):
+        self.assertEqual(resolve_settings('sublime_lib_resolver_test_missing'), {})
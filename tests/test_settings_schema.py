@@ -0,0 +1,145 @@
+import sublime
+from sublime_lib import Field, KeyPath, SchemaError, SettingsDict, SettingsSchema
+
+from unittest import TestCase
+
+
+class TestField(TestCase):
+
+    def test_type(self):
+        validate = Field(int).compile('x')
+        self.assertEqual(validate(1), 1)
+        self.assertRaises(SchemaError, validate, '1')
+        self.assertRaises(SchemaError, validate, True)
+
+    def test_float(self):
+        validate = Field(float).compile('x')
+        self.assertEqual(validate(1), 1.0)
+        self.assertIsInstance(validate(1), float)
+
+    def test_choices(self):
+        validate = Field(str, choices=['a', 'b']).compile('x')
+        self.assertEqual(validate('a'), 'a')
+        self.assertRaises(SchemaError, validate, 'c')
+
+    def test_range(self):
+        validate = Field(int, min=1, max=10).compile('x')
+        self.assertEqual(validate(10), 10)
+        self.assertRaises(SchemaError, validate, 0)
+        self.assertRaises(SchemaError, validate, 11)
+
+    def test_coerce(self):
+        validate = Field(int, coerce=int).compile('x')
+        self.assertEqual(validate('42'), 42)
+        self.assertRaises(SchemaError, validate, 'forty-two')
+
+    def test_nested_path(self):
+        validate = Field(dict, fields={
+            'exclude': Field(items=Field(str)),
+            'timeout': Field(int, default=5),
+        }).compile('options')
+
+        self.assertEqual(validate({'exclude': ['a']}), {'exclude': ['a'], 'timeout': 5})
+
+        with self.assertRaises(SchemaError) as context:
+            validate({'exclude': ['a', 1]})
+        self.assertEqual(context.exception.path, 'options.exclude[1]')
+        self.assertEqual(context.exception.value, 1)
+
+    def test_invalid_default(self):
+        self.assertRaises(SchemaError, Field, int, default='1')
+
+
+class TestSettingsSchema(TestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.settings = SettingsDict(self.view.settings())
+        self.errors = []
+        self.schema = SettingsSchema({
+            'max_results': Field(int, default=100, min=1),
+            KeyPath('clients', 'pyright', 'timeout'): Field(float, default=1.0, min=0),
+        })
+
+    def tearDown(self):
+        if self.view:
+            self.view.set_scratch(True)
+            self.view.window().focus_view(self.view)
+            self.view.window().run_command("close_file")
+
+    def test_validate(self):
+        values, errors = self.schema.validate({
+            'max_results': 0,
+            'clients': {'pyright': {'timeout': 2}},
+        })
+
+        self.assertEqual(values, {
+            'max_results': 100,
+            KeyPath('clients', 'pyright', 'timeout'): 2.0,
+        })
+        self.assertEqual([error.path for error in errors], ['max_results'])
+
+    def test_bind(self):
+        self.settings['max_results'] = 5
+        validated = self.schema.bind(self.settings, on_error=self.errors.append)
+
+        self.assertEqual(validated['max_results'], 5)
+        self.assertEqual(validated[KeyPath('clients', 'pyright', 'timeout')], 1.0)
+        self.assertEqual(self.errors, [])
+
+    def test_bind_change(self):
+        validated = self.schema.bind(self.settings, on_error=self.errors.append)
+        get_timeout = validated.getter(KeyPath('clients', 'pyright', 'timeout'))
+
+        self.settings['max_results'] = 5
+        self.settings['clients'] = {'pyright': {'timeout': 3}}
+
+        self.assertEqual(validated['max_results'], 5)
+        self.assertEqual(get_timeout(), 3.0)
+
+        del self.settings['max_results']
+        self.assertEqual(validated['max_results'], 100)
+
+    def test_bind_errors(self):
+        validated = self.schema.bind(self.settings, on_error=self.errors.append)
+
+        self.settings['max_results'] = -1
+        self.settings['other'] = 1
+
+        self.assertEqual(validated['max_results'], 100)
+        self.assertEqual([error.path for error in self.errors], ['max_results'])
+        self.assertIn('max_results', validated.errors)
+
+        self.settings['max_results'] = 1
+        self.assertEqual(validated.errors, {})
+
+    def test_bind_erase(self):
+        self.settings['max_results'] = 5
+        self.settings['clients'] = {'pyright': {'timeout': 3}}
+        validated = self.schema.bind(self.settings, on_error=self.errors.append)
+
+        del self.settings['max_results']
+        del self.settings['clients']
+
+        self.assertEqual(validated['max_results'], 100)
+        self.assertEqual(validated[KeyPath('clients', 'pyright', 'timeout')], 1.0)
+        self.assertEqual(self.errors, [])
+        self.assertEqual(validated.errors, {})
+
+    def test_bind_invalid_to_missing(self):
+        self.settings['max_results'] = -1
+        validated = self.schema.bind(self.settings, on_error=self.errors.append)
+        self.assertEqual(len(self.errors), 1)
+
+        del self.settings['max_results']
+
+        self.assertEqual(validated['max_results'], 100)
+        self.assertEqual(len(self.errors), 1)
+        self.assertEqual(validated.errors, {})
+
+    def test_close(self):
+        validated = self.schema.bind(self.settings, on_error=self.errors.append)
+        validated.close()
+
+        self.settings['max_results'] = 5
+        self.assertEqual(validated['max_results'], 100)
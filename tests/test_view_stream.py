@@ -1,8 +1,10 @@
 import sublime
-from sublime_lib import ViewStream
+from sublime_lib import QueuedWriter, ViewStream
 
 from unittesting import DeferrableTestCase
+from unittest import TestCase
 from io import UnsupportedOperation, StringIO
+from threading import Thread
 
 
 class TestViewStream(DeferrableTestCase):
@@ -125,6 +127,109 @@ class TestViewStream(DeferrableTestCase):
         self.assertEqual(text, "World")
         self.assertEqual(self.stream.tell(), 12)
 
+    def test_iter(self):
+        self.stream.write("Hello,\nWorld!\n\nGoodbye")
+        self.stream.seek(3)
+
+        self.assertEqual(list(self.stream), ["lo,\n", "World!\n", "\n", "Goodbye"])
+        self.assertEqual(self.stream.tell(), self.view.size())
+
+    def test_iter_partial(self):
+        self.stream.write("a\nb\nc\n")
+        self.stream.seek_start()
+
+        for line in self.stream:
+            if line == "b\n":
+                break
+        self.assertEqual(self.stream.tell(), 4)
+        self.assertEqual(self.stream.readline(), "c\n")
+
+    def test_iter_lines_no_consume(self):
+        self.stream.write("a\nb")
+        self.stream.seek_start()
+
+        self.assertEqual(list(self.stream.iter_lines(consume=False)), ["a\n", "b"])
+        self.assertEqual(self.stream.tell(), 0)
+
+    def test_readlines(self):
+        self.stream.write("one\ntwo\nthree\n")
+        self.stream.seek_start()
+
+        self.assertEqual(self.stream.readlines(5), ["one\n", "two\n"])
+        self.assertEqual(self.stream.tell(), 8)
+        self.assertEqual(self.stream.readlines(), ["three\n"])
+        self.assertEqual(self.stream.readlines(), [])
+
+    def test_iter_chunks(self):
+        self.stream.write("abcdefg")
+        self.stream.seek(1)
+
+        self.assertEqual(list(self.stream.iter_chunks(4, consume=False)), ["bcde", "fg"])
+        self.assertEqual(self.stream.tell(), 1)
+
+        self.assertEqual(list(self.stream.iter_chunks(4)), ["bcde", "fg"])
+        self.assertEqual(self.stream.tell(), 7)
+
+        self.assertRaises(ValueError, self.stream.iter_chunks, 0)
+
+    def test_read_at(self):
+        self.stream.write("Hello, World!")
+        self.stream.seek(2)
+
+        self.assertEqual(self.stream.read_at(7, 5), "World")
+        self.assertEqual(self.stream.read_at(7), "World!")
+        self.assertEqual(self.stream.read_at(7, 100), "World!")
+        self.assertEqual(self.stream.tell(), 2)
+
+    def test_write_at(self):
+        self.stream.write("Hello, World!")
+
+        self.stream.write_at(0, ">> ")
+        self.assertContents(">> Hello, World!")
+        self.assertEqual(self.stream.tell(), 16)
+
+        self.stream.seek(3)
+        self.stream.write_at(3, "Well, ")
+        self.assertContents(">> Well, Hello, World!")
+        self.assertEqual(self.stream.tell(), 3)
+
+    def test_replace(self):
+        self.stream.write("Hello, World!")
+
+        self.stream.replace(sublime.Region(7, 12), "Sublime")
+        self.assertContents("Hello, Sublime!")
+        self.assertEqual(self.stream.tell(), 15)
+
+        self.stream.replace(sublime.Region(5, 14), "")
+        self.assertContents("Hello!")
+        self.assertEqual(self.stream.tell(), 6)
+
+    def test_replace_many(self):
+        self.stream.write("one two three")
+        self.stream.seek(4)
+
+        self.stream.replace_many([
+            (sublime.Region(8, 13), "3"),
+            (0, "["),
+            (sublime.Region(0, 3), "1"),
+            (sublime.Region(4, 7), "2"),
+            (13, "]"),
+        ])
+        self.assertContents("[1 2 3]")
+        self.assertEqual(self.stream.tell(), 3)
+
+    def test_replace_many_overlap(self):
+        self.stream.write("one two three")
+
+        with self.assertRaises(ValueError):
+            self.stream.replace_many([
+                (sublime.Region(0, 5), "a"),
+                (sublime.Region(4, 7), "b"),
+            ])
+        with self.assertRaises(ValueError):
+            self.stream.replace_many([(100, "a")])
+        self.assertContents("one two three")
+
     def test_write_read_only_failure(self):
         self.stream.view.set_read_only(True)
 
@@ -271,3 +376,210 @@ class TestViewStream(DeferrableTestCase):
         self.assertRaises(ValueError, self.stream.seek_end)
         self.assertRaises(ValueError, self.stream.tell)
         self.assertRaises(ValueError, self.stream.show_cursor)
+
+
+class TestBufferedViewStream(DeferrableTestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.stream = ViewStream(self.view, buffer_size=100, flush_delay=None)
+
+    def tearDown(self):
+        if self.view:
+            self.view.set_scratch(True)
+            self.view.close()
+
+    def assertContents(self, text):
+        self.assertEqual(
+            self.view.substr(sublime.Region(0, self.view.size())),
+            text
+        )
+
+    def test_flush(self):
+        change_count = self.view.change_count()
+        self.stream.print("Hello,", "World!")
+        self.assertContents("")
+
+        self.stream.flush()
+        self.assertContents("Hello, World!\n")
+        self.assertEqual(self.view.change_count(), change_count + 1)
+
+    def test_buffer_full(self):
+        self.stream.write("x" * 60)
+        self.assertContents("")
+
+        self.stream.write("x" * 60)
+        self.assertContents("x" * 120)
+
+    def test_flush_delay(self):
+        self.stream.flush_delay = 50
+        self.stream.write("Hello")
+        self.assertContents("")
+
+        yield 100
+        self.assertContents("Hello")
+
+    def test_read_flushes(self):
+        self.stream.write("Hello, World!")
+        self.assertEqual(self.stream.tell(), 13)
+
+        self.stream.write("\nGoodbye")
+        self.stream.seek(7)
+        self.assertEqual(self.stream.read(), "World!\nGoodbye")
+
+    def test_clear_discards(self):
+        self.stream.write("Hello")
+        self.stream.clear()
+        self.stream.flush()
+        self.assertContents("")
+
+    def test_read_only_failure(self):
+        self.view.set_read_only(True)
+        self.stream.write("foo")
+        self.assertRaises(ValueError, self.stream.flush)
+
+        self.assertEqual(self.stream.tell(), 0)
+        self.stream.flush()
+
+
+class TestQueuedWriter(DeferrableTestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.stream = ViewStream(self.view)
+
+    def tearDown(self):
+        if self.view:
+            self.view.set_scratch(True)
+            self.view.close()
+
+    def contents(self):
+        return self.view.substr(sublime.Region(0, self.view.size()))
+
+    def run_thread(self, target):
+        thread = Thread(target=target)
+        thread.start()
+        return thread
+
+    def test_threads(self):
+        writer = QueuedWriter(self.stream)
+
+        def write(name):
+            for i in range(100):
+                writer.print(name, i)
+
+        threads = [
+            self.run_thread(lambda name=name: write(name))
+            for name in ('a', 'b', 'c')
+        ]
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.contents(), '')
+
+        yield lambda: self.contents().count('\n') == 300
+
+        lines = self.contents().splitlines()
+        for name in ('a', 'b', 'c'):
+            self.assertEqual(
+                [line for line in lines if line.startswith(name)],
+                ['{} {}'.format(name, i) for i in range(100)]
+            )
+
+    def test_main_thread(self):
+        writer = QueuedWriter(self.stream)
+        self.run_thread(lambda: writer.write('first ')).join()
+        writer.write('second')
+        self.assertEqual(self.contents(), 'first second')
+
+    def test_drop_newest(self):
+        writer = QueuedWriter(self.stream, max_size=5, overflow='drop_newest')
+
+        def write():
+            for s in ('abc', 'de', 'fg'):
+                writer.write(s)
+
+        self.run_thread(write).join()
+        writer.flush()
+        self.assertEqual(self.contents(), 'abcde')
+        self.assertEqual(writer.dropped, 1)
+
+    def test_drop_oldest(self):
+        writer = QueuedWriter(self.stream, max_size=5, overflow='drop_oldest')
+
+        def write():
+            for s in ('abc', 'de', 'fg'):
+                writer.write(s)
+
+        self.run_thread(write).join()
+        writer.flush()
+        self.assertEqual(self.contents(), 'defg')
+        self.assertEqual(writer.dropped, 1)
+
+    def test_block(self):
+        writer = QueuedWriter(self.stream, max_size=5, overflow='block')
+
+        def write():
+            for s in ('abc', 'de', 'fg'):
+                writer.write(s)
+
+        thread = self.run_thread(write)
+        yield lambda: not thread.is_alive()
+        writer.flush()
+        self.assertEqual(self.contents(), 'abcdefg')
+        self.assertEqual(writer.dropped, 0)
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            QueuedWriter(self.stream, overflow='wait')
+
+
+class TestViewStreamAppend(TestCase):
+
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.stream = ViewStream(self.view, follow_cursor=True)
+
+    def tearDown(self):
+        if self.view:
+            self.view.set_scratch(True)
+            self.view.close()
+
+    def contents(self):
+        return self.view.substr(sublime.Region(0, self.view.size()))
+
+    def test_append(self):
+        self.stream.write("Hello")
+        self.stream.seek_start()
+
+        self.assertEqual(self.stream.append(", World!"), 8)
+        self.assertEqual(self.contents(), "Hello, World!")
+        self.assertEqual(self.stream.tell(), 0)
+
+    def test_append_ignores_selection(self):
+        self.view.sel().add(sublime.Region(0, 0))
+        self.view.sel().clear()
+        self.stream.append("Hello")
+        self.assertEqual(self.contents(), "Hello")
+
+    def test_append_no_indent(self):
+        self.view.settings().set('auto_indent', True)
+        self.stream.append("    \n")
+        self.assertEqual(self.contents(), "    \n")
+
+    def test_append_read_only(self):
+        self.view.set_read_only(True)
+        self.assertRaises(ValueError, self.stream.append, "foo")
+
+        self.stream.force_writes = True
+        self.stream.append("foo")
+        self.assertEqual(self.contents(), "foo")
+        self.assertTrue(self.view.is_read_only())
+
+    def test_append_mode(self):
+        stream = ViewStream(self.view, append_mode=True, buffer_size=100, flush_delay=None)
+        self.stream.write("World")
+        self.stream.seek_start()
+
+        stream.print("!")
+        stream.flush()
+        self.assertEqual(self.contents(), "World!\n")